@@ -0,0 +1,110 @@
+-- ========================================
+-- MATERIALIZED SUMMARIES (scripts/materialized.py)
+-- Precomputed copies of order_summary, product_stats and user_stats.
+-- ========================================
+
+-- <view>_mat: plain tables refreshed incrementally. Statement-level triggers
+-- on orders / order_items / users / products write the affected view keys
+-- to mat_changes; a refresh recomputes only those keys from the view.
+-- <view>_mv: materialized views refreshed with REFRESH MATERIALIZED VIEW
+-- CONCURRENTLY (needs the unique index) - the fallback when no change log
+-- is available.
+
+-- Change log: one row per (view, key) not yet applied; changed_at is the
+-- oldest pending change, used to measure staleness
+CREATE TABLE IF NOT EXISTS mat_changes (
+    view_name VARCHAR(50) NOT NULL,
+    key_id INTEGER NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT clock_timestamp(),
+    PRIMARY KEY (view_name, key_id)
+);
+
+CREATE OR REPLACE FUNCTION mat_mark(name TEXT, keys INTEGER[]) RETURNS void AS $$
+    INSERT INTO mat_changes (view_name, key_id)
+    SELECT name, k FROM unnest(keys) AS k WHERE k IS NOT NULL
+    ON CONFLICT DO NOTHING;
+$$ LANGUAGE sql;
+
+-- Transition tables: new_rows (INSERT, UPDATE), old_rows (UPDATE, DELETE)
+CREATE OR REPLACE FUNCTION mat_orders_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM mat_mark('order_summary', ARRAY(SELECT id FROM new_rows));
+        PERFORM mat_mark('user_stats', ARRAY(SELECT DISTINCT user_id FROM new_rows));
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM mat_mark('order_summary', ARRAY(SELECT id FROM old_rows));
+        PERFORM mat_mark('user_stats', ARRAY(SELECT DISTINCT user_id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mat_order_items_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM mat_mark('order_summary', ARRAY(SELECT DISTINCT order_id FROM new_rows));
+        PERFORM mat_mark('product_stats', ARRAY(SELECT DISTINCT product_id FROM new_rows));
+        PERFORM mat_mark('user_stats', ARRAY(
+            SELECT DISTINCT o.user_id FROM orders o WHERE o.id IN (SELECT order_id FROM new_rows)));
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM mat_mark('order_summary', ARRAY(SELECT DISTINCT order_id FROM old_rows));
+        PERFORM mat_mark('product_stats', ARRAY(SELECT DISTINCT product_id FROM old_rows));
+        PERFORM mat_mark('user_stats', ARRAY(
+            SELECT DISTINCT o.user_id FROM orders o WHERE o.id IN (SELECT order_id FROM old_rows)));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- email and names appear in order_summary, so the user's orders change too
+CREATE OR REPLACE FUNCTION mat_users_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM mat_mark('user_stats', ARRAY(SELECT id FROM new_rows));
+        PERFORM mat_mark('order_summary', ARRAY(
+            SELECT o.id FROM orders o WHERE o.user_id IN (SELECT id FROM new_rows)));
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM mat_mark('user_stats', ARRAY(SELECT id FROM old_rows));
+        PERFORM mat_mark('order_summary', ARRAY(
+            SELECT o.id FROM orders o WHERE o.user_id IN (SELECT id FROM old_rows)));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mat_products_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM mat_mark('product_stats', ARRAY(SELECT id FROM new_rows));
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM mat_mark('product_stats', ARRAY(SELECT id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Incremental tables
+CREATE TABLE IF NOT EXISTS order_summary_mat AS SELECT * FROM order_summary WITH NO DATA;
+CREATE TABLE IF NOT EXISTS product_stats_mat AS SELECT * FROM product_stats WITH NO DATA;
+CREATE TABLE IF NOT EXISTS user_stats_mat AS SELECT * FROM user_stats WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_order_summary_mat_id ON order_summary_mat(id);
+CREATE INDEX IF NOT EXISTS idx_order_summary_mat_user ON order_summary_mat(user_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_product_stats_mat_id ON product_stats_mat(id);
+CREATE INDEX IF NOT EXISTS idx_product_stats_mat_sold ON product_stats_mat(total_sold DESC NULLS LAST);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_stats_mat_id ON user_stats_mat(id);
+
+-- Materialized views
+CREATE MATERIALIZED VIEW IF NOT EXISTS order_summary_mv AS SELECT * FROM order_summary WITH NO DATA;
+CREATE MATERIALIZED VIEW IF NOT EXISTS product_stats_mv AS SELECT * FROM product_stats WITH NO DATA;
+CREATE MATERIALIZED VIEW IF NOT EXISTS user_stats_mv AS SELECT * FROM user_stats WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_order_summary_mv_id ON order_summary_mv(id);
+CREATE INDEX IF NOT EXISTS idx_order_summary_mv_user ON order_summary_mv(user_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_product_stats_mv_id ON product_stats_mv(id);
+CREATE INDEX IF NOT EXISTS idx_product_stats_mv_sold ON product_stats_mv(total_sold DESC NULLS LAST);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_stats_mv_id ON user_stats_mv(id);
@@ -0,0 +1,67 @@
+-- ========================================
+-- PARTITIONED VARIANT (1_setup_postgresql.py --partitioned)
+-- Replaces the matching CREATE TABLE statements of postgresql_schema.sql;
+-- indexes and views from that file are applied unchanged.
+-- ========================================
+
+-- orders / order_items: RANGE on created_at, one partition per month
+-- (created by the setup script) plus a DEFAULT partition.
+-- The partition key must be part of every unique constraint, so the
+-- primary key is (id, created_at) and foreign keys to orders(id) are dropped.
+
+-- 4. ORDERS TABLE
+CREATE TABLE IF NOT EXISTS orders (
+    id SERIAL,
+    order_number VARCHAR(50) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'shipped', 'delivered', 'cancelled')),
+    total_amount DECIMAL(12, 2) NOT NULL CHECK (total_amount >= 0),
+    tax_amount DECIMAL(10, 2) DEFAULT 0,
+    shipping_amount DECIMAL(10, 2) DEFAULT 0,
+    discount_amount DECIMAL(10, 2) DEFAULT 0,
+    shipping_address VARCHAR(255),
+    shipping_city VARCHAR(50),
+    shipping_country VARCHAR(50),
+    tracking_number VARCHAR(100),
+    payment_method VARCHAR(50),
+    payment_status VARCHAR(20) DEFAULT 'pending',
+    notes TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    shipped_at TIMESTAMP,
+    delivered_at TIMESTAMP,
+    PRIMARY KEY (id, created_at),
+    UNIQUE (order_number, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT;
+
+-- 5. ORDER_ITEMS TABLE (same created_at as the order)
+CREATE TABLE IF NOT EXISTS order_items (
+    id SERIAL,
+    order_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    unit_price DECIMAL(10, 2) NOT NULL CHECK (unit_price >= 0),
+    total_price DECIMAL(12, 2) NOT NULL CHECK (total_price >= 0),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS order_items_default PARTITION OF order_items DEFAULT;
+
+-- 7. REVIEWS TABLE (order_id without FK - orders(id) is not unique on its own)
+CREATE TABLE IF NOT EXISTS reviews (
+    id SERIAL PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    order_id INTEGER,
+    rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+    title VARCHAR(255),
+    comment TEXT,
+    helpful_count INTEGER DEFAULT 0,
+    is_verified BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(product_id, user_id, order_id)
+);
@@ -11,7 +11,7 @@ CREATE TABLE IF NOT EXISTS categories (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_categories_name ON categories(name);
+CREATE INDEX IF NOT EXISTS idx_categories_name ON categories(name);
 
 -- 2. USERS TABLE
 CREATE TABLE IF NOT EXISTS users (
@@ -29,9 +29,9 @@ CREATE TABLE IF NOT EXISTS users (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_created_at ON users(created_at);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
 
 -- 3. PRODUCTS TABLE
 CREATE TABLE IF NOT EXISTS products (
@@ -51,12 +51,12 @@ CREATE TABLE IF NOT EXISTS products (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_products_category ON products(category_id);
-CREATE INDEX idx_products_sku ON products(sku);
-CREATE INDEX idx_products_name ON products(name);
-CREATE INDEX idx_products_price ON products(price);
-CREATE INDEX idx_products_rating ON products(rating DESC);
-CREATE INDEX idx_products_active ON products(is_active);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id);
+CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products(price);
+CREATE INDEX IF NOT EXISTS idx_products_rating ON products(rating DESC);
+CREATE INDEX IF NOT EXISTS idx_products_active ON products(is_active);
 
 -- 4. ORDERS TABLE
 CREATE TABLE IF NOT EXISTS orders (
@@ -73,6 +73,7 @@ CREATE TABLE IF NOT EXISTS orders (
     shipping_country VARCHAR(50),
     tracking_number VARCHAR(100),
     payment_method VARCHAR(50),
+    payment_status VARCHAR(20) DEFAULT 'pending',
     notes TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -80,10 +81,10 @@ CREATE TABLE IF NOT EXISTS orders (
     delivered_at TIMESTAMP
 );
 
-CREATE INDEX idx_orders_user ON orders(user_id);
-CREATE INDEX idx_orders_status ON orders(status);
-CREATE INDEX idx_orders_created_at ON orders(created_at DESC);
-CREATE INDEX idx_orders_order_number ON orders(order_number);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_orders_order_number ON orders(order_number);
 
 -- 5. ORDER_ITEMS TABLE (Junction table)
 CREATE TABLE IF NOT EXISTS order_items (
@@ -96,8 +97,8 @@ CREATE TABLE IF NOT EXISTS order_items (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_order_items_order ON order_items(order_id);
-CREATE INDEX idx_order_items_product ON order_items(product_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items(product_id);
 
 -- 6. INVENTORY TABLE (Warehouse management)
 CREATE TABLE IF NOT EXISTS inventory (
@@ -112,8 +113,8 @@ CREATE TABLE IF NOT EXISTS inventory (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_inventory_product ON inventory(product_id);
-CREATE INDEX idx_inventory_location ON inventory(warehouse_location);
+CREATE INDEX IF NOT EXISTS idx_inventory_product ON inventory(product_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_location ON inventory(warehouse_location);
 
 -- 7. REVIEWS TABLE
 CREATE TABLE IF NOT EXISTS reviews (
@@ -125,15 +126,16 @@ CREATE TABLE IF NOT EXISTS reviews (
     title VARCHAR(255),
     comment TEXT,
     helpful_count INTEGER DEFAULT 0,
+    is_verified BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(product_id, user_id, order_id)
 );
 
-CREATE INDEX idx_reviews_product ON reviews(product_id);
-CREATE INDEX idx_reviews_user ON reviews(user_id);
-CREATE INDEX idx_reviews_rating ON reviews(rating);
-CREATE INDEX idx_reviews_created_at ON reviews(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_product ON reviews(product_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_user ON reviews(user_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_rating ON reviews(rating);
+CREATE INDEX IF NOT EXISTS idx_reviews_created_at ON reviews(created_at DESC);
 
 CREATE OR REPLACE VIEW order_summary AS
 SELECT 
@@ -151,7 +153,7 @@ SELECT
 FROM orders o
 JOIN users u ON o.user_id = u.id
 LEFT JOIN order_items oi ON o.id = oi.order_id
-GROUP BY o.id, u.id;
+GROUP BY o.id, o.created_at, u.id;
 
 -- View: Product sales statistics
 CREATE OR REPLACE VIEW product_stats AS
@@ -200,8 +202,8 @@ CREATE TABLE IF NOT EXISTS query_performance (
     notes TEXT
 );
 
-CREATE INDEX idx_query_perf_name ON query_performance(query_name);
-CREATE INDEX idx_query_perf_executed ON query_performance(executed_at DESC);
+CREATE INDEX IF NOT EXISTS idx_query_perf_name ON query_performance(query_name);
+CREATE INDEX IF NOT EXISTS idx_query_perf_executed ON query_performance(executed_at DESC);
 
 -- Populate categories
 INSERT INTO categories (name, description) VALUES
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import SEED, get_row_counts
+from dataset_cache import ensure_cached
+from pg_shards import ShardRouter, create_shards, load_shards, merge_groups
+
+parser = argparse.ArgumentParser(description="Benchmark PostgreSQL shardat in client: direct vs scatter-gather")
+parser.add_argument('--shards', default='1,2,4',
+                    help="numar de shard-uri de testat, separate prin virgula")
+parser.add_argument('--scale-factor', type=float, default=10)
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+parser.add_argument('--iterations', type=int, default=20)
+args = parser.parse_args()
+
+print("\n=== Script 10: PostgreSQL Sharding (client) ===")
+
+shard_counts = [int(n) for n in args.shards.split(',')]
+counts = get_row_counts(args.scale_factor)
+path, hit = ensure_cached(args.scale_factor, args.seed, args.workers)
+print(f"Scale factor {args.scale_factor}, cache {'hit' if hit else 'miss (generat)'}")
+
+# Aceleasi forme de interogare ca in 9_sharding_benchmark.py (S1, S2, S4, S5)
+# plus Q4 din 4_performance_test.py si un top de produse.
+# Fara updated_at (ora incarcarii), ca rezultatele sa fie comparabile intre rulari
+ORDER_COLUMNS = "id, order_number, user_id, status, total_amount, created_at"
+
+def p1_orders_by_user(router, user):
+    return router.query(user, f"SELECT {ORDER_COLUMNS} FROM orders WHERE user_id = %s", (user,))
+
+def p2_user_order_items(router, user):
+    return router.query(user, """
+        SELECT o.order_number, oi.product_id, oi.quantity, oi.total_price
+        FROM orders o JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.user_id = %s
+    """, (user,))
+
+def p3_orders_by_status(router, user):
+    return [row for rows in router.scatter(f"SELECT {ORDER_COLUMNS} FROM orders WHERE status = 'pending'") for row in rows]
+
+def p4_q4_status_aggregate(router, user):
+    # Q4: COUNT si SUM se aduna pe shard-uri
+    return merge_groups(router.scatter("""
+        SELECT status, COUNT(*), SUM(total_amount) FROM orders GROUP BY status
+    """), keys=1, ops=('sum', 'sum'))
+
+def p5_avg_order_by_payment(router, user):
+    # AVG nu se combina direct - fiecare shard trimite SUM si COUNT
+    merged = merge_groups(router.scatter("""
+        SELECT payment_method, SUM(total_amount), COUNT(*) FROM orders GROUP BY payment_method
+    """), keys=1, ops=('sum', 'sum'))
+    return [[method, total / n] for method, total, n in merged]
+
+def p6_top_products(router, user):
+    # LIMIT doar dupa combinare: un top local nu e top global
+    merged = merge_groups(router.scatter("""
+        SELECT product_id, SUM(quantity) FROM order_items GROUP BY product_id
+    """), keys=1, ops=('sum',))
+    return sorted(merged, key=lambda row: (-row[1], row[0]))[:10]
+
+# nume -> (functie, scatter-gather?)
+QUERIES = {
+    'P1_orders_by_user': (p1_orders_by_user, False),
+    'P2_user_order_items': (p2_user_order_items, False),
+    'P3_orders_by_status': (p3_orders_by_status, True),
+    'P4_q4_status_aggregate': (p4_q4_status_aggregate, True),
+    'P5_avg_order_by_payment': (p5_avg_order_by_payment, True),
+    'P6_top_products': (p6_top_products, True),
+}
+
+def result_digest(rows):
+    """Order-independent summary used to check that merges match across shard counts"""
+    return sorted(repr([round(float(v), 2) if isinstance(v, (int, float, Decimal)) else str(v) for v in row])
+                  for row in rows)
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "scale_factor": args.scale_factor,
+    "runs": []
+}
+reference = {}
+
+for shards in shard_counts:
+    print(f"\n{shards} shard-uri:")
+    start = time.perf_counter()
+    instances = create_shards(shards)
+    loaded = load_shards(instances, path, counts, args.seed)
+    load_s = time.perf_counter() - start
+    rows = sum(sum(stats.values()) for stats in loaded)
+    print(f"  incarcare: {rows} randuri in {load_s:.2f}s")
+
+    run = {
+        "shards": shards,
+        "instances": [f"{i['host']}:{i['port']}/{i['database']}" for i in instances],
+        "load_seconds": round(load_s, 3),
+        "users_per_shard": [stats['users'] for stats in loaded],
+        "orders_per_shard": [stats['orders'] for stats in loaded],
+        "queries": {}
+    }
+    with ShardRouter(instances) as router:
+        rng = random.Random(args.seed)
+        for name, (func, scatter) in QUERIES.items():
+            digest = result_digest(func(router, 1))
+            times = []
+            for _ in range(args.iterations):
+                user = rng.randint(1, counts['users'])
+                start = time.perf_counter()
+                func(router, user)
+                times.append((time.perf_counter() - start) * 1000)
+            # Rezultatul combinat trebuie sa fie acelasi indiferent de numarul de shard-uri
+            reference.setdefault(name, digest)
+            run["queries"][name] = {
+                "avg_ms": round(sum(times) / len(times), 3),
+                "max_ms": round(max(times), 3),
+                "shards_hit": shards if scatter else 1,
+                "mode": "single-shard" if shards == 1 else "scatter-gather" if scatter else "targeted",
+                "matches_reference": digest == reference[name]
+            }
+            q = run["queries"][name]
+            check = "" if q["matches_reference"] else "  REZULTAT DIFERIT"
+            print(f"  {name}: avg={q['avg_ms']:.2f}ms, shard-uri {q['shards_hit']}/{shards} ({q['mode']}){check}")
+    results["runs"].append(run)
+
+os.makedirs("results", exist_ok=True)
+with open("results/pg_sharding_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2)
+
+print("Gata!\n")
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import (
+    get_pg_connection, get_mongo_connection, SEED, DATASET_EPOCH, ORDER_STATUSES, product_price
+)
+from loaders import insert_values, load_mongo_collection
+from materialized import (
+    SUMMARY_VIEWS, MONGO_PIPELINES, setup_materialized, drop_materialized, pending_changes,
+    refresh_incremental, refresh_concurrently, pg_differences, mongo_setup_materialized,
+    mongo_drop_materialized, mongo_summary_pipeline, mongo_refresh, mongo_mark_orders,
+    mongo_pending_changes, mongo_refresh_incremental, mongo_differences
+)
+
+parser = argparse.ArgumentParser(description="View-uri materializate: citire, cost refresh, staleness")
+parser.add_argument('--iterations', type=int, default=20)
+parser.add_argument('--rounds', type=int, default=3, help="runde de scriere + refresh")
+parser.add_argument('--write-orders', type=int, default=50, help="comenzi noi per runda")
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--keep', action='store_true',
+                    help="pastreaza tabelele / view-urile / triggerele dupa benchmark")
+args = parser.parse_args()
+
+print("\n=== Script 11: View-uri materializate ===")
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+client, db = get_mongo_connection()
+rng = random.Random(args.seed)
+
+print("Creare si populare initiala...")
+results = {
+    "test_date": datetime.now().isoformat(),
+    "setup_seconds": {"postgresql": setup_materialized(pg_conn), "mongodb": mongo_setup_materialized(db)},
+    "reads": {},
+    "refresh": {"postgresql": [], "mongodb": []},
+}
+
+pg_cursor.execute("SELECT MAX(id) FROM users")
+user_count = pg_cursor.fetchone()[0] or 1
+pg_cursor.execute("SELECT MAX(id) FROM products")
+product_count = pg_cursor.fetchone()[0] or 1
+
+def measure(func, keys):
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        func(key)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"avg": round(sum(times) / len(times), 3), "min": round(min(times), 3), "max": round(max(times), 3)}
+
+def pg_fetch(sql, params=()):
+    pg_cursor.execute(sql, params)
+    return pg_cursor.fetchall()
+
+# nume -> (view, SQL cu {src}, MongoDB calculat live, MongoDB din <view>_mat)
+READS = {
+    'R1_order_summary_by_user': (
+        'order_summary', "SELECT * FROM {src} WHERE user_id = %s",
+        lambda user: list(db.orders.aggregate([{'$match': {'user_id': user}}] + MONGO_PIPELINES['order_summary'])),
+        lambda user: list(db.order_summary_mat.find({'user_id': user}))),
+    'R2_top_products': (
+        'product_stats', "SELECT * FROM {src} ORDER BY total_sold DESC NULLS LAST LIMIT 10",
+        lambda user: list(db.products.aggregate(MONGO_PIPELINES['product_stats']
+                                                + [{'$sort': {'total_sold': -1}}, {'$limit': 10}])),
+        lambda user: list(db.product_stats_mat.find().sort('total_sold', -1).limit(10))),
+    'R3_user_stats_by_id': (
+        'user_stats', "SELECT * FROM {src} WHERE id = %s",
+        lambda user: list(db.users.aggregate(mongo_summary_pipeline('user_stats', [user]))),
+        lambda user: db.user_stats_mat.find_one({'_id': user})),
+}
+
+print("\nLatenta citire:")
+for name, (view, sql, mongo_live, mongo_mat) in READS.items():
+    keys = [rng.randint(1, user_count) for _ in range(args.iterations)]
+    params = (lambda user: (user,)) if '%s' in sql else (lambda user: ())
+    results["reads"][name] = {
+        "postgresql": {
+            variant: measure(lambda user: pg_fetch(sql.format(src=view + suffix), params(user)), keys)
+            for variant, suffix in [('view', ''), ('incremental', '_mat'), ('materialized_view', '_mv')]
+        },
+        "mongodb": {
+            "pipeline": measure(mongo_live, keys),
+            "merge_collection": measure(mongo_mat, keys),
+        },
+    }
+    pg, mongo = results["reads"][name]["postgresql"], results["reads"][name]["mongodb"]
+    print(f"  {name}: PG view={pg['view']['avg']}ms mat={pg['incremental']['avg']}ms "
+          f"mv={pg['materialized_view']['avg']}ms | Mongo pipeline={mongo['pipeline']['avg']}ms "
+          f"mat={mongo['merge_collection']['avg']}ms")
+
+# Scrieri: comenzi noi (id-uri peste maxim) + schimbari de status, anulate la final
+pg_cursor.execute("SELECT COALESCE(MAX(id), 0) FROM orders")
+first_order = next_order = max(pg_cursor.fetchone()[0],
+                               (db.orders.find_one(sort=[('id', -1)]) or {}).get('id', 0)) + 1
+pg_cursor.execute("SELECT COALESCE(MAX(id), 0) FROM order_items")
+next_item = max(pg_cursor.fetchone()[0],
+                (db.order_items.find_one(sort=[('id', -1)]) or {}).get('id', 0)) + 1
+original_status = {}
+
+def write_batch():
+    """New orders / items (fresh ids on every call) and status changes to existing orders"""
+    global next_order, next_item
+    created_at = DATASET_EPOCH - timedelta(hours=1)
+    orders, items = [], []
+    for order_id in range(next_order, next_order + args.write_orders):
+        orders.append({
+            'id': order_id, 'order_number': f"BENCH-{order_id:08d}", 'user_id': rng.randint(1, user_count),
+            'status': 'pending', 'total_amount': round(rng.uniform(25.00, 500.00), 2),
+            'shipping_address': 'bench', 'shipping_city': 'bench', 'shipping_country': 'bench',
+            'payment_method': 'credit_card', 'payment_status': 'pending', 'created_at': created_at
+        })
+        for _ in range(rng.randint(1, 3)):
+            product_id = rng.randint(1, product_count)
+            qty = rng.randint(1, 3)
+            items.append({
+                'id': next_item, 'order_id': order_id, 'product_id': product_id, 'quantity': qty,
+                'unit_price': product_price(product_id, args.seed),
+                'total_price': round(qty * product_price(product_id, args.seed), 2), 'created_at': created_at
+            })
+            next_item += 1
+    next_order += args.write_orders
+    candidates = rng.sample(range(1, first_order), min(args.write_orders // 2, first_order - 1))
+    pg_cursor.execute("SELECT id, status FROM orders WHERE id = ANY(%s)", (candidates,))
+    updates = {}
+    for order_id, status in pg_cursor.fetchall():
+        original_status.setdefault(order_id, status)
+        updates[order_id] = rng.choice(ORDER_STATUSES)
+    return orders, items, updates
+
+def pg_write(orders, items, updates):
+    insert_values(pg_cursor, 'orders', [orders])
+    insert_values(pg_cursor, 'order_items', [items])
+    for order_id, status in updates.items():
+        pg_cursor.execute("UPDATE orders SET status = %s WHERE id = %s", (status, order_id))
+    pg_conn.commit()
+
+def mongo_write(orders, items, updates):
+    load_mongo_collection(db, 'orders', [orders])
+    load_mongo_collection(db, 'order_items', [items])
+    if updates:
+        db.orders.bulk_write([UpdateOne({'id': order_id}, {'$set': {'status': status}})
+                              for order_id, status in updates.items()])
+    changed = list(db.orders.find({'id': {'$in': list(updates)}}, {'id': 1, 'user_id': 1}))
+    mongo_mark_orders(db, orders + changed, items)
+
+def pg_refresh_all(method):
+    return {view: method(pg_conn, view) for view in SUMMARY_VIEWS}
+
+def mongo_full(db, view):
+    start = time.perf_counter()
+    mongo_refresh(db, view)
+    return {'method': 'full', 'seconds': round(time.perf_counter() - start, 4)}
+
+def timed_round(write, pending, refresh):
+    """Write one batch, then refresh every view; staleness = commit -> refresh done"""
+    write(*write_batch())
+    committed = time.perf_counter()
+    before = pending()
+    refreshed = {}
+    for view in SUMMARY_VIEWS:
+        refreshed[view] = dict(refresh(view), pending_keys=before[view]['keys'],
+                               staleness_ms=round((time.perf_counter() - committed) * 1000, 3))
+    return refreshed
+
+# Scrierile se anuleaza si daca benchmark-ul se opreste la jumatate
+try:
+    print("\nRefresh dupa scrieri:")
+    for round_index in range(args.rounds):
+        # Fiecare metoda primeste propriul batch; dupa runda cea concurenta,
+        # cheile ramase pentru _mat se aplica fara masurare
+        pg_inc = timed_round(pg_write, lambda: pending_changes(pg_conn),
+                             lambda view: refresh_incremental(pg_conn, view))
+        pg_mv = timed_round(pg_write, lambda: pending_changes(pg_conn),
+                            lambda view: refresh_concurrently(pg_conn, view))
+        pg_refresh_all(refresh_incremental)
+        mongo_inc = timed_round(mongo_write, lambda: mongo_pending_changes(db),
+                                lambda view: mongo_refresh_incremental(db, view))
+        mongo_all = timed_round(mongo_write, lambda: mongo_pending_changes(db),
+                                lambda view: mongo_full(db, view))
+        db.mat_changes.delete_many({})
+        results["refresh"]["postgresql"].append({"incremental": pg_inc, "concurrent": pg_mv})
+        results["refresh"]["mongodb"].append({"incremental": mongo_inc, "full_merge": mongo_all})
+        for view in SUMMARY_VIEWS:
+            print(f"  runda {round_index + 1} {view}: "
+                  f"PG inc {pg_inc[view]['seconds'] * 1000:.1f}ms ({pg_inc[view]['keys']} chei), "
+                  f"PG mv {pg_mv[view]['seconds'] * 1000:.1f}ms | "
+                  f"Mongo inc {mongo_inc[view]['seconds'] * 1000:.1f}ms, "
+                  f"Mongo full {mongo_all[view]['seconds'] * 1000:.1f}ms")
+
+    print("\nVerificare (copie == view live)...")
+    results["differences_after_refresh"] = {
+        "postgresql": {view: {"incremental": pg_differences(pg_conn, view, f"{view}_mat"),
+                              "materialized_view": pg_differences(pg_conn, view, f"{view}_mv")}
+                       for view in SUMMARY_VIEWS},
+        "mongodb": {view: mongo_differences(db, view) for view in SUMMARY_VIEWS},
+    }
+    print(f"  {results['differences_after_refresh']}")
+finally:
+    print("Anulare scrieri...")
+    pg_conn.rollback()
+    # Explicit, ca in MongoDB: schema partitionata nu are FK (deci nici
+    # ON DELETE CASCADE) de la order_items la orders
+    pg_cursor.execute("DELETE FROM order_items WHERE order_id >= %s", (first_order,))
+    pg_cursor.execute("DELETE FROM orders WHERE id >= %s", (first_order,))
+    for order_id, status in original_status.items():
+        pg_cursor.execute("UPDATE orders SET status = %s WHERE id = %s", (status, order_id))
+    pg_conn.commit()
+    db.order_items.delete_many({'order_id': {'$gte': first_order}})
+    db.orders.delete_many({'id': {'$gte': first_order}})
+    if original_status:
+        db.orders.bulk_write([UpdateOne({'id': order_id}, {'$set': {'status': status}})
+                              for order_id, status in original_status.items()])
+
+if args.keep:
+    pg_refresh_all(refresh_incremental)
+    pg_refresh_all(refresh_concurrently)
+    for view in SUMMARY_VIEWS:
+        mongo_refresh(db, view)
+else:
+    drop_materialized(pg_conn)
+    mongo_drop_materialized(db)
+
+pg_cursor.close()
+pg_conn.close()
+client.close()
+
+os.makedirs("results", exist_ok=True)
+with open("results/materialized_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
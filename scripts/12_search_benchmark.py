@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, get_mongo_connection, SEED, get_row_counts
+from dataset_cache import ensure_cached, generate_table_rows
+from loaders import load_pg_table, load_mongo_collection
+from text_search import (
+    pg_trigram_available, create_pg_search_indexes, pg_search, pg_search_plan,
+    create_mongo_text_index, create_mongo_trigrams, mongo_search, mongo_search_plan
+)
+
+parser = argparse.ArgumentParser(description="Q6: cautare text scan vs indexata, pe dimensiuni crescatoare")
+parser.add_argument('--scale-factors', default='1,10,50',
+                    help="dimensiuni de testat (produse = 200 x scale factor), separate prin virgula")
+parser.add_argument('--term', default='Pro')
+parser.add_argument('--iterations', type=int, default=10)
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+args = parser.parse_args()
+
+print("\n=== Script 12: Cautare text ===")
+
+# Produsele fiecarei dimensiuni intr-o schema / baza separata, ca indexii de
+# cautare sa nu ajunga pe datasetul principal
+BENCH_SCHEMA = 'search_bench'
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+client, _ = get_mongo_connection()
+mongo_db = client[BENCH_SCHEMA]
+trigram = pg_trigram_available(pg_conn)
+if not trigram:
+    print("  pg_trgm indisponibil (postgresql-contrib) - strategia trigram se sare")
+
+def measure(func):
+    times = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"avg": round(sum(times) / len(times), 3), "min": round(min(times), 3),
+            "max": round(max(times), 3), "result_count": len(result)}
+
+def pg_strategy(strategy):
+    stats = measure(lambda: pg_search(pg_cursor, strategy, args.term))
+    stats["indexes_used"] = pg_search_plan(pg_cursor, strategy, args.term)
+    return stats
+
+def mongo_strategy(strategy):
+    stats = measure(lambda: mongo_search(mongo_db.products, strategy, args.term))
+    stats["plan"] = mongo_search_plan(mongo_db.products, strategy, args.term)
+    return stats
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "term": args.term,
+    "pg_trgm": trigram,
+    "runs": []
+}
+
+for scale_factor in [float(sf) for sf in args.scale_factors.split(',')]:
+    counts = get_row_counts(scale_factor)
+    path, _ = ensure_cached(scale_factor, args.seed, args.workers)
+    print(f"\n{counts['products']} produse (scale factor {scale_factor:g}):")
+
+    pg_cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    pg_cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    pg_cursor.execute(f"CREATE TABLE {BENCH_SCHEMA}.products (LIKE public.products INCLUDING DEFAULTS)")
+    # pg_trgm ramane in public; COPY products ajunge in schema de benchmark
+    pg_cursor.execute(f"SET search_path TO {BENCH_SCHEMA}, public")
+    pg_conn.commit()
+    load_pg_table(pg_conn, 'products', generate_table_rows(path, 'products', counts, args.seed))
+    pg_cursor.execute("ANALYZE products")
+    pg_conn.commit()
+    mongo_db.products.drop()
+    load_mongo_collection(mongo_db, 'products', generate_table_rows(path, 'products', counts, args.seed))
+
+    run = {"scale_factor": scale_factor, "products": counts['products'], "strategies": {}}
+    strategies = run["strategies"]
+
+    # Fara indexi de cautare: Q6 asa cum e in 4_performance_test.py
+    strategies["pg_like_scan"] = pg_strategy('like')
+    strategies["pg_ilike_scan"] = pg_strategy('ilike')
+    strategies["pg_fulltext_scan"] = pg_strategy('fulltext')
+    strategies["mongo_regex_scan"] = mongo_strategy('regex')
+
+    run["index_build"] = {
+        "postgresql": create_pg_search_indexes(pg_conn),
+        "mongodb": {"text": create_mongo_text_index(mongo_db.products),
+                    "trigram": create_mongo_trigrams(mongo_db.products)},
+    }
+    if trigram:
+        strategies["pg_like_trgm"] = pg_strategy('like')
+        strategies["pg_ilike_trgm"] = pg_strategy('ilike')
+    strategies["pg_fulltext_gin"] = pg_strategy('fulltext')
+    strategies["mongo_text_index"] = mongo_strategy('text')
+    strategies["mongo_trigram_index"] = mongo_strategy('trigram')
+
+    for name, stats in strategies.items():
+        print(f"  {name}: avg={stats['avg']}ms, {stats['result_count']} rezultate")
+    results["runs"].append(run)
+
+pg_cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+pg_conn.commit()
+pg_cursor.close()
+pg_conn.close()
+client.drop_database(BENCH_SCHEMA)
+client.close()
+
+os.makedirs("results", exist_ok=True)
+with open("results/search_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2)
+
+print("Gata!\n")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import random
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, get_mongo_connection, SEED
+from workloads import WORKLOADS, select_workloads, fixed_keys
+from index_advisor import MIN_ROWS, run_workloads, rank_proposals, apply_proposals, drop_proposals
+
+parser = argparse.ArgumentParser(description="Index advisor: planuri EXPLAIN -> indexi propusi")
+parser.add_argument('--workloads', default='',
+                    help=f"workload-uri de analizat, separate prin virgula ({', '.join(WORKLOADS)})")
+parser.add_argument('--tags', default='core', help="sau selectie dupa tag (core, time, join, ...)")
+parser.add_argument('--iterations', type=int, default=5)
+parser.add_argument('--min-rows', type=int, default=MIN_ROWS,
+                    help="randuri / documente citite de la care un scan complet se semnaleaza")
+parser.add_argument('--top', type=int, default=0, help="aplica doar primele N propuneri (0 = toate)")
+parser.add_argument('--apply', action='store_true',
+                    help="construieste indexii propusi si ruleaza din nou workload-ul")
+parser.add_argument('--keep', action='store_true', help="pastreaza indexii aplicati")
+parser.add_argument('--seed', type=int, default=SEED)
+args = parser.parse_args()
+
+print("\n=== Script 13: Index advisor ===")
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+client, db = get_mongo_connection()
+names = [name for name in args.workloads.split(',') if name]
+workloads = select_workloads(names, None if names else args.tags.split(','))
+names = [workload.name for workload in workloads]
+
+rng = random.Random(args.seed)
+pg_cursor.execute("SELECT MAX(id) FROM users")
+user_count = pg_cursor.fetchone()[0] or 1
+pg_cursor.execute("SELECT MAX(id) FROM products")
+product_count = pg_cursor.fetchone()[0] or 1
+user, product = rng.randint(1, user_count), rng.randint(1, product_count)
+keys = fixed_keys(user, product)
+
+print("Rulare workload + EXPLAIN...")
+before, findings = run_workloads(pg_conn, db, keys, workloads, args.iterations, args.min_rows)
+proposals = rank_proposals(findings)
+
+print(f"\nConstatari ({len(findings)}):")
+for finding in findings:
+    columns = ', '.join(finding['columns']) or '-'
+    print(f"  [{finding['engine']}] {finding['workload']}: {finding['kind']} pe {finding['table']} "
+          f"({columns}), {finding['examined']} examinate")
+
+print(f"\nIndexi propusi ({len(proposals)}):")
+for proposal in proposals:
+    print(f"  {proposal['rank']}. {proposal['statement']}  "
+          f"scor={proposal['score']} ({', '.join(proposal['workloads'])})")
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "keys": {"user": user, "product": product},
+    "min_rows": args.min_rows,
+    "findings": findings,
+    "proposals": proposals,
+    "before": before,
+}
+
+if args.apply and proposals:
+    applied = proposals[:args.top] if args.top else proposals
+    print(f"\nAplicare {len(applied)} indexi...")
+    results["build_seconds"] = apply_proposals(pg_conn, db, applied)
+    try:
+        after, remaining = run_workloads(pg_conn, db, keys, workloads, args.iterations, args.min_rows)
+        results["after"] = after
+        results["remaining_findings"] = remaining
+        results["gain"] = {
+            name: {engine: round(before[name][engine]['avg_ms'] / after[name][engine]['avg_ms'], 2)
+                   if after[name][engine]['avg_ms'] else None
+                   for engine in ('postgresql', 'mongodb')}
+            for name in names
+        }
+        print("\nInainte -> dupa (ms):")
+        for name in names:
+            print(f"  {name}: PG {before[name]['postgresql']['avg_ms']} -> {after[name]['postgresql']['avg_ms']} | "
+                  f"Mongo {before[name]['mongodb']['avg_ms']} -> {after[name]['mongodb']['avg_ms']}")
+    finally:
+        if not args.keep:
+            drop_proposals(pg_conn, db, applied)
+
+pg_cursor.close()
+pg_conn.close()
+client.close()
+
+os.makedirs("results", exist_ok=True)
+with open("results/index_advisor.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, get_mongo_connection, SEED, get_row_counts
+from dataset_cache import ensure_cached
+from workloads import select_workloads, time_windows, fixed_keys, pg_runner, mongo_runner
+from time_indexes import (
+    TIME_TABLES, PG_TIME_INDEXES, MONGO_TIME_INDEXES, time_ordered_chunks, pg_load_time_tables,
+    pg_correlation, pg_apply_variant, pg_time_plan, mongo_load_time_collections, mongo_apply_variant
+)
+
+parser = argparse.ArgumentParser(description="Indexi pe created_at: B-tree, compus, BRIN - marime, build, latenta")
+parser.add_argument('--scale-factors', default='1,10,50',
+                    help="dimensiuni de testat, separate prin virgula")
+parser.add_argument('--iterations', type=int, default=20)
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+args = parser.parse_args()
+
+print("\n=== Script 14: Indexi pe interval de timp ===")
+
+# Copiile ordonate dupa created_at stau separat de datasetul principal
+BENCH_SCHEMA = 'time_bench'
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+client, _ = get_mongo_connection()
+mongo_db = client[BENCH_SCHEMA]
+
+def measure(func):
+    times = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"avg": round(sum(times) / len(times), 3), "min": round(min(times), 3),
+            "max": round(max(times), 3), "result_count": len(result)}
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "windows": time_windows(),
+    "runs": []
+}
+
+for scale_factor in [float(sf) for sf in args.scale_factors.split(',')]:
+    counts = get_row_counts(scale_factor)
+    path, _ = ensure_cached(scale_factor, args.seed, args.workers)
+    print(f"\n{counts['orders']} comenzi, {counts['reviews']} recenzii (scale factor {scale_factor:g}):")
+
+    chunks = {table: time_ordered_chunks(path, table, counts, args.seed) for table in TIME_TABLES}
+    pg_load_time_tables(pg_conn, BENCH_SCHEMA, chunks)
+    # Cel mai recent client / produs: T1 si T3 au rezultate la orice dimensiune
+    user, product = chunks['orders'][-1][-1]['user_id'], chunks['reviews'][-1][-1]['product_id']
+    keys = fixed_keys(user, product)
+    mongo_load_time_collections(mongo_db, chunks)
+
+    run = {
+        "scale_factor": scale_factor,
+        "rows": {table: counts[table] for table in TIME_TABLES},
+        "keys": {"user": user, "product": product},
+        "correlation": {table: pg_correlation(pg_conn, BENCH_SCHEMA, table) for table in TIME_TABLES},
+        "postgresql": {},
+        "mongodb": {},
+    }
+
+    for variant in PG_TIME_INDEXES:
+        entry = {"indexes": pg_apply_variant(pg_conn, BENCH_SCHEMA, variant), "workloads": {}}
+        for workload in select_workloads(tags=['time']):
+            stats = measure(pg_runner(workload, pg_cursor, keys)[0])
+            stats["indexes_used"], stats["blocks"] = pg_time_plan(pg_cursor, workload, keys)
+            entry["workloads"][workload.name] = stats
+        run["postgresql"][variant] = entry
+
+    for variant in MONGO_TIME_INDEXES:
+        entry = {"indexes": mongo_apply_variant(mongo_db, variant), "workloads": {}}
+        for workload in select_workloads(tags=['time']):
+            entry["workloads"][workload.name] = measure(mongo_runner(workload, mongo_db, keys)[0])
+        run["mongodb"][variant] = entry
+
+    for engine in ("postgresql", "mongodb"):
+        for variant, entry in run[engine].items():
+            size = sum(index['bytes'] or 0 for index in entry['indexes'].values())
+            latencies = ', '.join(f"{name.split('_')[0]}={stats['avg']}ms"
+                                  for name, stats in entry['workloads'].items())
+            print(f"  {engine} {variant}: {size / 1024:.0f}KB | {latencies}")
+    results["runs"].append(run)
+
+pg_cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+pg_conn.commit()
+pg_cursor.close()
+pg_conn.close()
+client.drop_database(BENCH_SCHEMA)
+client.close()
+
+os.makedirs("results", exist_ok=True)
+with open("results/time_index_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
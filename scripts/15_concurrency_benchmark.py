@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, fork_context, SEED
+from distributions import parse_distribution
+from workloads import WORKLOADS, select_workloads
+from concurrency import run_clients, saturation_point
+
+parser = argparse.ArgumentParser(description="Throughput vs latenta cu N clienti concurenti")
+parser.add_argument('--workloads', default='q2_select_where,q7_user_orders,q8_product_lookup,q4_aggregate',
+                    help=f"workload-uri, separate prin virgula ({', '.join(WORKLOADS)})")
+parser.add_argument('--clients', default='1,2,4,8,16,32', help="numarul de clienti testat, crescator")
+parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+parser.add_argument('--engines', default='postgresql,mongodb')
+parser.add_argument('--duration', type=float, default=5.0, help="secunde masurate per punct")
+parser.add_argument('--warmup', type=float, default=1.0, help="secunde de warmup per punct")
+parser.add_argument('--lookups', type=int, default=1, help="interogari per operatie in Q7/Q8")
+parser.add_argument('--dist', default='uniform', help="alegerea cheilor: uniform | zipf:S | hotspot:F:P")
+parser.add_argument('--seed', type=int, default=SEED)
+args = parser.parse_args()
+parse_distribution(args.dist)
+if args.mode == 'process' and fork_context() is None:
+    parser.error("--mode process necesita fork (indisponibil pe aceasta platforma); foloseste --mode thread")
+
+print("\n=== Script 15: Concurenta ===")
+
+workloads = select_workloads(args.workloads.split(','))
+client_counts = sorted(int(n) for n in args.clients.split(','))
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+counts = {}
+for table in ('users', 'products'):
+    pg_cursor.execute(f"SELECT MAX(id) FROM {table}")
+    counts[table] = pg_cursor.fetchone()[0] or 1
+pg_cursor.close()
+pg_conn.close()
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "mode": args.mode,
+    "duration": args.duration,
+    "warmup": args.warmup,
+    "distribution": args.dist,
+    "curves": {}
+}
+
+for workload in workloads:
+    results["curves"][workload.name] = {}
+    for engine in args.engines.split(','):
+        print(f"\n{workload.name} - {engine} ({args.mode}):")
+        curve = []
+        for clients in client_counts:
+            point = run_clients(engine, workload.name, clients, args.mode, args.duration, args.warmup,
+                                counts, args.seed, args.dist, args.lookups)
+            curve.append(point)
+            print(f"  {clients:>4} clienti: {point['throughput']:>9} ops/s  p50={point['p50']}ms  "
+                  f"p99={point['p99']}ms" + (f"  {point['errors']} erori" if point['errors'] else ""))
+        saturation = saturation_point(curve)
+        results["curves"][workload.name][engine] = {"points": curve, "saturation_clients": saturation}
+        print(f"  saturatie: {saturation or 'neatinsa'}")
+
+os.makedirs("results", exist_ok=True)
+with open("results/concurrency_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import asyncio
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, SEED
+from distributions import parse_distribution
+from workloads import WORKLOADS, select_workloads
+from open_loop import SCHEDULES, BACKENDS, run_open_loop
+
+parser = argparse.ArgumentParser(description="Incarcare in bucla deschisa la un QPS tinta")
+parser.add_argument('--workloads', default='q8_product_lookup,q7_user_orders',
+                    help=f"workload-uri, separate prin virgula ({', '.join(WORKLOADS)})")
+parser.add_argument('--qps', default='50,100,200,400', help="rate-uri tinta, separate prin virgula")
+parser.add_argument('--schedule', choices=SCHEDULES, default='poisson')
+parser.add_argument('--duration', type=float, default=10.0, help="secunde per rate")
+parser.add_argument('--connections', type=int, default=8, help="conexiuni / thread-uri ale backend-ului")
+parser.add_argument('--backend', choices=list(BACKENDS), default='sync')
+parser.add_argument('--engines', default='postgresql,mongodb')
+parser.add_argument('--dist', default='uniform', help="alegerea cheilor: uniform | zipf:S | hotspot:F:P")
+parser.add_argument('--seed', type=int, default=SEED)
+args = parser.parse_args()
+parse_distribution(args.dist)
+
+print("\n=== Script 16: Bucla deschisa ===")
+
+workloads = select_workloads(args.workloads.split(','))
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+counts = {}
+for table in ('users', 'products'):
+    pg_cursor.execute(f"SELECT MAX(id) FROM {table}")
+    counts[table] = pg_cursor.fetchone()[0] or 1
+pg_cursor.close()
+pg_conn.close()
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "schedule": args.schedule,
+    "duration": args.duration,
+    "connections": args.connections,
+    "backend": args.backend,
+    "distribution": args.dist,
+    "runs": {}
+}
+
+for workload in workloads:
+    results["runs"][workload.name] = {}
+    for engine in args.engines.split(','):
+        print(f"\n{workload.name} - {engine} ({args.schedule}, {args.backend}):")
+        runs = []
+        for qps in [float(q) for q in args.qps.split(',')]:
+            run = asyncio.run(run_open_loop(args.backend, engine, workload, qps, args.duration, args.schedule,
+                                            args.connections, counts, args.seed, args.dist))
+            runs.append(run)
+            print(f"  {qps:>7g} qps tinta -> {run['achieved_qps']:>8} qps | "
+                  f"latenta p50={run['latency']['p50']}ms p99={run['latency']['p99']}ms | "
+                  f"service p99={run['service_time']['p99']}ms"
+                  + (f" | {run['errors']} erori" if run['errors'] else ""))
+        results["runs"][workload.name][engine] = runs
+
+os.makedirs("results", exist_ok=True)
+with open("results/open_loop_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
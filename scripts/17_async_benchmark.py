@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import asyncio
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, SEED
+from distributions import parse_distribution
+from workloads import WORKLOADS, select_workloads
+from open_loop import BACKENDS, run_closed_loop
+
+parser = argparse.ArgumentParser(description="Throughput sync vs async (asyncpg / AsyncMongoClient)")
+parser.add_argument('--workloads', default='q8_product_lookup,q7_user_orders,t2_user_latest_orders,q2_select_where',
+                    help=f"workload-uri, separate prin virgula ({', '.join(WORKLOADS)})")
+parser.add_argument('--concurrency', default='1,16,64,256,1024', help="cereri in zbor, separate prin virgula")
+parser.add_argument('--connections', type=int, default=16,
+                    help="conexiuni per backend: PostgreSQL, thread-uri sync, maxPoolSize MongoDB")
+parser.add_argument('--backends', default='sync,async', help=f"backend-uri comparate ({', '.join(BACKENDS)})")
+parser.add_argument('--engines', default='postgresql,mongodb')
+parser.add_argument('--duration', type=float, default=5.0, help="secunde per punct")
+parser.add_argument('--dist', default='uniform', help="alegerea cheilor: uniform | zipf:S | hotspot:F:P")
+parser.add_argument('--seed', type=int, default=SEED)
+args = parser.parse_args()
+parse_distribution(args.dist)
+
+print("\n=== Script 17: Sync vs async ===")
+
+workloads = select_workloads(args.workloads.split(','))
+levels = sorted(int(n) for n in args.concurrency.split(','))
+backends = args.backends.split(',')
+
+pg_conn = get_pg_connection()
+pg_cursor = pg_conn.cursor()
+counts = {}
+for table in ('users', 'products'):
+    pg_cursor.execute(f"SELECT MAX(id) FROM {table}")
+    counts[table] = pg_cursor.fetchone()[0] or 1
+pg_cursor.close()
+pg_conn.close()
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "duration": args.duration,
+    "connections": args.connections,
+    "distribution": args.dist,
+    "runs": {}
+}
+
+for workload in workloads:
+    results["runs"][workload.name] = {}
+    for engine in args.engines.split(','):
+        print(f"\n{workload.name} - {engine} ({args.connections} conexiuni):")
+        runs = {backend: [] for backend in backends}
+        for concurrency in levels:
+            line = []
+            for backend in backends:
+                run = asyncio.run(run_closed_loop(backend, engine, workload, concurrency, args.duration,
+                                                  args.connections, counts, args.seed, args.dist))
+                runs[backend].append(run)
+                line.append(f"{backend} {run['throughput']:>9} ops/s p99={run['latency']['p99']}ms"
+                            + (f" ({run['errors']} erori)" if run['errors'] else ""))
+            if 'sync' in runs and 'async' in runs and runs['sync'][-1]['throughput']:
+                line.append(f"async/sync x{runs['async'][-1]['throughput'] / runs['sync'][-1]['throughput']:.2f}")
+            print(f"  {concurrency:>5} in zbor: " + " | ".join(line))
+        results["runs"][workload.name][engine] = runs
+
+os.makedirs("results", exist_ok=True)
+with open("results/async_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
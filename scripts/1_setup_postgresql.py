@@ -1,11 +1,30 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
+from datetime import timedelta
 sys.path.insert(0, os.path.dirname(__file__))
 
-from utils import get_pg_connection, test_pg_connection, print_section, print_success, print_error
+from utils import (
+    get_pg_connection, test_pg_connection, DATASET_EPOCH, ORDER_HISTORY_DAYS,
+    print_section, print_success, print_error
+)
+from schema import (
+    schema_statements, schema_objects, create_month_partitions, is_partitioned, PARTITIONED_TABLES
+)
+from manifest import ensure_pg_manifest_table, read_pg_manifest, clear_pg_manifest, pg_schema_hash
+from materialized import drop_materialized
 import pg8000
 
+parser = argparse.ArgumentParser(description="Setup PostgreSQL")
+parser.add_argument('--defer-indexes', action='store_true',
+                    help="doar tabele; indexii se construiesc dupa populare")
+parser.add_argument('--partitioned', action='store_true',
+                    help="orders si order_items partitionate lunar dupa created_at")
+parser.add_argument('--recreate', action='store_true',
+                    help="sterge tabelele existente (necesar la schimbarea variantei)")
+args = parser.parse_args()
+
 print("\n=== Script 1: PostgreSQL ===")
 print("Conectare...")
 success, result = test_pg_connection()
@@ -15,131 +34,58 @@ else:
     print(f"  Eroare: {result}")
     exit(1)
 
-print("Creare tabele...")
-
 conn = get_pg_connection()
 cursor = conn.cursor()
 
-tables = [
-    # Categories
-    """
-    CREATE TABLE IF NOT EXISTS categories (
-        id SERIAL PRIMARY KEY,
-        name VARCHAR(100) NOT NULL UNIQUE,
-        description TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """,
-    
-    # Users
-    """
-    CREATE TABLE IF NOT EXISTS users (
-        id SERIAL PRIMARY KEY,
-        username VARCHAR(50) NOT NULL UNIQUE,
-        email VARCHAR(100) NOT NULL UNIQUE,
-        first_name VARCHAR(50),
-        last_name VARCHAR(50),
-        phone VARCHAR(20),
-        address VARCHAR(255),
-        city VARCHAR(50),
-        country VARCHAR(50),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """,
-    
-    # Products
-    """
-    CREATE TABLE IF NOT EXISTS products (
-        id SERIAL PRIMARY KEY,
-        sku VARCHAR(50) NOT NULL UNIQUE,
-        name VARCHAR(255) NOT NULL,
-        description TEXT,
-        category_id INTEGER REFERENCES categories(id),
-        price DECIMAL(10, 2) NOT NULL,
-        stock_quantity INTEGER DEFAULT 0,
-        rating DECIMAL(3, 2) DEFAULT 0,
-        review_count INTEGER DEFAULT 0,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """,
-    
-    # Orders
-    """
-    CREATE TABLE IF NOT EXISTS orders (
-        id SERIAL PRIMARY KEY,
-        order_number VARCHAR(50) NOT NULL UNIQUE,
-        user_id INTEGER REFERENCES users(id),
-        status VARCHAR(20) DEFAULT 'pending',
-        total_amount DECIMAL(12, 2) DEFAULT 0,
-        shipping_address VARCHAR(255),
-        shipping_city VARCHAR(50),
-        shipping_country VARCHAR(50),
-        payment_method VARCHAR(50),
-        payment_status VARCHAR(20) DEFAULT 'pending',
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """,
-    
-    # Order Items
-    """
-    CREATE TABLE IF NOT EXISTS order_items (
-        id SERIAL PRIMARY KEY,
-        order_id INTEGER REFERENCES orders(id),
-        product_id INTEGER REFERENCES products(id),
-        quantity INTEGER NOT NULL,
-        unit_price DECIMAL(10, 2) NOT NULL,
-        total_price DECIMAL(10, 2) NOT NULL
-    )
-    """,
-    
-    # Reviews
-    """
-    CREATE TABLE IF NOT EXISTS reviews (
-        id SERIAL PRIMARY KEY,
-        product_id INTEGER REFERENCES products(id),
-        user_id INTEGER REFERENCES users(id),
-        rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
-        title VARCHAR(255),
-        comment TEXT,
-        is_verified BOOLEAN DEFAULT FALSE,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """
-]
+# Schema vine din schemas/postgresql_schema.sql (+ overlay-ul partitionat)
+if args.recreate:
+    print("Stergere tabele si view-uri existente...")
+    # Copiile materializate (11_materialized_benchmark.py --keep) depind de view-uri
+    drop_materialized(conn)
+    tables, views = schema_objects()
+    for view in views:
+        cursor.execute(f"DROP VIEW IF EXISTS {view} CASCADE")
+    for table in reversed(tables):
+        cursor.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    # Lunile arhivate de 8_partition_benchmark.py --archive-month
+    cursor.execute("SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename LIKE %s",
+                   ('%\\_archive\\_%',))
+    for (archive,) in cursor.fetchall():
+        cursor.execute(f"DROP TABLE IF EXISTS {archive}")
+    conn.commit()
+    clear_pg_manifest(conn)
 
-table_names = ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']
+print(f"Creare schema ({'partitionata' if args.partitioned else 'standard'})...")
+if args.defer_indexes:
+    print("  Indexi amanati (--defer-indexes)")
 
-for sql, name in zip(tables, table_names):
+for sql in schema_statements(args.partitioned, indexes=not args.defer_indexes):
     try:
         cursor.execute(sql)
         conn.commit()
-        print(f"  {name} - ok")
     except Exception as e:
         conn.rollback()
-        if 'already exists' in str(e).lower():
-            print(f"  {name} - exista deja")
-        else:
-            print(f"  {name} - eroare")
+        print(f"  eroare: {sql.splitlines()[0]} - {e}")
 
-# Indexi
-print("Creare indexi...")
-indexes = [
-    "CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id)",
-    "CREATE INDEX IF NOT EXISTS idx_products_price ON products(price)",
-    "CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)",
-    "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)",
-    "CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id)",
-    "CREATE INDEX IF NOT EXISTS idx_reviews_product ON reviews(product_id)",
-]
+for table in schema_objects()[0]:
+    print(f"  {table} - ok")
 
-for idx in indexes:
-    try:
-        cursor.execute(idx)
+if args.partitioned:
+    if not is_partitioned(cursor, 'orders'):
+        print("  orders exista deja nepartitionat - rulati cu --recreate")
+    else:
+        # O partitie pe luna pentru intervalul comenzilor generate
+        first = DATASET_EPOCH - timedelta(days=ORDER_HISTORY_DAYS + 1)
+        for table in PARTITIONED_TABLES:
+            names = create_month_partitions(cursor, table, first, DATASET_EPOCH)
+            print(f"  {table}: {len(names)} partitii lunare + default")
         conn.commit()
-    except:
-        conn.rollback()
 
-print("  Indexi creati")
+# Manifestul datasetului (scris de 3_populate_data.py)
+ensure_pg_manifest_table(conn)
+manifest = read_pg_manifest(conn)
+if manifest and manifest.get('schema_hash') == pg_schema_hash(conn):
+    print(f"Dataset curent: scale factor {manifest['scale_factor']}, seed {manifest['seed']} - datele raman")
 
 cursor.close()
 conn.close()
@@ -1,65 +1,115 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.dirname(__file__))
 
-from utils import get_mongo_connection, test_mongo_connection, print_section, print_success, print_error
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from utils import get_mongo_connection, test_mongo_connection, MONGO_DB, MONGO_INDEXES, TABLES, print_section, print_success, print_error
+from manifest import read_mongo_manifest, mongo_schema_hash
+from mongo_cluster import (LocalShardedCluster, SHARD_KEYS, BASE_PORT, CLUSTER_DIR,
+                           shard_collections, shardable_indexes)
+
+parser = argparse.ArgumentParser(description="Setup MongoDB")
+parser.add_argument('--defer-indexes', action='store_true',
+                    help="doar colectii; indexii se construiesc dupa populare")
+parser.add_argument('--force', action='store_true',
+                    help="sterge colectiile chiar daca manifestul arata un dataset curent")
+parser.add_argument('--sharded', type=int, metavar='N',
+                    help="porneste un cluster shardat local (mongod/mongos >= 7.0) cu N shard-uri "
+                         "si shardeaza orders / order_items / reviews; clusterul ramane pornit")
+parser.add_argument('--shard-strategy', choices=list(SHARD_KEYS), default='hashed',
+                    help="shard key-ul folosit cu --sharded (vezi mongo_cluster.py)")
+parser.add_argument('--base-port', type=int, default=BASE_PORT,
+                    help="portul mongos; config server-ul si shard-urile folosesc porturile urmatoare")
+parser.add_argument('--cluster-dir', default=CLUSTER_DIR,
+                    help="dbpath-urile, log-urile si PID-urile clusterului local")
+parser.add_argument('--stop-sharded', action='store_true',
+                    help="opreste clusterul pornit cu --sharded si ii sterge datele")
+args = parser.parse_args()
+if args.sharded is not None and args.sharded < 1:
+    parser.error("--sharded necesita cel putin un shard")
 
 print("\n=== Script 2: MongoDB ===")
-print("Conectare...")
-success, result = test_mongo_connection()
-if success:
-    print("  Conectat la Atlas")
-else:
-    print(f"  Eroare: {result}")
-    exit(1)
-
-# Connect
-client, db = get_mongo_connection()
 
-# Sterg colectiile existente
-print("Stergere colectii vechi...")
-for coll in db.list_collection_names():
-    db.drop_collection(coll)
+if args.stop_sharded:
+    if LocalShardedCluster.stop_detached(args.cluster_dir):
+        print(f"Cluster oprit, {args.cluster_dir} sters")
+    else:
+        print(f"Niciun cluster pornit in {args.cluster_dir}")
+    exit(0)
+
+if args.sharded:
+    if os.path.exists(os.path.join(args.cluster_dir, 'pids')):
+        print(f"  Un cluster ruleaza deja din {args.cluster_dir} - opriti-l cu --stop-sharded")
+        exit(1)
+    print(f"Pornire cluster shardat local ({args.sharded} shard-uri, {args.shard_strategy})...")
+    try:
+        cluster = LocalShardedCluster(args.sharded, args.base_port, args.cluster_dir, detached=True)
+    except RuntimeError as e:
+        print(f"  Eroare: {e}")
+        exit(1)
+    try:
+        cluster.start()
+    except (TimeoutError, PyMongoError) as e:
+        cluster.stop()
+        print(f"  Eroare: {e} (log-uri in {args.cluster_dir})")
+        exit(1)
+    print(f"  mongos: {cluster.uri}")
+    client = MongoClient(cluster.uri)
+    db = client[MONGO_DB]
+else:
+    print("Conectare...")
+    success, result = test_mongo_connection()
+    if success:
+        print("  Conectat la Atlas")
+    else:
+        print(f"  Eroare: {result}")
+        exit(1)
+
+    # Connect
+    client, db = get_mongo_connection()
+
+# Un dataset incarcat cu schema curenta (manifest) se pastreaza
+manifest = read_mongo_manifest(db)
+current = (not args.force and manifest is not None
+           and manifest.get('schema_hash') == mongo_schema_hash()
+           and set(TABLES) <= set(db.list_collection_names()))
+
+if current:
+    print(f"Colectiile contin un dataset curent (scale factor {manifest['scale_factor']}, "
+          f"seed {manifest['seed']}) - nu se sterg")
+    print("  --force pentru recreare")
+else:
+    # Sterg colectiile existente
+    print("Stergere colectii vechi...")
+    for coll in db.list_collection_names():
+        db.drop_collection(coll)
 
-# Creare colectii
-print("Creare colectii...")
+    # Creare colectii
+    print("Creare colectii...")
 
-collections = ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']
+    for coll in TABLES:
+        db.create_collection(coll)
+        print(f"  {coll} - ok")
 
-for coll in collections:
-    db.create_collection(coll)
-    print(f"  {coll} - ok")
+    if args.sharded:
+        print(f"Sharding ({args.shard_strategy})...")
+        shard_collections(client, MONGO_DB, args.shard_strategy, args.sharded)
+        for coll, key in SHARD_KEYS[args.shard_strategy].items():
+            print(f"  {coll} - {key}")
 
 # Indexi
-print("Creare indexi...")
-
-# Categories
-db.categories.create_index("name", unique=True)
-
-# Users
-db.users.create_index("username", unique=True)
-db.users.create_index("email", unique=True)
-
-# Products
-db.products.create_index("sku", unique=True)
-db.products.create_index("category_id")
-db.products.create_index("price")
-
-# Orders
-db.orders.create_index("order_number", unique=True)
-db.orders.create_index("user_id")
-db.orders.create_index("status")
-
-# Order Items
-db.order_items.create_index("order_id")
-db.order_items.create_index("product_id")
-
-# Reviews
-db.reviews.create_index("product_id")
-db.reviews.create_index("user_id")
+if args.defer_indexes:
+    print("Indexi amanati (--defer-indexes)")
+else:
+    print("Creare indexi...")
+    for coll, indexes in shardable_indexes(db, MONGO_INDEXES).items():
+        db[coll].create_indexes(indexes)
 
-print("  Indexi creati")
+    print("  Indexi creati")
 
 # Verificare
 print("Verificare...")
@@ -68,4 +118,7 @@ print(f"  {len(collections)} colectii create")
 
 client.close()
 
+if args.sharded:
+    print("Scripturile urmatoare folosesc clusterul prin:")
+    print(f"  export MONGO_URI={cluster.uri}")
 print("Gata!\n")
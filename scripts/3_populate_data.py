@@ -1,170 +1,310 @@
 #!/usr/bin/env python3
 import sys
 import os
+import time
+import json
+import argparse
+from datetime import datetime
 sys.path.insert(0, os.path.dirname(__file__))
 
 from utils import (
     get_pg_connection, get_mongo_connection,
-    generate_categories, generate_users, generate_products,
-    generate_orders, generate_order_items, generate_reviews,
+    generate_table, get_row_counts, chunk_pool,
+    TABLES, SEED, CHUNK_SIZE, PG_INDEXES, MONGO_INDEXES,
     print_section, print_success, print_error, print_info
 )
+import columnar
+import dataset_cache
+from loaders import (
+    load_pg_table, load_mongo_parallel, PG_LOADERS, MONGO_BATCH_SIZE,
+    pg_foreign_keys, run_dependency_graph,
+    drop_pg_indexes, build_pg_indexes, drop_mongo_indexes, build_mongo_indexes,
+    pg_constraints, drop_pg_constraints, build_pg_constraints,
+    PG_MAINTENANCE_WORKERS
+)
+from pipeline import run_table_pipeline, QUEUE_DEPTH
+from checksum import verify_tables, CHECKSUM_WORKERS
+from mongo_cluster import shardable_indexes
+from snapshot import save_snapshot
+from manifest import (
+    dataset_manifest, pg_schema_hash, mongo_schema_hash,
+    read_pg_manifest, write_pg_manifest, clear_pg_manifest,
+    read_mongo_manifest, write_mongo_manifest, clear_mongo_manifest
+)
 
-print("\n=== Script 3: Populare Date ===")
-print("Generare date...")
-categories = generate_categories()
-print(f"  {len(categories)} categorii")
-
-users = generate_users(100)
-print(f"  {len(users)} useri")
-
-products = generate_products(200)
-print(f"  {len(products)} produse")
-
-orders = generate_orders(users, 150)
-print(f"  {len(orders)} comenzi")
-
-order_items = generate_order_items(orders, products)
-print(f"  {len(order_items)} items")
-
-reviews = generate_reviews(users, products, 80)
-print(f"  {len(reviews)} reviews")
+parser = argparse.ArgumentParser(description="Populare PostgreSQL + MongoDB")
+parser.add_argument('--scale-factor', type=float, default=1,
+                    help="1 = datasetul original (100 useri, 200 produse, 150 comenzi)")
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--engine', choices=['numpy', 'faker'], default='numpy',
+                    help="numpy = generare columnara, faker = Faker rand cu rand")
+parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                    help="procese pentru generare (datasetul nu depinde de numarul lor)")
+parser.add_argument('--no-cache', action='store_true',
+                    help="regenereaza datele in loc sa le citeasca din cache/datasets")
+parser.add_argument('--pg-method', choices=list(PG_LOADERS), default='copy',
+                    help="copy = COPY FROM STDIN, values = INSERT cu VALUES pe mai multe randuri")
+parser.add_argument('--pg-threads', type=int, default=4,
+                    help="tabele PostgreSQL incarcate simultan (dupa graful de FK)")
+parser.add_argument('--mongo-batch-size', type=int, default=MONGO_BATCH_SIZE)
+parser.add_argument('--mongo-threads', type=int, default=len(TABLES),
+                    help="colectii incarcate simultan")
+parser.add_argument('--load-mode', choices=['pipeline', 'separate'], default='pipeline',
+                    help="pipeline = o singura generare alimenteaza ambele baze, separate = cate o trecere per baza")
+parser.add_argument('--queue-depth', type=int, default=QUEUE_DEPTH,
+                    help="chunk-uri maxime in coada fiecarei baze (pipeline)")
+parser.add_argument('--index-mode', choices=['upfront', 'deferred'], default='upfront',
+                    help="upfront = indexi inainte de insert, deferred = insert pe tabele fara indexi, "
+                         "UNIQUE si FK, adaugate dupa")
+parser.add_argument('--maintenance-workers', type=int, default=PG_MAINTENANCE_WORKERS,
+                    help="max_parallel_maintenance_workers la construirea indexilor PostgreSQL")
+parser.add_argument('--verify-range', type=int, default=CHUNK_SIZE,
+                    help="id-uri per interval la verificarea prin checksum")
+parser.add_argument('--verify-workers', type=int, default=CHECKSUM_WORKERS,
+                    help="intervale verificate simultan")
+parser.add_argument('--force', action='store_true',
+                    help="reincarca datele chiar daca manifestul din baze coincide")
+parser.add_argument('--snapshot', action='store_true',
+                    help="dupa verificare salveaza un snapshot (reset rapid cu snapshot.py restore)")
+parser.add_argument('--user-dist', default='uniform',
+                    help="activitatea userilor: uniform | zipf:S | hotspot:F:P")
+parser.add_argument('--product-dist', default='uniform',
+                    help="popularitatea produselor in comenzi")
+parser.add_argument('--review-dist', default='uniform',
+                    help="produsele care primesc review-uri")
+args = parser.parse_args()
+
+distributions = {
+    'user_activity': args.user_dist,
+    'product_popularity': args.product_dist,
+    'review_target': args.review_dist,
+}
 
-print("\nInsert PostgreSQL...")
+print("\n=== Script 3: Populare Date ===")
+counts = get_row_counts(args.scale_factor, distributions)
+print(f"Scale factor {args.scale_factor} (seed={args.seed}, engine={args.engine})")
+for table in TABLES:
+    if table != 'order_items':
+        print(f"  {table}: {counts[table]}")
+for name, spec in distributions.items():
+    print(f"  {name}: {spec}")
+
+# Procesele de generare pornesc acum, din thread-ul principal, inainte de
+# orice client sau thread de incarcare: fork dintr-un proces cu thread-uri
+# (monitoarele MongoClient, loaderii din run_dependency_graph) poate bloca
+# copiii. Toate tabelele folosesc acelasi pool.
+if args.engine == 'numpy':
+    columnar.build_vocabularies(args.seed)  # mostenit de workeri
+pool = chunk_pool(args.workers)
 
 pg_conn = get_pg_connection()
 pg_cursor = pg_conn.cursor()
+client, db = get_mongo_connection()
 
-# Clear existing data
-for table in ['reviews', 'order_items', 'orders', 'products', 'users', 'categories']:
-    pg_cursor.execute(f"DELETE FROM {table}")
-pg_conn.commit()
-
-for cat in categories:
-    pg_cursor.execute(
-        "INSERT INTO categories (id, name, description) VALUES (%s, %s, %s)",
-        (cat['id'], cat['name'], cat['description'])
-    )
-pg_conn.commit()
-
-for user in users:
-    pg_cursor.execute("""
-        INSERT INTO users (id, username, email, first_name, last_name, phone, address, city, country, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, (user['id'], user['username'], user['email'], user['first_name'], user['last_name'],
-          user['phone'], user['address'], user['city'], user['country'], user['created_at']))
-pg_conn.commit()
+# Daca ambele baze contin deja exact acest dataset nu mai e nimic de facut
+expected = dataset_manifest(args.scale_factor, args.seed, args.engine, distributions)
+pg_manifest = dict(expected, schema_hash=pg_schema_hash(pg_conn))
+mongo_manifest = dict(expected, schema_hash=mongo_schema_hash())
+if not args.force and read_pg_manifest(pg_conn) == pg_manifest and read_mongo_manifest(db) == mongo_manifest:
+    print("\nDatele sunt la zi (manifest identic in ambele baze) - nimic de incarcat")
+    print("  --force pentru reincarcare")
+    pg_cursor.close()
+    pg_conn.close()
+    client.close()
+    if pool:
+        pool.shutdown()
+    if args.snapshot:
+        snapshot_times = save_snapshot()
+        print(f"  Snapshot salvat: PostgreSQL {snapshot_times['postgresql']}s, MongoDB {snapshot_times['mongodb']}s")
+    print("Gata!\n")
+    sys.exit(0)
 
-for prod in products:
-    pg_cursor.execute("""
-        INSERT INTO products (id, sku, name, description, category_id, price, stock_quantity, rating, review_count, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, (prod['id'], prod['sku'], prod['name'], prod['description'], prod['category_id'],
-          prod['price'], prod['stock_quantity'], prod['rating'], prod['review_count'], prod['created_at']))
-pg_conn.commit()
+# Manifestul se scrie din nou abia dupa o verificare reusita
+clear_pg_manifest(pg_conn)
+clear_mongo_manifest(db)
 
-for order in orders:
-    pg_cursor.execute("""
-        INSERT INTO orders (id, order_number, user_id, status, total_amount, shipping_address, 
-                           shipping_city, shipping_country, payment_method, payment_status, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, (order['id'], order['order_number'], order['user_id'], order['status'], order['total_amount'],
-          order['shipping_address'], order['shipping_city'], order['shipping_country'],
-          order['payment_method'], order['payment_status'], order['created_at']))
-pg_conn.commit()
-
-for item in order_items:
-    pg_cursor.execute("""
-        INSERT INTO order_items (id, order_id, product_id, quantity, unit_price, total_price)
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """, (item['id'], item['order_id'], item['product_id'], item['quantity'], 
-          item['unit_price'], item['total_price']))
+# Clear existing data
+for table in reversed(TABLES):
+    pg_cursor.execute(f"DELETE FROM {table}")
 pg_conn.commit()
+for coll in TABLES:
+    db[coll].delete_many({})
 
-for review in reviews:
-    pg_cursor.execute("""
-        INSERT INTO reviews (id, product_id, user_id, rating, title, comment, is_verified, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """, (review['id'], review['product_id'], review['user_id'], review['rating'],
-          review['title'], review['comment'], review['is_verified'], review['created_at']))
-pg_conn.commit()
-print("  PostgreSQL - gata")
+timings = {}
+
+def timed(phase, func, *func_args):
+    start = time.perf_counter()
+    result = func(*func_args)
+    timings[phase] = round(time.perf_counter() - start, 3)
+    return result
+
+# Pe un cluster shardat (2_setup_mongodb.py --sharded) indexii unici ai
+# colectiilor shardate se omit
+mongo_indexes = shardable_indexes(db, MONGO_INDEXES)
+
+print(f"\nIndexi: {args.index_mode}")
+if args.index_mode == 'deferred':
+    timed('pg_drop_indexes', drop_pg_indexes, pg_conn, list(PG_INDEXES))
+    # Tabele goale de tot (raman doar cheile primare). Fara FK-uri graful de
+    # dependente e gol, deci toate tabelele se incarca in paralel. Daca
+    # incarcarea esueaza, constrangerile lipsesc pana la
+    # 1_setup_postgresql.py --recreate.
+    constraints = pg_constraints(pg_conn, TABLES)
+    timed('pg_drop_constraints', drop_pg_constraints, pg_conn, constraints)
+    timed('mongo_drop_indexes', drop_mongo_indexes, db, mongo_indexes)
+else:
+    # IF NOT EXISTS / create_indexes idempotent - ieftin pe tabele goale
+    timed('pg_indexes', build_pg_indexes, PG_INDEXES, 1, args.maintenance_workers)
+    timed('mongo_indexes', build_mongo_indexes, db, mongo_indexes)
+
+# Datele se genereaza (sau se citesc din cache) tabel cu tabel, in chunk-uri -
+# o singura data pentru ambele baze (pipeline) sau separat pentru fiecare
+if args.engine == 'numpy' and not args.no_cache:
+    start = time.perf_counter()
+    path, hit = dataset_cache.ensure_cached(args.scale_factor, args.seed, args.workers,
+                                            distributions=distributions, pool=pool)
+    print(f"  cache {'hit' if hit else 'miss (generat)'}: {path} ({time.perf_counter() - start:.2f}s)")
+
+def table_rows(table, workers=args.workers):
+    """Fresh chunk iterator for one table from the selected engine
+
+    Runs inside loader threads: generation goes to the shared pool (at most
+    2 * workers chunks in flight per table); cached chunks are read from
+    the memmaps in the calling thread.
+    """
+    if args.engine == 'numpy' and not args.no_cache:
+        return dataset_cache.generate_table_rows(path, table, counts, args.seed)
+    if args.engine == 'numpy':
+        return columnar.generate_table_rows(table, counts, args.seed, workers, pool)
+    return generate_table(table, counts, args.seed, workers, pool)
+
+parents = pg_foreign_keys(pg_conn, TABLES)
+pg_workers_per_table = max(1, args.workers // args.pg_threads)
+
+def load_pg(table):
+    """Own connection per table; commit makes the rows visible to the children"""
+    conn = get_pg_connection()
+    stats = load_pg_table(conn, table, table_rows(table, pg_workers_per_table), args.pg_method)
+    conn.close()
+    print(f"  {table}: {stats['rows']} randuri, {stats['rows_per_s']} rows/s")
+    return stats
+
+def load_both(table):
+    """One generation pass feeding the PostgreSQL and MongoDB loaders"""
+    stats = run_table_pipeline(table, table_rows(table, pg_workers_per_table), get_pg_connection, db,
+                               args.pg_method, args.mongo_batch_size, args.queue_depth)
+    pg, mongo = stats['postgresql'], stats['mongodb']
+    print(f"  {table}: {stats['rows']} randuri, generare {stats['generation_rows_per_s']} rows/s, "
+          f"PG {pg['rows_per_s']} rows/s (coada max {pg['queue_depth_max']}), "
+          f"Mongo {mongo['rows_per_s']} docs/s (coada max {mongo['queue_depth_max']})")
+    return stats
+
+for table in TABLES:
+    if parents[table]:
+        print(f"  {table} <- {', '.join(sorted(parents[table]))}")
+
+pipeline_stats = {}
+if args.load_mode == 'pipeline':
+    print(f"\nPipeline generare -> PostgreSQL ({args.pg_method}) + MongoDB "
+          f"({args.pg_threads} tabele simultan, coada {args.queue_depth} chunk-uri)...")
+    pipeline_stats = timed('load', run_dependency_graph, parents, load_both, args.pg_threads)
+    print("  PostgreSQL + MongoDB - gata")
+else:
+    print(f"\nInsert PostgreSQL ({args.pg_method}, {args.pg_threads} conexiuni)...")
+    timed('pg_load', run_dependency_graph, parents, load_pg, args.pg_threads)
+    print("  PostgreSQL - gata")
+
+    print(f"Insert MongoDB (batch {args.mongo_batch_size}, {args.mongo_threads} thread-uri)...")
+    # Procesele de generare se impart intre colectiile incarcate simultan
+    workers_per_table = max(1, args.workers // args.mongo_threads)
+    mongo_stats = timed('mongo_load', load_mongo_parallel,
+                        db, {table: table_rows(table, workers_per_table) for table in TABLES},
+                        args.mongo_batch_size, args.mongo_threads)
+    for table, stats in mongo_stats.items():
+        print(f"  {table}: {stats['rows']} documente, {stats['rows_per_s']} docs/s")
+    print("  MongoDB - gata")
+
+if pool:
+    pool.shutdown()
+
+if args.index_mode == 'deferred':
+    print(f"Construire indexi (maintenance workers={args.maintenance_workers})...")
+    pg_index_times = timed('pg_indexes', build_pg_indexes, PG_INDEXES,
+                           len(PG_INDEXES), args.maintenance_workers)
+    constraint_times = timed('pg_constraints', build_pg_constraints, constraints,
+                             max(1, len(constraints)), args.maintenance_workers)
+    mongo_index_times = timed('mongo_indexes', build_mongo_indexes, db, mongo_indexes)
+    print(f"  PostgreSQL: {timings['pg_indexes']}s (cel mai lent: {max(pg_index_times.values())}s)")
+    if constraint_times:
+        print(f"  PostgreSQL UNIQUE + FK: {timings['pg_constraints']}s "
+              f"(cel mai lent: {max(constraint_times.values())}s)")
+    print(f"  MongoDB: {timings['mongo_indexes']}s")
+
+print("Timpi pe faze:")
+for phase, seconds in timings.items():
+    print(f"  {phase}: {seconds}s")
+
+# Un fisier pentru toate modurile - rulat o data cu fiecare pentru comparatie
+os.makedirs("results", exist_ok=True)
+try:
+    with open("results/load_timings.json", "r") as f:
+        load_timings = json.load(f)
+except FileNotFoundError:
+    load_timings = {}
+load_timings[f"{args.index_mode}_{args.load_mode}"] = {
+    "test_date": datetime.now().isoformat(),
+    "scale_factor": args.scale_factor,
+    "pg_method": args.pg_method,
+    "index_mode": args.index_mode,
+    "load_mode": args.load_mode,
+    "phases": timings,
+    "pg_load_total": round(timings.get('pg_load', timings.get('load', 0)) + timings.get('pg_indexes', 0)
+                           + timings.get('pg_constraints', 0), 3),
+    "mongo_load_total": round(timings.get('mongo_load', timings.get('load', 0)) + timings.get('mongo_indexes', 0), 3),
+    "pipeline": pipeline_stats
+}
+with open("results/load_timings.json", "w") as f:
+    json.dump(load_timings, f, indent=2)
 
 # Reset sequences
-pg_cursor.execute("SELECT setval('categories_id_seq', (SELECT MAX(id) FROM categories))")
-pg_cursor.execute("SELECT setval('users_id_seq', (SELECT MAX(id) FROM users))")
-pg_cursor.execute("SELECT setval('products_id_seq', (SELECT MAX(id) FROM products))")
-pg_cursor.execute("SELECT setval('orders_id_seq', (SELECT MAX(id) FROM orders))")
-pg_cursor.execute("SELECT setval('order_items_id_seq', (SELECT MAX(id) FROM order_items))")
-pg_cursor.execute("SELECT setval('reviews_id_seq', (SELECT MAX(id) FROM reviews))")
+for table in TABLES:
+    pg_cursor.execute(f"SELECT setval('{table}_id_seq', (SELECT MAX(id) FROM {table}))")
 pg_conn.commit()
 
 pg_cursor.close()
 pg_conn.close()
-
-print("Insert MongoDB...")
-
-client, db = get_mongo_connection()
-
-# Clear existing data
-for coll in ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']:
-    db[coll].delete_many({})
-
-mongo_categories = [{'_id': c['id'], **c} for c in categories]
-db.categories.insert_many(mongo_categories)
-
-mongo_users = [{'_id': u['id'], **u} for u in users]
-db.users.insert_many(mongo_users)
-
-mongo_products = [{'_id': p['id'], **p} for p in products]
-db.products.insert_many(mongo_products)
-
-mongo_orders = [{'_id': o['id'], **o} for o in orders]
-db.orders.insert_many(mongo_orders)
-
-mongo_items = [{'_id': i['id'], **i} for i in order_items]
-db.order_items.insert_many(mongo_items)
-
-mongo_reviews = [{'_id': r['id'], **r} for r in reviews]
-db.reviews.insert_many(mongo_reviews)
-print("  MongoDB - gata")
-
 client.close()
 
-print("\nVerificare...")
-
-# PostgreSQL 
-pg_conn = get_pg_connection()
-pg_cursor = pg_conn.cursor()
-
-pg_counts = {}
-for table in ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']:
-    pg_cursor.execute(f"SELECT COUNT(*) FROM {table}")
-    pg_counts[table] = pg_cursor.fetchone()[0]
-
-pg_cursor.close()
-pg_conn.close()
-
-# MongoDB
+print("\nVerificare (checksum-uri pe intervale de id-uri)...")
 client, db = get_mongo_connection()
-
-mongo_counts = {}
-for coll in ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']:
-    mongo_counts[coll] = db[coll].count_documents({})
-
+start = time.perf_counter()
+report = verify_tables(db, TABLES, args.verify_range, args.verify_workers)
 client.close()
 
-# Comparare
 all_match = True
-for table in ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']:
-    if pg_counts[table] != mongo_counts[table]:
-        print(f"  {table}: DIFERIT!")
+for table, info in report.items():
+    if info['mismatched_ranges']:
         all_match = False
+        print(f"  {table}: DIFERIT! {info['mismatched_ranges']}/{info['ranges']} intervale")
+        for row_id, column in info['problems'][:10]:
+            print(f"    id {row_id}: {column}")
+        if len(info['problems']) > 10:
+            print(f"    ... inca {len(info['problems']) - 10}")
 
 if all_match:
-    total = sum(pg_counts.values())
-    print(f"  Date identice: {total} inregistrari")
+    total = sum(info['rows'] for info in report.values())
+    ranges = sum(info['ranges'] for info in report.values())
+    print(f"  Date identice: {total} inregistrari, {ranges} intervale ({time.perf_counter() - start:.2f}s)")
+    pg_conn = get_pg_connection()
+    write_pg_manifest(pg_conn, pg_manifest)
+    pg_conn.close()
+    client, db = get_mongo_connection()
+    write_mongo_manifest(db, mongo_manifest)
+    client.close()
+    print("  Manifest salvat")
+    if args.snapshot:
+        snapshot_times = save_snapshot()
+        print(f"  Snapshot salvat: PostgreSQL {snapshot_times['postgresql']}s, MongoDB {snapshot_times['mongodb']}s")
     print("Gata!\n")
 else:
     print("EROARE: Datele difera!")
-
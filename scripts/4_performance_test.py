@@ -1,230 +1,139 @@
 #!/usr/bin/env python3
 import sys
 import os
-import time
 import json
+import random
+import argparse
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(__file__))
 
 from utils import (
-    get_pg_connection, get_mongo_connection,
+    get_pg_connection, get_mongo_connection, SEED,
     print_section, print_success, print_info
 )
+from distributions import parse_distribution, sample_id
+from text_search import (
+    pg_trigram_available, create_pg_search_indexes, drop_pg_search_indexes,
+    create_mongo_text_index, create_mongo_trigrams, drop_mongo_search
+)
+from workloads import WORKLOADS, select_workloads, time_windows, pg_runner, mongo_runner
+from latency import measure
+
+parser = argparse.ArgumentParser(description="Test performanta PostgreSQL vs MongoDB")
+parser.add_argument('--workloads', default='',
+                    help=f"workload-uri de rulat, separate prin virgula ({', '.join(WORKLOADS)})")
+parser.add_argument('--tags', default='core',
+                    help="fara --workloads: workload-urile cu aceste tag-uri (core, time, join, point, ...)")
+parser.add_argument('--user-dist', default='uniform',
+                    help="alegerea userilor in Q7: uniform | zipf:S | hotspot:F:P")
+parser.add_argument('--product-dist', default='uniform',
+                    help="alegerea produselor in Q8")
+parser.add_argument('--lookups', type=int, default=100,
+                    help="interogari punctuale per iteratie in Q7/Q8")
+parser.add_argument('--warmup', type=int, default=2, help="executii nemasurate inainte de fiecare workload")
+parser.add_argument('--min-iterations', type=int, default=5)
+parser.add_argument('--max-iterations', type=int, default=1000)
+parser.add_argument('--max-seconds', type=float, default=10.0, help="timp maxim de masurare per workload")
+parser.add_argument('--ci-target', type=float, default=0.05,
+                    help="se masoara pana cand intervalul de incredere 95%% al mediei e sub acest procent din medie")
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--search-mode', choices=['scan', 'indexed'], default='scan',
+                    help="Q6: scan (LIKE / $regex) sau indexed (pg_trgm sau full-text / index text)")
+args = parser.parse_args()
+parse_distribution(args.user_dist)
+parse_distribution(args.product_dist)
 
 print("\n=== Script 4: Test Performanta ===")
 
+names = [name for name in args.workloads.split(',') if name]
+workloads = select_workloads(names, None if names else args.tags.split(','))
+
 results = {
     "test_date": datetime.now().isoformat(),
+    "access_distributions": {"users": args.user_dist, "products": args.product_dist},
+    "search_mode": {"mode": args.search_mode},
+    "measurement": {"warmup": args.warmup, "min_iterations": args.min_iterations,
+                    "max_iterations": args.max_iterations, "max_seconds": args.max_seconds,
+                    "ci_target": args.ci_target, "histogram": "HDR, 3 cifre semnificative, microsecunde"},
     "postgresql": {},
     "mongodb": {},
     "queries": []
 }
 
-def measure_time(func, iterations=5):
-    """Execute function multiple times and return average time in ms"""
-    times = []
-    for _ in range(iterations):
-        start = time.perf_counter()
-        result = func()
-        end = time.perf_counter()
-        times.append((end - start) * 1000)
-    return {
-        "min": round(min(times), 3),
-        "max": round(max(times), 3),
-        "avg": round(sum(times) / len(times), 3),
-        "result_count": result if isinstance(result, int) else len(result) if hasattr(result, '__len__') else 1
-    }
-
-print("\nPostgreSQL:")
+def key_stream(spec, count):
+    """Same key sequence for both engines: (user|product) ids drawn from spec"""
+    rng = random.Random(args.seed)
+    return lambda: sample_id(spec, rng, count, args.seed)
 
 pg_conn = get_pg_connection()
 pg_cursor = pg_conn.cursor()
-
-print("  Q1: SELECT all products")
-def pg_select_all_products():
-    pg_cursor.execute("SELECT * FROM products")
-    return pg_cursor.fetchall()
-pg_q1 = measure_time(pg_select_all_products)
-print(f"     {pg_q1['avg']}ms")
-
-print("  Q2: WHERE price > 500")
-def pg_select_expensive():
-    pg_cursor.execute("SELECT * FROM products WHERE price > 500")
-    return pg_cursor.fetchall()
-pg_q2 = measure_time(pg_select_expensive)
-print(f"     {pg_q2['avg']}ms")
-
-print("  Q3: JOIN orders-users")
-def pg_join_orders_users():
-    pg_cursor.execute("""
-        SELECT o.order_number, u.username, u.email, o.total_amount, o.status
-        FROM orders o
-        JOIN users u ON o.user_id = u.id
-    """)
-    return pg_cursor.fetchall()
-pg_q3 = measure_time(pg_join_orders_users)
-print(f"     {pg_q3['avg']}ms")
-
-print("  Q4: COUNT by status")
-def pg_aggregate():
-    pg_cursor.execute("""
-        SELECT status, COUNT(*) as count, SUM(total_amount) as total
-        FROM orders
-        GROUP BY status
-    """)
-    return pg_cursor.fetchall()
-pg_q4 = measure_time(pg_aggregate)
-print(f"     {pg_q4['avg']}ms")
-
-print("  Q5: Complex JOIN")
-def pg_complex_join():
-    pg_cursor.execute("""
-        SELECT o.order_number, p.name as product_name, oi.quantity, oi.total_price, c.name as category
-        FROM orders o
-        JOIN order_items oi ON o.id = oi.order_id
-        JOIN products p ON oi.product_id = p.id
-        JOIN categories c ON p.category_id = c.id
-        WHERE o.status = 'completed'
-    """)
-    return pg_cursor.fetchall()
-pg_q5 = measure_time(pg_complex_join)
-print(f"     {pg_q5['avg']}ms")
-
-print("  Q6: LIKE search")
-def pg_like_search():
-    pg_cursor.execute("SELECT * FROM products WHERE name LIKE '%Pro%'")
-    return pg_cursor.fetchall()
-pg_q6 = measure_time(pg_like_search)
-print(f"     {pg_q6['avg']}ms")
-
-pg_cursor.close()
-pg_conn.close()
-
-results["postgresql"] = {
-    "q1_select_all": pg_q1,
-    "q2_select_where": pg_q2,
-    "q3_join": pg_q3,
-    "q4_aggregate": pg_q4,
-    "q5_complex_join": pg_q5,
-    "q6_like_search": pg_q6,
-    "total_avg_ms": round(pg_q1['avg'] + pg_q2['avg'] + pg_q3['avg'] + pg_q4['avg'] + pg_q5['avg'] + pg_q6['avg'], 3)
-}
-
-print("\nMongoDB:")
-
 client, db = get_mongo_connection()
 
-print("  Q1: Find all products")
-def mongo_find_all():
-    return list(db.products.find())
-mongo_q1 = measure_time(mongo_find_all)
-print(f"     {mongo_q1['avg']}ms")
-
-print("  Q2: price > 500")
-def mongo_find_expensive():
-    return list(db.products.find({"price": {"$gt": 500}}))
-mongo_q2 = measure_time(mongo_find_expensive)
-print(f"     {mongo_q2['avg']}ms")
-
-print("  Q3: Lookup orders-users")
-def mongo_lookup_users():
-    pipeline = [
-        {"$lookup": {
-            "from": "users",
-            "localField": "user_id",
-            "foreignField": "id",
-            "as": "user"
-        }},
-        {"$unwind": "$user"},
-        {"$project": {
-            "order_number": 1,
-            "username": "$user.username",
-            "email": "$user.email",
-            "total_amount": 1,
-            "status": 1
-        }}
-    ]
-    return list(db.orders.aggregate(pipeline))
-mongo_q3 = measure_time(mongo_lookup_users)
-print(f"     {mongo_q3['avg']}ms")
-
-print("  Q4: Aggregate by status")
-def mongo_aggregate():
-    pipeline = [
-        {"$group": {
-            "_id": "$status",
-            "count": {"$sum": 1},
-            "total": {"$sum": "$total_amount"}
-        }}
-    ]
-    return list(db.orders.aggregate(pipeline))
-mongo_q4 = measure_time(mongo_aggregate)
-print(f"     {mongo_q4['avg']}ms")
-
-print("  Q5: Complex pipeline")
-def mongo_complex_pipeline():
-    pipeline = [
-        {"$match": {"status": "completed"}},
-        {"$lookup": {
-            "from": "order_items",
-            "localField": "id",
-            "foreignField": "order_id",
-            "as": "items"
-        }},
-        {"$unwind": "$items"},
-        {"$lookup": {
-            "from": "products",
-            "localField": "items.product_id",
-            "foreignField": "id",
-            "as": "product"
-        }},
-        {"$unwind": "$product"},
-        {"$lookup": {
-            "from": "categories",
-            "localField": "product.category_id",
-            "foreignField": "id",
-            "as": "category"
-        }},
-        {"$unwind": "$category"},
-        {"$project": {
-            "order_number": 1,
-            "product_name": "$product.name",
-            "quantity": "$items.quantity",
-            "total_price": "$items.total_price",
-            "category": "$category.name"
-        }}
-    ]
-    return list(db.orders.aggregate(pipeline))
-mongo_q5 = measure_time(mongo_complex_pipeline)
-print(f"     {mongo_q5['avg']}ms")
-
-print("  Q6: Regex search")
-def mongo_regex_search():
-    return list(db.products.find({"name": {"$regex": "Pro", "$options": "i"}}))
-mongo_q6 = measure_time(mongo_regex_search)
-print(f"     {mongo_q6['avg']}ms")
-
-client.close()
-
-results["mongodb"] = {
-    "q1_find_all": mongo_q1,
-    "q2_find_filter": mongo_q2,
-    "q3_lookup": mongo_q3,
-    "q4_aggregate": mongo_q4,
-    "q5_complex_pipeline": mongo_q5,
-    "q6_regex_search": mongo_q6,
-    "total_avg_ms": round(mongo_q1['avg'] + mongo_q2['avg'] + mongo_q3['avg'] + mongo_q4['avg'] + mongo_q5['avg'] + mongo_q6['avg'], 3)
-}
+pg_cursor.execute("SELECT MAX(id) FROM users")
+user_count = pg_cursor.fetchone()[0] or 1
+pg_cursor.execute("SELECT MAX(id) FROM products")
+product_count = pg_cursor.fetchone()[0] or 1
+
+def engine_keys():
+    """Fresh key streams per engine - both see the same ids in the same order"""
+    return dict(time_windows(), user=key_stream(args.user_dist, user_count),
+                product=key_stream(args.product_dist, product_count))
+
+def create_search_indexes():
+    """Build the indexes of the Q6 variant; returns its workload name"""
+    # ILIKE pe indexul trigram (name_trigrams in MongoDB); fara pg_trgm,
+    # full-text pe tsvector (index text in MongoDB)
+    if pg_trigram_available(pg_conn):
+        create_pg_search_indexes(pg_conn)
+        create_mongo_trigrams(db.products)
+        results["search_mode"].update(postgresql='pg_trgm', mongodb='trigram')
+        return 'q6_trigram_search'
+    create_pg_search_indexes(pg_conn)
+    create_mongo_text_index(db.products)
+    results["search_mode"].update(postgresql='fulltext', mongodb='text')
+    return 'q6_fulltext_search'
+
+def drop_search_indexes():
+    pg_conn.rollback()
+    drop_pg_search_indexes(pg_conn)
+    drop_mongo_search(db.products)
+
+def run_engine(engine, runner, target):
+    print(f"\n{'PostgreSQL' if engine == 'postgresql' else 'MongoDB'}:")
+    keys = engine_keys()
+    for workload in workloads:
+        print(f"  {workload.name}: {workload.title}")
+        run, fields = runner(workload, target, keys, args.lookups)
+        stats = measure(run, args.warmup, args.min_iterations, args.max_iterations, args.max_seconds,
+                        args.ci_target)
+        stats["shape_ok"] = workload.shape_ok(engine, fields or None)
+        results[engine][workload.name] = stats
+        print(f"     avg={stats['avg']}ms p50={stats['p50']}ms p99={stats['p99']}ms p99.9={stats['p999']}ms "
+              f"({stats['iterations']} iteratii{'' if stats['converged'] else ', CI neatins'})")
+    results[engine]["total_avg_ms"] = round(sum(results[engine][w.name]['avg'] for w in workloads), 3)
+
+# Indexii de cautare sunt creati pe tabelele principale, deci se sterg dupa
+# rulare - altfel un --search-mode scan ulterior ar folosi indexul trigram
+try:
+    if args.search_mode == 'indexed':
+        indexed = create_search_indexes()
+        workloads = [WORKLOADS[indexed] if w.name == 'q6_like_search' else w for w in workloads]
+    results["workloads"] = [workload.name for workload in workloads]
+    run_engine("postgresql", pg_runner, pg_cursor)
+    run_engine("mongodb", mongo_runner, db)
+finally:
+    if args.search_mode == 'indexed':
+        drop_search_indexes()
+    pg_cursor.close()
+    pg_conn.close()
+    client.close()
 
 # Query comparison data
 results["queries"] = [
-    {"name": "Select All", "postgresql": pg_q1['avg'], "mongodb": mongo_q1['avg']},
-    {"name": "Filter (WHERE)", "postgresql": pg_q2['avg'], "mongodb": mongo_q2['avg']},
-    {"name": "JOIN/Lookup", "postgresql": pg_q3['avg'], "mongodb": mongo_q3['avg']},
-    {"name": "Aggregation", "postgresql": pg_q4['avg'], "mongodb": mongo_q4['avg']},
-    {"name": "Complex JOIN", "postgresql": pg_q5['avg'], "mongodb": mongo_q5['avg']},
-    {"name": "Text Search", "postgresql": pg_q6['avg'], "mongodb": mongo_q6['avg']},
+    {"name": workload.title, "postgresql": results["postgresql"][workload.name]['avg'],
+     "mongodb": results["mongodb"][workload.name]['avg']}
+    for workload in workloads
 ]
 
 print("\nRezultat:")
@@ -3,6 +3,7 @@ import sys
 import os
 import json
 import time
+import argparse
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(__file__))
@@ -11,6 +12,12 @@ from utils import (
     get_pg_connection, get_mongo_connection,
     print_section, print_success, print_info, print_error
 )
+from snapshot import restore_snapshot
+
+parser = argparse.ArgumentParser(description="Teste CAP")
+parser.add_argument('--reset', action='store_true',
+                    help="restaureaza snapshot-ul (3_populate_data.py --snapshot) inainte de teste")
+args = parser.parse_args()
 
 results = {
     "test_date": datetime.now().isoformat(),
@@ -31,6 +38,11 @@ results = {
 
 print("\n=== Script 5: CAP Theorem ===")
 
+if args.reset:
+    print("Restaurare snapshot...")
+    results["reset"] = restore_snapshot()
+    print(f"  PostgreSQL {results['reset']['postgresql']}s, MongoDB {results['reset']['mongodb']}s")
+
 print("\n1. Teste Consistenta")
 print("PostgreSQL:")
 pg_conn = get_pg_connection()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import sys
+import os
+import time
+import json
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import TABLES, SEED, generate_table, get_row_counts
+from columnar import build_vocabularies, generate_table_columns, columns_to_rows, generate_dataset, columns_digest
+from dataset_cache import ensure_cached, load_entry, load_table_columns
+
+parser = argparse.ArgumentParser(description="Benchmark generare date: Faker vs NumPy")
+parser.add_argument('--scale-factor', type=float, default=10)
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+args = parser.parse_args()
+
+print("\n=== Script 7: Benchmark Generare Date ===")
+
+counts = get_row_counts(args.scale_factor)
+results = {
+    "test_date": datetime.now().isoformat(),
+    "scale_factor": args.scale_factor,
+    "seed": args.seed,
+    "tables": {}
+}
+
+def process_digests(workers):
+    """columns_digest of every table, computed by a new interpreter with `workers` processes
+
+    A separate process has its own hash seed and its own generator state, so
+    a match also rules out dependence on process-local state or worker count.
+    """
+    code = ("import sys, json; sys.path.insert(0, sys.argv[1]); "
+            "from utils import TABLES, get_row_counts; from columnar import columns_digest; "
+            "counts = get_row_counts(float(sys.argv[2])); "
+            "print(json.dumps({t: columns_digest(t, counts, int(sys.argv[3]), int(sys.argv[4])) for t in TABLES}))")
+    output = subprocess.run([sys.executable, '-c', code, os.path.dirname(os.path.abspath(__file__)),
+                             str(args.scale_factor), str(args.seed), str(workers)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def run(gen):
+    start = time.perf_counter()
+    rows = sum(len(chunk) if isinstance(chunk, list) else len(chunk['id']) for chunk in gen)
+    return rows, time.perf_counter() - start
+
+print("Vocabular...")
+start = time.perf_counter()
+vocab = build_vocabularies(args.seed)
+vocab_s = time.perf_counter() - start
+results["vocabulary_build_s"] = round(vocab_s, 3)
+print(f"  {vocab_s:.2f}s")
+
+# Digest-urile de referinta: acest proces, un worker vs un proces nou cu max_workers
+reference_digests = process_digests(max(2, args.max_workers))
+
+for table in TABLES:
+    print(f"  {table}:")
+    faker_rows, faker_s = run(generate_table(table, counts, args.seed))
+    numpy_rows, columns_s = run(generate_table_columns(table, counts, args.seed))
+    _, numpy_rows_s = run(columns_to_rows(table, c, vocab)
+                          for c in generate_table_columns(table, counts, args.seed))
+    reproducible = columns_digest(table, counts, args.seed) == reference_digests[table]
+
+    # order_items: numarul de item-uri per comanda difera intre motoare
+    results["tables"][table] = {
+        "faker_rows": faker_rows,
+        "numpy_rows": numpy_rows,
+        "faker_rows_per_s": round(faker_rows / faker_s),
+        "numpy_columns_rows_per_s": round(numpy_rows / columns_s),
+        "numpy_rows_per_s": round(numpy_rows / numpy_rows_s),
+        "speedup": round((numpy_rows / numpy_rows_s) / (faker_rows / faker_s), 1),
+        "reproducible": reproducible
+    }
+    r = results["tables"][table]
+    print(f"     faker={r['faker_rows_per_s']} rows/s  numpy={r['numpy_rows_per_s']} rows/s "
+          f"(coloane: {r['numpy_columns_rows_per_s']})  x{r['speedup']}")
+    if not reproducible:
+        print("     EROARE: output diferit la acelasi seed (alt proces / alt numar de workeri)!")
+
+def dataset_digest(workers):
+    """(hash, row count) over the rows handed to the loaders (numpy engine, all tables)"""
+    digest = hashlib.blake2b(digest_size=16)
+    total = 0
+    for table, rows in generate_dataset(args.scale_factor, args.seed, workers):
+        digest.update(repr(rows).encode())
+        total += len(rows)
+    return digest.hexdigest(), total
+
+# Sharding pe procese: acelasi digest pentru orice numar de workeri
+print("Workeri (numpy, toate tabelele):")
+reference = None
+results["workers"] = []
+workers = 1
+while True:
+    start = time.perf_counter()
+    digest, total_rows = dataset_digest(workers)
+    elapsed = time.perf_counter() - start
+    reference = reference or digest
+    identical = digest == reference
+    results["workers"].append({
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(total_rows / elapsed),
+        "identical": identical
+    })
+    print(f"  {workers}: {elapsed:.2f}s ({total_rows / elapsed:.0f} rows/s) "
+          f"{'identic' if identical else 'DIFERIT!'}")
+    if workers >= args.max_workers:
+        break
+    workers = min(workers * 2, args.max_workers)
+
+# Cache pe disc: prima rulare scrie .npy, urmatoarele doar fac mmap
+print("Cache .npy:")
+with tempfile.TemporaryDirectory() as cache_dir:
+    start = time.perf_counter()
+    path, _ = ensure_cached(args.scale_factor, args.seed, args.max_workers, cache_dir)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ensure_cached(args.scale_factor, args.seed, args.max_workers, cache_dir)
+    manifest, vocab, _ = load_entry(path)
+    rows = sum(len(columns_to_rows(table, columns, vocab))
+               for table in TABLES for columns in load_table_columns(path, table))
+    warm_s = time.perf_counter() - start
+results["cache"] = {"cold_s": round(cold_s, 3), "warm_rows_s": round(warm_s, 3), "rows": rows}
+print(f"  scriere={cold_s:.2f}s  citire mmap + randuri={warm_s:.2f}s")
+
+os.makedirs("results", exist_ok=True)
+with open("results/generation_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2, default=str)
+
+print("Gata!\n")
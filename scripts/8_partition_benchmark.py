@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, DATASET_EPOCH
+from schema import PARTITIONED_TABLES, is_partitioned, list_partitions, archive_month
+
+parser = argparse.ArgumentParser(description="Benchmark interogari pe intervale de timp / partitionare")
+parser.add_argument('--iterations', type=int, default=5)
+parser.add_argument('--archive-month', metavar='YYYY-MM',
+                    help="arhiveaza luna (DETACH PARTITION sau DELETE) si masoara timpul - modifica datele!")
+args = parser.parse_args()
+
+print("\n=== Script 8: Partitionare PostgreSQL ===")
+
+# Ferestre de timp relative la DATASET_EPOCH (datele generate sunt fixe)
+day = timedelta(days=1)
+month_end = DATASET_EPOCH.replace(day=1)
+month_start = (month_end - day).replace(day=1)
+WINDOW_QUERIES = {
+    'W1_revenue_7d': ("""
+        SELECT COUNT(*), SUM(total_amount) FROM orders
+        WHERE created_at >= %s AND created_at < %s
+    """, (DATASET_EPOCH - 7 * day, DATASET_EPOCH)),
+    'W2_items_month': ("""
+        SELECT product_id, SUM(quantity) AS sold FROM order_items
+        WHERE created_at >= %s AND created_at < %s
+        GROUP BY product_id ORDER BY sold DESC LIMIT 10
+    """, (month_start, month_end)),
+    'W3_status_revenue_14d': ("""
+        SELECT o.status, SUM(oi.total_price) FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id AND oi.created_at = o.created_at
+        WHERE o.created_at >= %s AND o.created_at < %s
+        GROUP BY o.status
+    """, (DATASET_EPOCH - 14 * day, DATASET_EPOCH)),
+    'W4_full_history': ("""
+        SELECT COUNT(*), SUM(total_amount) FROM orders
+    """, ()),
+}
+
+def scanned_relations(plan):
+    """Relation names read by the scan nodes of an EXPLAIN (FORMAT JSON) plan"""
+    names = set()
+    if 'Relation Name' in plan:
+        names.add(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        names |= scanned_relations(child)
+    return names
+
+conn = get_pg_connection()
+cursor = conn.cursor()
+
+partitioned = is_partitioned(cursor, 'orders')
+partitions = {table: [name for name, _ in list_partitions(cursor, table)] for table in PARTITIONED_TABLES}
+print(f"Schema: {'partitionata' if partitioned else 'standard'}")
+for table, names in partitions.items():
+    if names:
+        print(f"  {table}: {len(names)} partitii")
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "partitioned": partitioned,
+    "partitions": partitions,
+    "queries": {}
+}
+
+print("\nInterogari pe intervale de timp:")
+for name, (sql, params) in WINDOW_QUERIES.items():
+    cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scanned = scanned_relations(plan[0]['Plan'])
+    total = sum(len(names) for names in partitions.values())
+    scanned_partitions = sorted(n for n in scanned if any(n in names for names in partitions.values()))
+
+    times = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        times.append((time.perf_counter() - start) * 1000)
+
+    results["queries"][name] = {
+        "avg_ms": round(sum(times) / len(times), 3),
+        "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3),
+        "relations_scanned": sorted(scanned),
+        "partitions_scanned": len(scanned_partitions),
+        "partitions_total": total
+    }
+    pruning = f", partitii {len(scanned_partitions)}/{total}" if partitioned else ""
+    print(f"  {name}: avg={results['queries'][name]['avg_ms']:.2f}ms{pruning}")
+
+if args.archive_month:
+    print(f"\nArhivare {args.archive_month}...")
+    archive = archive_month(conn, args.archive_month)
+    results["archive"] = dict(archive, month=args.archive_month)
+    print(f"  {archive['method']}: {archive['rows']} randuri in {archive['seconds']}s")
+    print("  (reset cu snapshot.py restore)")
+
+cursor.close()
+conn.close()
+
+# Un fisier per varianta - rulat o data pe fiecare schema pentru comparatie
+os.makedirs("results", exist_ok=True)
+try:
+    with open("results/partition_benchmark.json", "r") as f:
+        all_results = json.load(f)
+except FileNotFoundError:
+    all_results = {}
+all_results['partitioned' if partitioned else 'standard'] = results
+with open("results/partition_benchmark.json", "w") as f:
+    json.dump(all_results, f, indent=2)
+
+print("Gata!\n")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import TABLES, SEED, DATASET_EPOCH, MONGO_INDEXES, get_row_counts
+from dataset_cache import ensure_cached, generate_table_rows
+from loaders import load_mongo_parallel, build_mongo_indexes
+from mongo_cluster import LocalShardedCluster, SHARD_KEYS, BASE_PORT, shard_collections, shards_targeted, shardable_indexes
+
+parser = argparse.ArgumentParser(description="Benchmark MongoDB shardat local: targeted vs scatter-gather")
+parser.add_argument('--shards', default='1,2,4',
+                    help="numar de shard-uri de testat, separate prin virgula")
+parser.add_argument('--strategy', choices=list(SHARD_KEYS) + ['both'], default='both')
+parser.add_argument('--scale-factor', type=float, default=10)
+parser.add_argument('--seed', type=int, default=SEED)
+parser.add_argument('--workers', type=int, default=os.cpu_count())
+parser.add_argument('--iterations', type=int, default=20)
+parser.add_argument('--base-port', type=int, default=BASE_PORT)
+args = parser.parse_args()
+
+print("\n=== Script 9: MongoDB Sharding ===")
+
+shard_counts = [int(n) for n in args.shards.split(',')]
+strategies = list(SHARD_KEYS) if args.strategy == 'both' else [args.strategy]
+counts = get_row_counts(args.scale_factor)
+path, hit = ensure_cached(args.scale_factor, args.seed, args.workers)
+print(f"Scale factor {args.scale_factor}, cache {'hit' if hit else 'miss (generat)'}")
+
+DB_NAME = 'sharding_bench'
+week_ago = DATASET_EPOCH - timedelta(days=7)
+
+# nume -> (colectie, find | aggregate, user_id -> filtru / pipeline)
+QUERIES = {
+    'S1_orders_by_user': ('orders', 'find', lambda user: {'user_id': user}),
+    'S2_reviews_by_user': ('reviews', 'find', lambda user: {'user_id': user}),
+    'S3_orders_last_7d': ('orders', 'find', lambda user: {'created_at': {'$gte': week_ago, '$lt': DATASET_EPOCH}}),
+    'S4_orders_by_status': ('orders', 'find', lambda user: {'status': 'pending'}),
+    'S5_revenue_by_status': ('orders', 'aggregate', lambda user: [
+        {'$group': {'_id': '$status', 'revenue': {'$sum': '$total_amount'}}}
+    ]),
+}
+
+def run_query(db, coll, kind, spec):
+    if kind == 'find':
+        return list(db[coll].find(spec))
+    return list(db[coll].aggregate(spec))
+
+def explain_query(db, coll, kind, spec):
+    if kind == 'find':
+        return db.command('explain', {'find': coll, 'filter': spec}, verbosity='queryPlanner')
+    return db.command('aggregate', coll, pipeline=spec, explain=True)
+
+results = {
+    "test_date": datetime.now().isoformat(),
+    "scale_factor": args.scale_factor,
+    "runs": []
+}
+
+for strategy in strategies:
+    for shards in shard_counts:
+        print(f"\n{strategy}, {shards} shard-uri:")
+        with LocalShardedCluster(shards, args.base_port) as cluster:
+            client = MongoClient(cluster.uri)
+            db = client[DB_NAME]
+            shard_collections(client, DB_NAME, strategy, shards)
+
+            start = time.perf_counter()
+            # Chunk-urile din cache se citesc in thread-urile de incarcare, fara
+            # procese: fork langa thread-urile MongoClient poate bloca copiii
+            load = load_mongo_parallel(db, {t: generate_table_rows(path, t, counts, args.seed) for t in TABLES})
+            load_s = time.perf_counter() - start
+            rows = sum(stats['rows'] for stats in load.values())
+            build_mongo_indexes(db, shardable_indexes(db, MONGO_INDEXES))
+            print(f"  incarcare: {rows} documente, {round(rows / load_s)} docs/s")
+
+            run = {
+                "strategy": strategy,
+                "shards": shards,
+                "shard_keys": {coll: {k: str(v) for k, v in key.items()}
+                               for coll, key in SHARD_KEYS[strategy].items()},
+                "load_docs_per_s": round(rows / load_s),
+                "queries": {}
+            }
+            rng = random.Random(args.seed)
+            for name, (coll, kind, make) in QUERIES.items():
+                targeted = shards_targeted(explain_query(db, coll, kind, make(1)))
+                times = []
+                for _ in range(args.iterations):
+                    spec = make(rng.randint(1, counts['users']))
+                    start = time.perf_counter()
+                    run_query(db, coll, kind, spec)
+                    times.append((time.perf_counter() - start) * 1000)
+                run["queries"][name] = {
+                    "avg_ms": round(sum(times) / len(times), 3),
+                    "max_ms": round(max(times), 3),
+                    "shards_hit": len(targeted),
+                    "mode": "single-shard" if shards == 1 else
+                            "targeted" if len(targeted) < shards else "scatter-gather"
+                }
+                q = run["queries"][name]
+                print(f"  {name}: avg={q['avg_ms']:.2f}ms, shard-uri {q['shards_hit']}/{shards} ({q['mode']})")
+            results["runs"].append(run)
+            client.close()
+
+os.makedirs("results", exist_ok=True)
+with open("results/sharding_benchmark.json", "w") as f:
+    json.dump(results, f, indent=2)
+
+print("Gata!\n")
@@ -0,0 +1,244 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import TABLE_COLUMNS, CHUNK_SIZE, DATASET_EPOCH, get_pg_connection
+
+# Verificare prin checksum-uri calculate in baza de date
+#
+# Fiecare interval de id-uri [lo, hi) primeste o amprenta independenta de
+# ordine: un vector de sume intregi (numar de randuri, suma id-urilor si,
+# pentru fiecare coloana, suma f(valoare) * w(id)). Aceleasi formule ruleaza
+# in SQL (PostgreSQL) si intr-un pipeline $group (MongoDB), deci prin retea
+# circula doar sumele. w(id) leaga valoarea de randul ei - doua valori
+# schimbate intre ele dau alta suma.
+#
+# Un interval diferit se imparte in doua pana la BISECT_ROWS id-uri, apoi
+# randurile respective se compara direct. Sumele sunt aditive, deci a doua
+# jumatate se obtine prin scadere - un singur query nou per nivel.
+#
+# f(valoare), identic pe ambele baze:
+#   int / bool   -> valoarea (NULL -> -1)
+#   decimal      -> centi, round(v * 100)
+#   timestamp    -> secunde fata de DATASET_EPOCH (floor)
+#   text         -> 24 de biti din cheia de index hashed a valorii: MongoDB o
+#                   da direct ($toHashedIndexKey - md5 peste tip + UTF-8), iar
+#                   PostgreSQL o reface cu md5() pe aceiasi octeti. Un singur
+#                   md5 per valoare, indiferent de lungimea textului.
+#
+# Cerinte: MongoDB >= 7.0 ($toHashedIndexKey, $bitAnd). Sumele raman sub 2^63
+# pana la ~35 milioane de randuri per interval (2^24 * WEIGHT_MOD per valoare).
+
+# octetii hash-uiti de MongoDB pentru un string: seed 0 si tipul canonic 15
+# (int32 little-endian), apoi textul UTF-8 cu terminatorul NUL
+_HASH_PREFIX = '\\x000000000f000000'
+WEIGHT_MOD = 9973
+BISECT_ROWS = 16
+CHECKSUM_WORKERS = 8
+
+_PG_KINDS = {
+    'smallint': 'int', 'integer': 'int', 'bigint': 'int',
+    'numeric': 'decimal', 'real': 'decimal', 'double precision': 'decimal',
+    'boolean': 'bool',
+    'timestamp without time zone': 'time', 'timestamp with time zone': 'time', 'date': 'time',
+}
+
+
+def column_kinds(conn, tables):
+    """{table: {column: kind}} from information_schema, limited to TABLE_COLUMNS"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT table_name, column_name, data_type
+        FROM information_schema.columns WHERE table_schema = 'public'
+    """)
+    types = {(t, c): d for t, c, d in cursor.fetchall()}
+    cursor.close()
+    return {
+        table: {col: _PG_KINDS.get(types[(table, col)], 'text')
+                for col in TABLE_COLUMNS[table] if col != 'id'}
+        for table in tables
+    }
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def _pg_value(col, kind):
+    if kind == 'int':
+        return f"COALESCE({col}::bigint, -1)"
+    if kind == 'bool':
+        return f"COALESCE({col}::int, -1)"
+    if kind == 'decimal':
+        return f"COALESCE(round({col} * 100)::bigint, -1)"
+    if kind == 'time':
+        epoch = DATASET_EPOCH.strftime('%Y-%m-%d %H:%M:%S')
+        return (f"COALESCE(floor(extract(epoch FROM {col}::timestamp - timestamp '{epoch}'))::bigint, -1)")
+    # primii 3 octeti din md5 = octetii low ai cheii hashed (little-endian), in ordine inversa
+    md5_hex = f"md5('{_HASH_PREFIX}'::bytea || convert_to({col}, 'UTF8') || '\\x00'::bytea)"
+    return f"COALESCE(('x0000000000' || substr({md5_hex}, 1, 6))::bit(64)::bigint, -1)"
+
+def pg_fingerprint_sql(table, kinds):
+    weight = f"(mod(id, {WEIGHT_MOD}) + 1)"
+    sums = [f"sum({_pg_value(col, kind)} * {weight})" for col, kind in kinds.items()]
+    return (f"SELECT count(*), COALESCE(sum(id), 0), {', '.join(f'COALESCE({s}, 0)' for s in sums)} "
+            f"FROM {table} WHERE id >= %s AND id < %s")
+
+# --- MongoDB ----------------------------------------------------------------
+
+def _mongo_value(col, kind):
+    field = f"${col}"
+    if kind == 'int':
+        value = {'$toLong': field}
+    elif kind == 'bool':
+        value = {'$cond': [field, 1, 0]}
+    elif kind == 'decimal':
+        value = {'$toLong': {'$round': [{'$multiply': [field, 100]}, 0]}}
+    elif kind == 'time':
+        value = {'$toLong': {'$floor': {'$divide': [{'$subtract': [field, DATASET_EPOCH]}, 1000]}}}
+    else:
+        # octetii 0..2 ai cheii, recompusi in ordinea din md5 (ca in PostgreSQL)
+        value = {'$let': {'vars': {'h': {'$toHashedIndexKey': field}}, 'in': {'$toLong': {'$add': [
+            {'$multiply': [{'$bitAnd': ['$$h', 0xFF]}, 0x10000]},
+            {'$bitAnd': ['$$h', 0xFF00]},
+            {'$divide': [{'$bitAnd': ['$$h', 0xFF0000]}, 0x10000]},
+        ]}}}}
+    return {'$cond': [{'$eq': [{'$ifNull': [field, None]}, None]}, -1, value]}
+
+def mongo_fingerprint_pipeline(kinds, lo, hi):
+    weight = {'$add': [{'$mod': ['$_id', WEIGHT_MOD]}, 1]}
+    group = {'_id': None, 'n': {'$sum': 1}, 'ids': {'$sum': '$_id'}}
+    for i, (col, kind) in enumerate(kinds.items()):
+        group[f"c{i}"] = {'$sum': {'$multiply': [_mongo_value(col, kind), weight]}}
+    return [{'$match': {'_id': {'$gte': lo, '$lt': hi}}}, {'$group': group}]
+
+# --- comparatie ---------------------------------------------------------------
+
+def digest(vector):
+    return hashlib.blake2b(repr(vector).encode(), digest_size=16).hexdigest()
+
+class Fingerprinter:
+    """Per-range fingerprints for both databases; safe to call from threads"""
+
+    def __init__(self, db, kinds):
+        self.db = db
+        self.kinds = kinds
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def _pg_cursor(self):
+        if not hasattr(self._local, 'conn'):
+            self._local.conn = get_pg_connection()
+            with self._lock:
+                self._conns.append(self._local.conn)
+        return self._local.conn.cursor()
+
+    def pg(self, table, lo, hi):
+        cursor = self._pg_cursor()
+        cursor.execute(pg_fingerprint_sql(table, self.kinds[table]), (lo, hi))
+        vector = tuple(int(v) for v in cursor.fetchone())
+        cursor.close()
+        return vector
+
+    def mongo(self, table, lo, hi):
+        result = list(self.db[table].aggregate(mongo_fingerprint_pipeline(self.kinds[table], lo, hi)))
+        if not result:
+            return (0,) * (len(self.kinds[table]) + 2)
+        row = result[0]
+        return tuple(int(row[k]) for k in ['n', 'ids'] + [f"c{i}" for i in range(len(self.kinds[table]))])
+
+    def both(self, table, lo, hi):
+        return self.pg(table, lo, hi), self.mongo(table, lo, hi)
+
+    def close(self):
+        for conn in self._conns:
+            conn.close()
+
+def _normalize(value, kind):
+    if value is None:
+        return None
+    if kind == 'decimal':
+        return round(float(value) * 100)
+    if kind == 'time':
+        return int((value - DATASET_EPOCH).total_seconds() // 1)
+    if kind == 'bool':
+        return bool(value)
+    return value
+
+def diff_rows(fp, table, lo, hi):
+    """Row-level differences in [lo, hi): (id, column or 'missing_in_pg'/'missing_in_mongo')"""
+    kinds = fp.kinds[table]
+    cols = list(kinds)
+    cursor = fp._pg_cursor()
+    cursor.execute(f"SELECT id, {', '.join(cols)} FROM {table} WHERE id >= %s AND id < %s", (lo, hi))
+    pg_rows = {r[0]: dict(zip(cols, r[1:])) for r in cursor.fetchall()}
+    cursor.close()
+    mongo_rows = {d['_id']: d for d in fp.db[table].find({'_id': {'$gte': lo, '$lt': hi}})}
+
+    problems = []
+    for row_id in sorted(pg_rows.keys() | mongo_rows.keys()):
+        if row_id not in mongo_rows:
+            problems.append((row_id, 'missing_in_mongo'))
+        elif row_id not in pg_rows:
+            problems.append((row_id, 'missing_in_pg'))
+        else:
+            for col, kind in kinds.items():
+                if _normalize(pg_rows[row_id][col], kind) != _normalize(mongo_rows[row_id].get(col), kind):
+                    problems.append((row_id, col))
+    return problems
+
+def bisect_range(fp, table, lo, hi, pg_vec, mongo_vec):
+    """Narrow a mismatched range down to the offending rows"""
+    if pg_vec == mongo_vec:
+        return []
+    if hi - lo <= BISECT_ROWS:
+        return diff_rows(fp, table, lo, hi)
+    mid = (lo + hi) // 2
+    pg_left, mongo_left = fp.both(table, lo, mid)
+    pg_right = tuple(a - b for a, b in zip(pg_vec, pg_left))
+    mongo_right = tuple(a - b for a, b in zip(mongo_vec, mongo_left))
+    return (bisect_range(fp, table, lo, mid, pg_left, mongo_left) +
+            bisect_range(fp, table, mid, hi, pg_right, mongo_right))
+
+def _id_bounds(fp, table):
+    cursor = fp._pg_cursor()
+    cursor.execute(f"SELECT COALESCE(min(id), 1), COALESCE(max(id), 0) FROM {table}")
+    lo, hi = cursor.fetchone()
+    cursor.close()
+    for doc in fp.db[table].aggregate([{'$group': {'_id': None, 'lo': {'$min': '$_id'}, 'hi': {'$max': '$_id'}}}]):
+        lo, hi = min(lo, doc['lo']), max(hi, doc['hi'])
+    return lo, hi + 1
+
+def verify_tables(db, tables, range_size=CHUNK_SIZE, workers=CHECKSUM_WORKERS):
+    """Compare every table range by range, in parallel
+
+    Returns {table: {'rows', 'ranges', 'mismatched_ranges', 'problems'}};
+    'problems' lists (id, column) pairs found by bisecting bad ranges.
+    """
+    conn = get_pg_connection()
+    kinds = column_kinds(conn, tables)
+    conn.close()
+    fp = Fingerprinter(db, kinds)
+
+    def check(table, lo, hi):
+        pg_vec, mongo_vec = fp.both(table, lo, hi)
+        if digest(pg_vec) == digest(mongo_vec):
+            return table, pg_vec[0], None
+        return table, pg_vec[0], bisect_range(fp, table, lo, hi, pg_vec, mongo_vec)
+
+    report = {table: {'rows': 0, 'ranges': 0, 'mismatched_ranges': 0, 'problems': []} for table in tables}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            for table in tables:
+                start, end = _id_bounds(fp, table)
+                for lo in range(start, end, range_size):
+                    futures.append(pool.submit(check, table, lo, min(lo + range_size, end)))
+            for future in futures:
+                table, rows, problems = future.result()
+                report[table]['rows'] += rows
+                report[table]['ranges'] += 1
+                if problems is not None:
+                    report[table]['mismatched_ranges'] += 1
+                    report[table]['problems'].extend(problems)
+    finally:
+        fp.close()
+    return report
@@ -0,0 +1,249 @@
+import hashlib
+import numpy as np
+from functools import lru_cache, partial
+from faker import Faker
+from distributions import DEFAULT_DISTRIBUTIONS, sample_ids
+
+from utils import (
+    SEED, CHUNK_SIZE, DATASET_EPOCH, MAX_ITEMS_PER_ORDER, ORDER_HISTORY_DAYS, TABLES, TABLE_COLUMNS,
+    ORDER_STATUSES, PAYMENT_METHODS, PAYMENT_STATUSES,
+    derive_seed, generate_categories, get_row_counts, map_chunks
+)
+
+# Generare columnara cu NumPy - IDENTICE pentru ambele baze
+#
+# Coloanele numerice si categoriale se genereaza ca array-uri NumPy pe tot
+# chunk-ul dintr-o data. Coloanele text sunt coduri (int32) intr-un vocabular
+# precalculat cu Faker; textul propriu-zis apare abia in columns_to_rows.
+
+VOCAB_SIZE = 2000
+
+# (tabel, coloana) -> vocabularul din care se iau valorile
+TEXT_VOCAB = {
+    ('users', 'first_name'): 'first_name',
+    ('users', 'last_name'): 'last_name',
+    ('users', 'phone'): 'phone',
+    ('users', 'address'): 'address',
+    ('users', 'city'): 'city',
+    ('users', 'country'): 'country',
+    ('products', 'name'): 'catch_phrase',
+    ('products', 'description'): 'text',
+    ('orders', 'shipping_address'): 'address',
+    ('orders', 'shipping_city'): 'city',
+    ('orders', 'shipping_country'): 'country',
+    ('reviews', 'title'): 'sentence',
+    ('reviews', 'comment'): 'text',
+}
+
+# Coloane calculate din id
+DERIVED_COLUMNS = {
+    ('users', 'username'): lambda i: f"user_{i:04d}",
+    ('users', 'email'): lambda i: f"user{i}@example.com",
+    ('products', 'sku'): lambda i: f"SKU-{i:06d}",
+    ('orders', 'order_number'): lambda i: f"ORD-{i:08d}",
+}
+
+# Coloane categoriale: cod int8 -> valoare
+CATEGORICAL = {
+    ('orders', 'status'): ORDER_STATUSES,
+    ('orders', 'payment_method'): PAYMENT_METHODS,
+    ('orders', 'payment_status'): PAYMENT_STATUSES,
+}
+
+_EPOCH64 = np.datetime64(DATASET_EPOCH, 's')
+_DAY = np.timedelta64(86400, 's')
+
+
+@lru_cache(maxsize=None)
+def build_vocabularies(seed=SEED, size=VOCAB_SIZE):
+    """Text vocabularies drawn once with Faker; rows pick entries by index"""
+    fake = Faker()
+    fake.seed_instance(derive_seed(seed, 'vocab'))
+    makers = {
+        'first_name': fake.first_name,
+        'last_name': fake.last_name,
+        'phone': lambda: fake.phone_number()[:15],
+        'address': lambda: fake.street_address()[:100],
+        'city': lambda: fake.city()[:50],
+        'country': lambda: fake.country()[:50],
+        'catch_phrase': lambda: fake.catch_phrase()[:100],
+        'text': lambda: fake.text(max_nb_chars=200),
+        'sentence': lambda: fake.sentence(nb_words=5)[:100],
+    }
+    return {name: np.array([make() for _ in range(size)]) for name, make in makers.items()}
+
+def hash_unit_array(seed, label, ids):
+    """Vectorized utils.hash_unit (splitmix64) for an array of ids"""
+    x = np.uint64(derive_seed(seed, label)) + ids.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+def product_price_array(product_ids, seed=SEED):
+    return np.round(9.99 + hash_unit_array(seed, 'product_price', product_ids) * 490.0, 2)
+
+def order_created_at_array(order_ids, seed=SEED):
+    """Vectorized utils.order_created_at"""
+    offset = (hash_unit_array(seed, 'order_created_at', order_ids) * (ORDER_HISTORY_DAYS * 86400)).astype(np.int64)
+    return _EPOCH64 - (86400 + offset) * np.timedelta64(1, 's')
+
+def _chunk_rng(seed, table, chunk_index):
+    return np.random.default_rng(derive_seed(seed, 'numpy', table, chunk_index))
+
+def _chunk_ids(chunk_index, count):
+    start = chunk_index * CHUNK_SIZE + 1
+    return np.arange(start, min(start + CHUNK_SIZE, count + 1), dtype=np.int64)
+
+def _sample_fk(counts, name, rng, n, table, seed):
+    spec = counts.get('distributions', DEFAULT_DISTRIBUTIONS)[name]
+    return sample_ids(spec, rng, n, counts[table], seed)
+
+def _days_ago(days):
+    return _EPOCH64 - days * _DAY
+
+def categories_columns(chunk_index, counts, seed=SEED):
+    categories = generate_categories()
+    return {
+        'id': np.array([c['id'] for c in categories], dtype=np.int64),
+        'name': np.array([c['name'] for c in categories]),
+        'description': np.array([c['description'] for c in categories]),
+    }
+
+def users_columns(chunk_index, counts, seed=SEED):
+    """One chunk of users as columns - IDENTICE"""
+    rng = _chunk_rng(seed, 'users', chunk_index)
+    ids = _chunk_ids(chunk_index, counts['users'])
+    n = len(ids)
+    columns = {'id': ids}
+    for col in ['first_name', 'last_name', 'phone', 'address', 'city', 'country']:
+        columns[col] = rng.integers(0, VOCAB_SIZE, n, dtype=np.int32)
+    columns['created_at'] = _days_ago(rng.integers(1, 366, n))
+    return columns
+
+def products_columns(chunk_index, counts, seed=SEED):
+    """One chunk of products as columns - IDENTICE"""
+    rng = _chunk_rng(seed, 'products', chunk_index)
+    ids = _chunk_ids(chunk_index, counts['products'])
+    n = len(ids)
+    return {
+        'id': ids,
+        'name': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'description': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'category_id': rng.integers(1, 9, n, dtype=np.int32),
+        'price': product_price_array(ids, seed),
+        'stock_quantity': rng.integers(0, 501, n, dtype=np.int32),
+        'rating': np.round(rng.uniform(1.0, 5.0, n), 2),
+        'review_count': rng.integers(0, 201, n, dtype=np.int32),
+        'created_at': _days_ago(rng.integers(1, 366, n)),
+    }
+
+def orders_columns(chunk_index, counts, seed=SEED):
+    """One chunk of orders as columns - IDENTICE"""
+    rng = _chunk_rng(seed, 'orders', chunk_index)
+    ids = _chunk_ids(chunk_index, counts['orders'])
+    n = len(ids)
+    return {
+        'id': ids,
+        'user_id': _sample_fk(counts, 'user_activity', rng, n, 'users', seed),
+        'status': rng.integers(0, len(ORDER_STATUSES), n, dtype=np.int8),
+        'total_amount': np.round(rng.uniform(25.00, 500.00, n), 2),
+        'shipping_address': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'shipping_city': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'shipping_country': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'payment_method': rng.integers(0, len(PAYMENT_METHODS), n, dtype=np.int8),
+        'payment_status': rng.integers(0, len(PAYMENT_STATUSES), n, dtype=np.int8),
+        'created_at': order_created_at_array(ids, seed),
+    }
+
+def order_items_columns(chunk_index, counts, seed=SEED):
+    """Items for one chunk of orders as columns - IDENTICE (same ids as utils)"""
+    rng = _chunk_rng(seed, 'order_items', chunk_index)
+    order_ids = _chunk_ids(chunk_index, counts['orders'])
+    per_order = rng.integers(1, MAX_ITEMS_PER_ORDER + 1, len(order_ids))
+    order_id = np.repeat(order_ids, per_order)
+    # pozitia item-ului in comanda: 0, 1, ... per_order - 1
+    k = np.arange(len(order_id)) - np.repeat(np.cumsum(per_order) - per_order, per_order)
+    product_id = _sample_fk(counts, 'product_popularity', rng, len(order_id), 'products', seed)
+    unit_price = product_price_array(product_id, seed)
+    quantity = rng.integers(1, 4, len(order_id), dtype=np.int32)
+    return {
+        'id': (order_id - 1) * MAX_ITEMS_PER_ORDER + k + 1,
+        'order_id': order_id,
+        'product_id': product_id,
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'total_price': np.round(quantity * unit_price, 2),
+        'created_at': order_created_at_array(order_id, seed),
+    }
+
+def reviews_columns(chunk_index, counts, seed=SEED):
+    """One chunk of reviews as columns - IDENTICE"""
+    rng = _chunk_rng(seed, 'reviews', chunk_index)
+    ids = _chunk_ids(chunk_index, counts['reviews'])
+    n = len(ids)
+    return {
+        'id': ids,
+        'product_id': _sample_fk(counts, 'review_target', rng, n, 'products', seed),
+        'user_id': _sample_fk(counts, 'user_activity', rng, n, 'users', seed),
+        'rating': rng.integers(1, 6, n, dtype=np.int32),
+        'title': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'comment': rng.integers(0, VOCAB_SIZE, n, dtype=np.int32),
+        'is_verified': rng.random(n) < 0.5,
+        'created_at': _days_ago(rng.integers(1, 61, n)),
+    }
+
+COLUMN_FUNCTIONS = {
+    'categories': categories_columns,
+    'users': users_columns,
+    'products': products_columns,
+    'orders': orders_columns,
+    'order_items': order_items_columns,
+    'reviews': reviews_columns,
+}
+
+def generate_table_columns(table, counts, seed=SEED, workers=1, pool=None):
+    """Lazy generator yielding one table as column chunks"""
+    return map_chunks(COLUMN_FUNCTIONS[table], table, counts, seed, workers, pool)
+
+def columns_digest(table, counts, seed=SEED, workers=1):
+    """Hash over all column bytes of a table - checks seeded reproducibility"""
+    digest = hashlib.blake2b(digest_size=16)
+    for columns in generate_table_columns(table, counts, seed, workers):
+        for col in sorted(columns):
+            digest.update(columns[col].tobytes())
+    return digest.hexdigest()
+
+def columns_to_rows(table, columns, vocab):
+    """Column chunk -> list of row dicts with plain Python values"""
+    ids = columns['id'].tolist()
+    values = []
+    for col in TABLE_COLUMNS[table]:
+        if (table, col) in DERIVED_COLUMNS:
+            fmt = DERIVED_COLUMNS[(table, col)]
+            values.append([fmt(i) for i in ids])
+        elif (table, col) in TEXT_VOCAB:
+            values.append(vocab[TEXT_VOCAB[(table, col)]][columns[col]].tolist())
+        elif (table, col) in CATEGORICAL:
+            values.append(np.array(CATEGORICAL[(table, col)])[columns[col]].tolist())
+        else:
+            values.append(columns[col].tolist())
+    cols = TABLE_COLUMNS[table]
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+def rows_chunk(table, chunk_index, counts, seed=SEED):
+    """One chunk already converted to rows (runs inside pool workers)"""
+    columns = COLUMN_FUNCTIONS[table](chunk_index, counts, seed)
+    return columns_to_rows(table, columns, build_vocabularies(seed))
+
+def generate_table_rows(table, counts, seed=SEED, workers=1, pool=None):
+    """Same contract as utils.generate_table, backed by the columnar engine"""
+    build_vocabularies(seed)  # o data, inainte de fork - workerii il mostenesc
+    return map_chunks(partial(rows_chunk, table), table, counts, seed, workers, pool)
+
+def generate_dataset(scale_factor=1, seed=SEED, workers=1, distributions=None):
+    """Same contract as utils.generate_dataset, backed by the columnar engine"""
+    counts = get_row_counts(scale_factor, distributions)
+    for table in TABLES:
+        for rows in generate_table_rows(table, counts, seed, workers):
+            yield table, rows
@@ -0,0 +1,119 @@
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from utils import get_pg_connection, get_mongo_connection, fork_context
+from distributions import sample_id
+from workloads import WORKLOADS, time_windows, pg_runner, mongo_runner
+from latency import LatencyHistogram
+
+# N clienti concurenti pe acelasi workload
+#
+# PostgreSQL - fiecare client are conexiunea lui (pg8000 nu e thread-safe).
+# MongoDB    - in modul thread toti clientii impart un MongoClient (pool-ul
+#              lui de conexiuni); in modul process fiecare proces are clientul
+#              si pool-ul propriu.
+# Toti clientii pornesc la acelasi moment de ceas (start_at): pana atunci
+# ruleaza warmup nemasurat, apoi executa workload-ul in bucla inchisa timp de
+# `duration` secunde. Latentele merg in histograme HDR unite la final.
+# Ultima operatie de warmup poate depasi start_at, iar ultima masurata
+# deadline-ul, deci fiecare client raporteaza fereastra lui reala de masurare;
+# throughput = suma peste clienti a operatiilor / fereastra.
+# pg8000 e Python pur: in modul thread clientii se impart la GIL, deci curba
+# poate arata limita procesului de benchmark, nu a serverului - modul
+# process o elimina. Modul process cere fork: cu spawn / forkserver fiecare
+# copil ar reimporta 15_concurrency_benchmark.py (fara `__main__`) si ar
+# relua tot sweep-ul.
+
+SATURATION_GAIN = 1.1
+
+
+def run_client(engine, workload_name, client_index, start_at, duration, counts, seed,
+               distribution='uniform', lookups=1, mongo_db=None):
+    """One client's closed loop; returns {'ops', 'errors', 'seconds', 'histogram'}"""
+    workload = WORKLOADS[workload_name]
+    rng = random.Random(f"{seed}-{client_index}")
+    keys = dict(time_windows(),
+                user=lambda: sample_id(distribution, rng, counts['users'], seed),
+                product=lambda: sample_id(distribution, rng, counts['products'], seed))
+    conn = client = None
+    if engine == 'postgresql':
+        conn = get_pg_connection()
+        run, _ = pg_runner(workload, conn.cursor(), keys, lookups)
+    else:
+        if mongo_db is None:
+            client, mongo_db = get_mongo_connection()
+        run, _ = mongo_runner(workload, mongo_db, keys, lookups)
+
+    def attempt():
+        try:
+            run()
+            return True
+        except Exception:
+            if conn is not None:
+                conn.rollback()
+            return False
+
+    histogram = LatencyHistogram()
+    ops = errors = 0
+    try:
+        while time.time() < start_at:
+            attempt()
+        deadline = start_at + duration
+        begin = time.perf_counter()
+        while time.time() < deadline:
+            start = time.perf_counter()
+            if not attempt():
+                errors += 1
+                continue
+            histogram.record_seconds(time.perf_counter() - start)
+            ops += 1
+        seconds = time.perf_counter() - begin
+    finally:
+        if conn is not None:
+            conn.close()
+        if client is not None:
+            client.close()
+    return {'ops': ops, 'errors': errors, 'seconds': seconds, 'histogram': histogram.to_dict()}
+
+def run_clients(engine, workload_name, clients, mode, duration, warmup, counts, seed,
+                distribution='uniform', lookups=1):
+    """clients concurrent run_client loops (threads or processes); merged result"""
+    if mode == 'thread':
+        executor = ThreadPoolExecutor(max_workers=clients)
+    else:
+        context = fork_context()
+        if context is None:
+            raise ValueError("modul process necesita fork (indisponibil pe aceasta platforma) - foloseste thread")
+        executor = ProcessPoolExecutor(max_workers=clients, mp_context=context)
+    shared = None
+    if engine == 'mongodb' and mode == 'thread':
+        shared = get_mongo_connection()
+    # Conectarea clientilor (si pornirea proceselor) intra in warmup
+    start_at = time.time() + warmup + 0.05 * clients
+    try:
+        with executor:
+            futures = [executor.submit(run_client, engine, workload_name, index, start_at, duration, counts,
+                                       seed, distribution, lookups, shared[1] if shared else None)
+                       for index in range(clients)]
+            parts = [future.result() for future in futures]
+    finally:
+        if shared:
+            shared[0].close()
+    histogram = LatencyHistogram()
+    for part in parts:
+        histogram.merge(LatencyHistogram.from_dict(part['histogram']))
+    ops = sum(part['ops'] for part in parts)
+    throughput = sum(part['ops'] / part['seconds'] for part in parts if part['seconds'] > 0)
+    point = {'clients': clients, 'ops': ops, 'errors': sum(part['errors'] for part in parts),
+             'throughput': round(throughput, 2)}
+    point.update(histogram.summary_ms())
+    point['histogram'] = histogram.to_dict()
+    return point
+
+def saturation_point(curve, gain=SATURATION_GAIN):
+    """Client count after which adding clients raises throughput by less than `gain`x"""
+    for current, following in zip(curve, curve[1:]):
+        if following['throughput'] < current['throughput'] * gain:
+            return current['clients']
+    return None
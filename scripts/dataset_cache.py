@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+from functools import lru_cache, partial
+
+from utils import (
+    SEED, CHUNK_SIZE, MAX_ITEMS_PER_ORDER, GENERATOR_VERSION, TABLES,
+    get_row_counts, map_chunks
+)
+from distributions import distributions_label
+from columnar import VOCAB_SIZE, build_vocabularies, generate_table_columns, columns_to_rows
+
+# Cache pe disc pentru datasetul generat cu NumPy
+#
+# O intrare = un director <cache>/<cheie>/ cu un fisier .npy per coloana,
+# plus vocabularele si manifest.json (randuri si offset-uri de chunk).
+# La rulari ulterioare coloanele se deschid cu mmap_mode='r', fara regenerare.
+# Implicit <repo>/cache/datasets, indiferent de directorul din care se ruleaza.
+
+CACHE_DIR = os.getenv('DATASET_CACHE_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'datasets'))
+CACHE_MAX_BYTES = int(float(os.getenv('DATASET_CACHE_MAX_GB', 20)) * 1024 ** 3)
+
+
+def cache_key(scale_factor=1, seed=SEED, distributions=None):
+    """Directory name for one (scale factor, seed, generator version) dataset"""
+    key = f"sf{scale_factor:g}-seed{seed}-v{GENERATOR_VERSION}-c{CHUNK_SIZE}-voc{VOCAB_SIZE}"
+    label = distributions_label(distributions or {})
+    if label:
+        key += '-' + hashlib.blake2b(label.encode(), digest_size=4).hexdigest()
+    return key
+
+def _entry_size(path):
+    """Bytes actually used on disk (the order_items files are sparse)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            st = os.stat(os.path.join(root, name))
+            # st_blocks lipseste pe Windows - acolo marimea aparenta
+            blocks = getattr(st, 'st_blocks', None)
+            total += blocks * 512 if blocks is not None else st.st_size
+    return total
+
+def _write_entry(path, scale_factor, seed, workers, distributions, pool=None):
+    counts = get_row_counts(scale_factor, distributions)
+    manifest = {
+        'scale_factor': scale_factor,
+        'seed': seed,
+        'distributions': counts['distributions'],
+        'generator_version': GENERATOR_VERSION,
+        'created_at': time.time(),
+        'tables': {}
+    }
+
+    os.makedirs(os.path.join(path, 'vocab'))
+    for name, values in build_vocabularies(seed).items():
+        np.save(os.path.join(path, 'vocab', f"{name}.npy"), values)
+
+    for table in TABLES:
+        os.makedirs(os.path.join(path, table))
+        # order_items: numarul exact se afla abia la generare, se aloca maximul
+        if table == 'categories':
+            capacity = counts['categories']
+        elif table == 'order_items':
+            capacity = counts['orders'] * MAX_ITEMS_PER_ORDER
+        else:
+            capacity = counts[table]
+
+        files = {}
+        offsets = [0]
+        for columns in generate_table_columns(table, counts, seed, workers, pool):
+            if not files:
+                for col, values in columns.items():
+                    files[col] = np.lib.format.open_memmap(
+                        os.path.join(path, table, f"{col}.npy"), mode='w+',
+                        dtype=values.dtype, shape=(capacity,))
+            start = offsets[-1]
+            end = start + len(columns['id'])
+            for col, values in columns.items():
+                files[col][start:end] = values
+            offsets.append(end)
+
+        for mm in files.values():
+            mm.flush()
+        manifest['tables'][table] = {
+            'rows': offsets[-1],
+            'chunk_offsets': offsets,
+            'columns': list(files)
+        }
+        del files
+
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, keep=None):
+    """Remove least recently used entries until the cache fits in max_bytes"""
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        manifest = os.path.join(path, 'manifest.json')
+        if os.path.isfile(manifest):
+            entries.append((os.stat(manifest).st_mtime, path, _entry_size(path)))
+    total = sum(size for _, _, size in entries)
+    removed = []
+    for _, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed.append(os.path.basename(path))
+    return removed
+
+def ensure_cached(scale_factor=1, seed=SEED, workers=1, cache_dir=CACHE_DIR, distributions=None, pool=None):
+    """Path of the cache entry, generating and writing it on first use"""
+    path = os.path.join(cache_dir, cache_key(scale_factor, seed, distributions))
+    manifest = os.path.join(path, 'manifest.json')
+    if os.path.isfile(manifest):
+        os.utime(manifest)  # LRU pentru evict()
+        return path, True
+
+    # Scriere in director temporar + rename: o intrare e completa sau lipseste
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        _write_entry(tmp, scale_factor, seed, workers, distributions, pool)
+        os.rename(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isfile(manifest):  # alt proces a scris-o intre timp
+            raise
+    evict(cache_dir, keep=path)
+    return path, False
+
+@lru_cache(maxsize=None)
+def load_entry(path):
+    """(manifest, vocab, memory-mapped columns) for one cache entry"""
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    vocab = {
+        name[:-4]: np.load(os.path.join(path, 'vocab', name), mmap_mode='r')
+        for name in os.listdir(os.path.join(path, 'vocab'))
+    }
+    columns = {
+        table: {col: np.load(os.path.join(path, table, f"{col}.npy"), mmap_mode='r')
+                for col in info['columns']}
+        for table, info in manifest['tables'].items()
+    }
+    return manifest, vocab, columns
+
+def load_table_columns(path, table):
+    """Lazy generator of column chunks (memmap slices) for one cached table"""
+    manifest, _, columns = load_entry(path)
+    offsets = manifest['tables'][table]['chunk_offsets']
+    for start, end in zip(offsets, offsets[1:]):
+        yield {col: values[start:end] for col, values in columns[table].items()}
+
+def cached_rows_chunk(path, table, chunk_index, counts, seed=SEED):
+    """One cached chunk converted to rows (runs inside pool workers)"""
+    manifest, vocab, columns = load_entry(path)
+    offsets = manifest['tables'][table]['chunk_offsets']
+    start, end = offsets[chunk_index], offsets[chunk_index + 1]
+    chunk = {col: values[start:end] for col, values in columns[table].items()}
+    return columns_to_rows(table, chunk, vocab)
+
+def generate_table_rows(path, table, counts, seed=SEED, workers=1):
+    """Same contract as utils.generate_table, served from cache entry `path`"""
+    load_entry(path)  # inainte de fork - workerii mostenesc mmap-urile
+    return map_chunks(partial(cached_rows_chunk, path, table), table, counts, seed, workers)
+
+def generate_dataset(scale_factor=1, seed=SEED, workers=1, cache_dir=CACHE_DIR, distributions=None):
+    """Same contract as utils.generate_dataset, served from the on-disk cache"""
+    path, _ = ensure_cached(scale_factor, seed, workers, cache_dir, distributions)
+    counts = get_row_counts(scale_factor, distributions)
+    for table in TABLES:
+        for rows in generate_table_rows(path, table, counts, seed, workers):
+            yield table, rows
@@ -0,0 +1,89 @@
+import math
+import hashlib
+import numpy as np
+from functools import lru_cache
+
+# Distributii de acces pentru chei (user_id, product_id)
+#
+# Specificatie ca text, folosita si in CLI si in cheia de cache:
+#   uniform            - fiecare cheie la fel de probabila
+#   zipf:S             - power-law, cheia de rang r are pondere 1 / r^S
+#   hotspot:F:P        - fractiunea F din chei primeste probabilitatea P
+# Rangurile sunt imprastiate peste id-uri cu o permutare determinista, ca
+# cheile "fierbinti" sa nu fie doar primele id-uri inserate.
+
+DEFAULT_DISTRIBUTIONS = {
+    'user_activity': 'uniform',
+    'product_popularity': 'uniform',
+    'review_target': 'uniform',
+}
+
+
+def parse_distribution(spec):
+    """'zipf:1.1' -> ('zipf', [1.1]); raises ValueError on unknown specs"""
+    kind, *params = spec.split(':')
+    params = [float(p) for p in params]
+    if kind == 'uniform' and not params:
+        return kind, params
+    if kind == 'zipf' and len(params) == 1 and params[0] > 0:
+        return kind, params
+    if kind == 'hotspot' and len(params) == 2 and 0 < params[0] < 1 and 0 <= params[1] <= 1:
+        return kind, params
+    raise ValueError(f"Distributie necunoscuta: {spec} (uniform | zipf:S | hotspot:F:P)")
+
+@lru_cache(maxsize=8)
+def _zipf_cdf(count, s):
+    weights = 1.0 / np.arange(1, count + 1, dtype=np.float64) ** s
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+@lru_cache(maxsize=None)
+def _permutation(count, seed):
+    """(multiplier coprime with count, offset) - rank -> id permutation"""
+    digest = hashlib.blake2b(f"{seed}:permutation:{count}".encode(), digest_size=16).digest()
+    m = int.from_bytes(digest[:8], 'little') % count or 1
+    while math.gcd(m, count) != 1:
+        m += 1
+    return m, int.from_bytes(digest[8:], 'little') % count
+
+def _ranks_to_ids(ranks, count, seed):
+    m, offset = _permutation(count, seed)
+    return (ranks * m + offset) % count + 1
+
+def sample_ids(spec, rng, n, count, seed):
+    """n ids in [1, count] from a NumPy Generator"""
+    kind, params = parse_distribution(spec)
+    if kind == 'uniform':
+        return rng.integers(1, count + 1, n, dtype=np.int64)
+    if kind == 'zipf':
+        ranks = np.searchsorted(_zipf_cdf(count, params[0]), rng.random(n), side='right')
+        ranks = np.minimum(ranks, count - 1)
+    else:
+        hot = max(1, int(count * params[0]))
+        is_hot = rng.random(n) < params[1]
+        ranks = np.where(is_hot,
+                         rng.integers(0, hot, n),
+                         rng.integers(min(hot, count - 1), count, n))
+    return _ranks_to_ids(ranks.astype(np.int64), count, seed)
+
+def sample_id(spec, rng, count, seed):
+    """One id in [1, count] from a random.Random (Faker path, benchmarks)"""
+    kind, params = parse_distribution(spec)
+    if kind == 'uniform':
+        return rng.randint(1, count)
+    if kind == 'zipf':
+        rank = int(np.searchsorted(_zipf_cdf(count, params[0]), rng.random(), side='right'))
+        rank = min(rank, count - 1)
+    else:
+        hot = max(1, int(count * params[0]))
+        if rng.random() < params[1]:
+            rank = rng.randrange(0, hot)
+        else:
+            rank = rng.randrange(min(hot, count - 1), count)
+    return int(_ranks_to_ids(rank, count, seed))
+
+def distributions_label(distributions):
+    """Short text for cache keys / reports; empty when everything is uniform"""
+    parts = [f"{name}={spec}" for name, spec in sorted(distributions.items())
+             if spec != 'uniform']
+    return ','.join(parts)
@@ -0,0 +1,301 @@
+import re
+import json
+import time
+
+from pymongo import IndexModel
+
+# Index advisor: ruleaza workload-ul, citeste planurile si propune indexi
+#
+# PostgreSQL - EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON); se semnaleaza Seq Scan
+#              care citesc cel putin min_rows randuri. Coloanele din Filter
+#              fara index (prima coloana a unui index existent) devin propuneri.
+# MongoDB    - explain cu verbosity executionStats; se semnaleaza COLLSCAN
+#              (campurile din filter devin propuneri) si etapele $lookup al
+#              caror foreignField nu e prefixul niciunui index din colectia
+#              'from' - fiecare document de intrare scaneaza atunci toata
+#              colectia straina.
+# Scorul unei propuneri = randuri / documente examinate in plus fata de cele
+# returnate, adunate peste workload-uri; propunerile se ordoneaza dupa scor.
+# Subsirurile (LIKE '%x%', $regex fara ^) nu au index B-tree - raman doar
+# constatari, cu trimitere la text_search.py.
+# Query-urile analizate sunt cele din registrul workloads.py.
+
+MIN_ROWS = 1000
+PG_INDEX_PREFIX = 'idx_advisor'
+MONGO_INDEX_PREFIX = 'advisor'
+
+def _timed_ms(func, iterations):
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return round(sum(times) / len(times), 3)
+
+def _finding(engine, workload, table, kind, examined, columns=(), detail=''):
+    return {'engine': engine, 'workload': workload, 'table': table, 'kind': kind,
+            'columns': list(columns), 'examined': int(examined), 'detail': detail}
+
+# --- PostgreSQL -------------------------------------------------------------
+
+# "(price > '500'::numeric)", "((status)::text = 'x'::text)", "(id = oi.product_id)"
+_PG_CONDITION = re.compile(r"\(*(\w+)\)*(?:::[\w ]+?)?\)* (=|<>|<=|>=|<|>|~~\*|~~|!~~\*|!~~) ('(?:[^']|'')*')?")
+
+def pg_explain(cursor, sql, params=()):
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) -> top-level plan dict"""
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+def pg_plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from pg_plan_nodes(child)
+
+def pg_parent_table(cursor, relation):
+    """Partition -> partitioned parent (the table the index goes on)"""
+    cursor.execute("SELECT inhparent::regclass::text FROM pg_inherits WHERE inhrelid = to_regclass(%s)",
+                   (relation,))
+    row = cursor.fetchone()
+    return row[0] if row else relation
+
+def pg_leading_columns(cursor, table):
+    """First key column of every index on table"""
+    cursor.execute("""
+        SELECT a.attname FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = to_regclass(%s)
+    """, (table,))
+    return {row[0] for row in cursor.fetchall()}
+
+def pg_findings(cursor, workload, explain, min_rows=MIN_ROWS):
+    """Large sequential scans of one EXPLAIN ANALYZE output"""
+    findings = []
+    for node in pg_plan_nodes(explain['Plan']):
+        if node['Node Type'] != 'Seq Scan':
+            continue
+        loops = node.get('Actual Loops', 1)
+        returned = node.get('Actual Rows', 0) * loops
+        read = returned + node.get('Rows Removed by Filter', 0) * loops
+        if read < min_rows:
+            continue
+        table = pg_parent_table(cursor, node['Relation Name'])
+        if 'Filter' not in node:
+            findings.append(_finding('postgresql', workload, table, 'full_scan', read,
+                                     detail="fara filtru - citirea intregului tabel e ceruta de query"))
+            continue
+        indexed = pg_leading_columns(cursor, table)
+        for column, op, literal in _PG_CONDITION.findall(node['Filter']):
+            if op.lstrip('!').startswith('~~') and literal.startswith("'%"):
+                findings.append(_finding('postgresql', workload, table, 'substring', read - returned, [column],
+                                         "LIKE cu % la inceput - B-tree nu ajuta; pg_trgm / full-text "
+                                         "(text_search.py)"))
+            elif column in indexed:
+                findings.append(_finding('postgresql', workload, table, 'index_not_used', read - returned,
+                                         [column], "indexul exista, planner-ul a ales Seq Scan "
+                                                   "(selectivitate mica)"))
+            else:
+                findings.append(_finding('postgresql', workload, table, 'seq_scan', read - returned, [column],
+                                         node['Filter']))
+    return findings
+
+def pg_explain_summary(explain):
+    plan = explain['Plan']
+    return {'execution_ms': explain.get('Execution Time'),
+            'shared_hit': plan.get('Shared Hit Blocks', 0), 'shared_read': plan.get('Shared Read Blocks', 0),
+            'nodes': sorted({node['Node Type'] for node in pg_plan_nodes(plan)})}
+
+# --- MongoDB ----------------------------------------------------------------
+
+def mongo_explain(db, command):
+    """explain(executionStats) of a find / aggregate command document"""
+    return db.command('explain', command, verbosity='executionStats')
+
+def _mongo_nodes(value):
+    """Every dict nested anywhere in an explain document"""
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _mongo_nodes(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _mongo_nodes(child)
+
+def _filter_fields(spec):
+    """Field names of a query filter, {'$and': [...]} included"""
+    fields = []
+    for key, value in spec.items():
+        if key in ('$and', '$or'):
+            for part in value:
+                fields.extend(_filter_fields(part))
+        elif not key.startswith('$'):
+            fields.append(key)
+    return fields
+
+def _unanchored_regex(condition):
+    if isinstance(condition, dict) and '$regex' in condition:
+        pattern = condition['$regex']
+        return not (isinstance(pattern, str) and pattern.startswith('^'))
+    return isinstance(condition, re.Pattern) and not condition.pattern.startswith('^')
+
+def mongo_index_prefixes(db, collection):
+    """First key of every index on collection"""
+    return {list(info['key'])[0][0] for info in db[collection].index_information().values()}
+
+def _lookup_examined(explain, lookup):
+    """Docs examined by one $lookup stage (executionStats of MongoDB 5.0+)"""
+    for node in _mongo_nodes(explain):
+        stage = node.get('$lookup')
+        if isinstance(stage, dict) and stage.get('from') == lookup['from'] \
+                and stage.get('foreignField') == lookup['foreignField']:
+            return node.get('totalDocsExamined')
+        # SBE (6.0+): $lookup coborat in planul de executie ca EQ_LOOKUP
+        if node.get('stage') == 'EQ_LOOKUP' and node.get('foreignCollection', '').endswith('.' + lookup['from']) \
+                and node.get('foreignField') == lookup['foreignField']:
+            return node.get('totalDocsExamined', node.get('docsExamined'))
+    return None
+
+def mongo_findings(db, workload, command, explain, min_rows=MIN_ROWS):
+    """Collection scans and unindexed $lookup keys of one explain output"""
+    kind = 'find' if 'find' in command else 'aggregate'
+    collection = command[kind]
+    spec = command['filter'] if kind == 'find' else command['pipeline']
+    findings = []
+    for node in _mongo_nodes(explain):
+        if node.get('stage') != 'COLLSCAN':
+            continue
+        examined = node.get('docsExamined', 0)
+        if examined < min_rows:
+            continue
+        returned = node.get('nReturned', 0)
+        filter_spec = spec if kind == 'find' else next(
+            (stage['$match'] for stage in spec if '$match' in stage), {})
+        fields = _filter_fields(filter_spec)
+        if not fields:
+            findings.append(_finding('mongodb', workload, collection, 'full_scan', examined,
+                                     detail="fara filtru - colectia se citeste integral"))
+            continue
+        indexed = mongo_index_prefixes(db, collection)
+        for field in fields:
+            if field in filter_spec and _unanchored_regex(filter_spec[field]):
+                findings.append(_finding('mongodb', workload, collection, 'substring', examined - returned,
+                                         [field], "$regex fara ^ - index text / trigrame (text_search.py)"))
+            elif field in indexed:
+                findings.append(_finding('mongodb', workload, collection, 'index_not_used', examined - returned,
+                                         [field], "indexul exista, planificatorul a ales COLLSCAN"))
+            else:
+                findings.append(_finding('mongodb', workload, collection, 'collscan', examined - returned,
+                                         [field], json.dumps(filter_spec, default=str)))
+    if kind == 'aggregate':
+        source_count = db[collection].estimated_document_count()
+        for stage in spec:
+            lookup = stage.get('$lookup')
+            if not lookup or 'foreignField' not in lookup:
+                continue
+            if lookup['foreignField'] in mongo_index_prefixes(db, lookup['from']):
+                continue
+            examined = _lookup_examined(explain, lookup)
+            if examined is None:
+                # Estimare: fiecare document din sursa scaneaza colectia straina
+                examined = source_count * db[lookup['from']].estimated_document_count()
+            findings.append(_finding('mongodb', workload, lookup['from'], 'unindexed_lookup', examined,
+                                     [lookup['foreignField']],
+                                     f"$lookup {collection}.{lookup['localField']} -> "
+                                     f"{lookup['from']}.{lookup['foreignField']}"))
+    return findings
+
+def mongo_explain_summary(explain):
+    stats = explain.get('executionStats') or next(
+        (node['executionStats'] for node in _mongo_nodes(explain) if 'executionStats' in node), {})
+    return {'execution_ms': stats.get('executionTimeMillis'),
+            'docs_examined': stats.get('totalDocsExamined'), 'keys_examined': stats.get('totalKeysExamined'),
+            'stages': sorted({node['stage'] for node in _mongo_nodes(explain) if isinstance(node.get('stage'), str)})}
+
+# --- propuneri --------------------------------------------------------------
+
+INDEXABLE = {'seq_scan', 'collscan', 'unindexed_lookup'}
+
+def index_name(engine, table, columns):
+    prefix = PG_INDEX_PREFIX if engine == 'postgresql' else MONGO_INDEX_PREFIX
+    return '_'.join([prefix, table] + list(columns))
+
+def rank_proposals(findings):
+    """Indexable findings merged per (engine, table, columns), highest score first"""
+    proposals = {}
+    for finding in findings:
+        if finding['kind'] not in INDEXABLE:
+            continue
+        key = (finding['engine'], finding['table'], tuple(finding['columns']))
+        proposal = proposals.setdefault(key, {
+            'engine': finding['engine'], 'table': finding['table'], 'columns': finding['columns'],
+            'name': index_name(*key), 'score': 0, 'workloads': [], 'reasons': []})
+        proposal['score'] += finding['examined']
+        if finding['workload'] not in proposal['workloads']:
+            proposal['workloads'].append(finding['workload'])
+        if finding['kind'] not in proposal['reasons']:
+            proposal['reasons'].append(finding['kind'])
+    ranked = sorted(proposals.values(), key=lambda p: p['score'], reverse=True)
+    for rank, proposal in enumerate(ranked, 1):
+        proposal['rank'] = rank
+        if proposal['engine'] == 'postgresql':
+            proposal['statement'] = (f"CREATE INDEX IF NOT EXISTS {proposal['name']} "
+                                     f"ON {proposal['table']} ({', '.join(proposal['columns'])})")
+        else:
+            proposal['statement'] = (f"db.{proposal['table']}.createIndex("
+                                     f"{json.dumps({c: 1 for c in proposal['columns']})})")
+    return ranked
+
+def apply_proposals(pg_conn, db, proposals):
+    """Build every proposed index; returns {name: seconds}"""
+    cursor = pg_conn.cursor()
+    built = {}
+    for proposal in proposals:
+        start = time.perf_counter()
+        if proposal['engine'] == 'postgresql':
+            cursor.execute(proposal['statement'])
+            pg_conn.commit()
+            cursor.execute(f"ANALYZE {proposal['table']}")
+            pg_conn.commit()
+        else:
+            db[proposal['table']].create_indexes([IndexModel([(c, 1) for c in proposal['columns']],
+                                                             name=proposal['name'])])
+        built[proposal['name']] = round(time.perf_counter() - start, 3)
+    cursor.close()
+    return built
+
+def drop_proposals(pg_conn, db, proposals):
+    cursor = pg_conn.cursor()
+    for proposal in proposals:
+        if proposal['engine'] == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {proposal['name']}")
+        elif proposal['name'] in db[proposal['table']].index_information():
+            db[proposal['table']].drop_index(proposal['name'])
+    pg_conn.commit()
+    cursor.close()
+
+# --- rulare -----------------------------------------------------------------
+
+def run_workloads(pg_conn, db, keys, workloads, iterations=5, min_rows=MIN_ROWS):
+    """Time + explain workloads (workloads.Workload) on both engines, one execution each
+
+    Returns ({workload: {engine: {'avg_ms', 'plan'}}}, findings).
+    """
+    cursor = pg_conn.cursor()
+    report, findings = {}, []
+    for workload in workloads:
+        args = workload.args(keys)
+        command = workload.mongo_command(args)
+        pg_plan = pg_explain(cursor, workload.sql, args)
+        mongo_plan = mongo_explain(db, command)
+        findings += pg_findings(cursor, workload.name, pg_plan, min_rows)
+        findings += mongo_findings(db, workload.name, command, mongo_plan, min_rows)
+        report[workload.name] = {
+            'postgresql': {'avg_ms': _timed_ms(lambda: workload.run_pg(cursor, args), iterations),
+                           'plan': pg_explain_summary(pg_plan)},
+            'mongodb': {'avg_ms': _timed_ms(lambda: workload.run_mongo(db, args), iterations),
+                        'plan': mongo_explain_summary(mongo_plan)},
+        }
+    cursor.close()
+    return report, findings
@@ -0,0 +1,169 @@
+import math
+import time
+
+# Masurarea latentei: histograme HDR, warmup, numar adaptiv de iteratii
+#
+# LatencyHistogram foloseste schema HdrHistogram: valori intregi (microsecunde)
+# in bucket-uri log-liniare - fiecare putere a lui 2 e impartita in
+# sub_bucket_half intervale egale, deci eroarea relativa a oricarei valori
+# raportate e sub 10^-significant_figures, iar memoria depinde doar de
+# intervalul de valori, nu de numarul de esantioane. Contoarele sunt un dict
+# rar (index -> count), serializat ca lista [valoare, count].
+# measure() ruleaza warmup-ul nemasurat, apoi esantioane pana cand intervalul
+# de incredere al mediei scade sub ci_target (relativ la medie) sau se atinge
+# limita de iteratii / timp.
+
+PERCENTILES = [50, 90, 99, 99.9]
+Z_95 = 1.96
+
+
+def _percentile_key(p):
+    return 'p' + format(p, 'g').replace('.', '')
+
+class LatencyHistogram:
+    """HDR-style histogram of latencies in integer microseconds"""
+
+    def __init__(self, significant_figures=3, lowest=1):
+        self.significant_figures = significant_figures
+        largest_single_unit = 2 * 10 ** significant_figures
+        self.sub_bucket_count = 2 ** math.ceil(math.log2(largest_single_unit))
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        self.sub_bucket_half_magnitude = int(math.log2(self.sub_bucket_half))
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+
+    def _index(self, value):
+        bucket = (value | self.sub_bucket_mask).bit_length() - self.unit_magnitude - \
+            (self.sub_bucket_half_magnitude + 1)
+        sub_bucket = value >> (bucket + self.unit_magnitude)
+        return ((bucket + 1) << self.sub_bucket_half_magnitude) + sub_bucket - self.sub_bucket_half
+
+    def _range(self, index):
+        """(lowest, highest) value that maps to index"""
+        bucket = (index >> self.sub_bucket_half_magnitude) - 1
+        sub_bucket = (index & (self.sub_bucket_half - 1)) + self.sub_bucket_half
+        if bucket < 0:
+            sub_bucket -= self.sub_bucket_half
+            bucket = 0
+        shift = bucket + self.unit_magnitude
+        return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_seconds(self, seconds):
+        self.record(round(seconds * 1e6))
+
+    def percentile(self, p):
+        """Highest value equivalent to the p-th percentile sample (microseconds)"""
+        if not self.total:
+            return None
+        target = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._range(index)[1], self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else None
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        for bound, pick in (('min', min), ('max', max)):
+            values = [v for v in (getattr(self, bound), getattr(other, bound)) if v is not None]
+            setattr(self, bound, pick(values) if values else None)
+        return self
+
+    def summary_ms(self, percentiles=PERCENTILES):
+        """min / max / avg / pNN in milliseconds"""
+        to_ms = lambda us: None if us is None else round(us / 1000, 3)
+        summary = {'min': to_ms(self.min), 'max': to_ms(self.max), 'avg': to_ms(self.mean())}
+        for p in percentiles:
+            summary[_percentile_key(p)] = to_ms(self.percentile(p))
+        return summary
+
+    def to_dict(self):
+        return {
+            'unit': 'us',
+            'significant_figures': self.significant_figures,
+            'count': self.total, 'sum': self.sum, 'min': self.min, 'max': self.max,
+            'buckets': [[self._range(index)[0], self.counts[index]] for index in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['significant_figures'])
+        for value, count in data['buckets']:
+            histogram.counts[histogram._index(value)] = count
+        histogram.total, histogram.sum = data['count'], data['sum']
+        histogram.min, histogram.max = data['min'], data['max']
+        return histogram
+
+
+class RunningStats:
+    """Welford mean / variance; relative half-width of the confidence interval of the mean"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def relative_ci(self, z=Z_95):
+        if self.n < 2 or self.mean <= 0:
+            return math.inf
+        return z * math.sqrt(self.m2 / (self.n - 1)) / math.sqrt(self.n) / self.mean
+
+
+def measure(func, warmup=2, min_iterations=5, max_iterations=1000, max_seconds=10.0, ci_target=0.05):
+    """Time func() until the 95% CI of the mean is within ci_target of it
+
+    Returns the summary in ms (min / max / avg / p50 / p90 / p99 / p999) plus
+    iterations, warmup, ci (relative half-width reached), converged,
+    result_count and the serialized histogram.
+    """
+    for _ in range(warmup):
+        func()
+    histogram, stats = LatencyHistogram(), RunningStats()
+    result = None
+    deadline = time.perf_counter() + max_seconds
+    while stats.n < max_iterations:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        histogram.record_seconds(elapsed)
+        stats.add(elapsed)
+        if stats.n >= min_iterations and (stats.relative_ci() <= ci_target or time.perf_counter() >= deadline):
+            break
+    ci = stats.relative_ci()
+    summary = histogram.summary_ms()
+    summary.update({
+        'iterations': stats.n,
+        'warmup': warmup,
+        'ci': round(ci, 4) if math.isfinite(ci) else None,
+        'converged': ci <= ci_target,
+        'result_count': result if isinstance(result, int) else len(result) if hasattr(result, '__len__') else 1,
+        'histogram': histogram.to_dict(),
+    })
+    return summary
@@ -0,0 +1,257 @@
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import TABLE_COLUMNS, get_pg_connection, row_values
+
+# Incarcare in bulk
+#
+# copy_rows trimite fiecare chunk ca un bloc de text prin COPY ... FROM STDIN
+# (pg8000 accepta un iterabil ca `stream`), fara liste intermediare.
+# insert_values ramane ca fallback: INSERT cu VALUES pe mai multe randuri.
+#
+# Pentru MongoDB: insert_many neordonat pe loturi, cate un thread per colectie.
+# Documentele sunt chiar dict-urile generate (se adauga doar _id), fara copii.
+#
+# Tabelele PostgreSQL se incarca dupa graful de foreign keys citit din schema:
+# tabelele independente in paralel, pe conexiuni separate; un tabel copil
+# porneste imediat ce toti parintii lui au facut commit.
+#
+# Indexii secundari pot fi construiti dupa incarcare: PostgreSQL pe mai multe
+# conexiuni cu max_parallel_maintenance_workers, MongoDB cu create_indexes.
+# La fel constrangerile UNIQUE si FOREIGN KEY din PostgreSQL: se sterg inainte
+# de COPY si se adauga la loc dupa - UNIQUE isi construieste indexul o data,
+# FK-urile se adauga NOT VALID si se valideaza apoi intr-o singura trecere
+# (in loc de o verificare per rand).
+
+MONGO_BATCH_SIZE = 5000
+PG_MAX_PARAMS = 32767  # pg8000 trimite numarul de parametri pe int16
+VALUES_BATCH_ROWS = 1000
+INDEX_BUILD_THREADS = 4
+PG_MAINTENANCE_WORKERS = 4
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _throughput(rows, elapsed):
+    return {
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_s': round(rows / elapsed) if elapsed > 0 else 0
+    }
+
+def _copy_text(value):
+    """One value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return str(value).translate(_COPY_ESCAPES)
+
+def _copy_blocks(table, chunks, stats):
+    cols = TABLE_COLUMNS[table]
+    for chunk in chunks:
+        lines = ['\t'.join(_copy_text(row[col]) for col in cols) for row in chunk]
+        stats['rows'] += len(lines)
+        yield '\n'.join(lines) + '\n' if lines else ''
+
+def copy_rows(cursor, table, chunks):
+    """Stream row chunks into table with COPY FROM STDIN; returns row count"""
+    stats = {'rows': 0}
+    sql = f"COPY {table} ({', '.join(TABLE_COLUMNS[table])}) FROM STDIN"
+    cursor.execute(sql, stream=_copy_blocks(table, chunks, stats))
+    return stats['rows']
+
+def insert_values(cursor, table, chunks):
+    """Fallback loader: multi-row INSERT ... VALUES batches; returns row count"""
+    cols = TABLE_COLUMNS[table]
+    batch_rows = min(VALUES_BATCH_ROWS, PG_MAX_PARAMS // len(cols))
+    placeholder = '(' + ', '.join(['%s'] * len(cols)) + ')'
+    prefix = f"INSERT INTO {table} ({', '.join(cols)}) VALUES "
+    rows = 0
+    for chunk in chunks:
+        for start in range(0, len(chunk), batch_rows):
+            batch = chunk[start:start + batch_rows]
+            params = [value for row in batch for value in row_values(table, row)]
+            cursor.execute(prefix + ', '.join([placeholder] * len(batch)), params)
+            rows += len(batch)
+    return rows
+
+PG_LOADERS = {
+    'copy': copy_rows,
+    'values': insert_values,
+}
+
+def load_pg_table(conn, table, chunks, method='copy'):
+    """Load one table and commit; returns {'rows', 'seconds', 'rows_per_s'}"""
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    rows = PG_LOADERS[method](cursor, table, chunks)
+    conn.commit()
+    cursor.close()
+    return _throughput(rows, time.perf_counter() - start)
+
+def load_mongo_collection(db, table, chunks, batch_size=MONGO_BATCH_SIZE):
+    """Unordered insert_many batches for one collection; returns throughput"""
+    collection = db[table]
+    rows = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        for row in chunk:
+            row['_id'] = row['id']
+        for offset in range(0, len(chunk), batch_size):
+            collection.insert_many(chunk[offset:offset + batch_size], ordered=False)
+        rows += len(chunk)
+    return _throughput(rows, time.perf_counter() - start)
+
+def load_mongo_parallel(db, table_chunks, batch_size=MONGO_BATCH_SIZE, threads=None):
+    """Load several collections concurrently (MongoClient is thread-safe)
+
+    table_chunks maps collection name -> iterable of row chunks; returns
+    the per-collection throughput.
+    """
+    with ThreadPoolExecutor(max_workers=threads or len(table_chunks)) as pool:
+        futures = {
+            table: pool.submit(load_mongo_collection, db, table, chunks, batch_size)
+            for table, chunks in table_chunks.items()
+        }
+        return {table: future.result() for table, future in futures.items()}
+
+def pg_foreign_keys(conn, tables):
+    """{table: set of parent tables} from pg_constraint, limited to `tables`"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.conrelid::regclass::text, c.confrelid::regclass::text
+        FROM pg_constraint c
+        WHERE c.contype = 'f' AND c.connamespace = 'public'::regnamespace
+    """)
+    parents = {table: set() for table in tables}
+    for child, parent in cursor.fetchall():
+        if child in parents and parent in parents and child != parent:
+            parents[child].add(parent)
+    cursor.close()
+    return parents
+
+def run_dependency_graph(parents, func, workers):
+    """Call func(table) for every table, parents first, up to `workers` at once
+
+    A table is submitted as soon as all of its parents have finished.
+    Returns {table: func(table)} in completion order.
+    """
+    done = {}
+    remaining = dict(parents)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while remaining or running:
+            for table in [t for t, deps in remaining.items() if deps <= done.keys()]:
+                running[pool.submit(func, table)] = table
+                del remaining[table]
+            if not running:
+                raise ValueError(f"Ciclu de foreign keys: {sorted(remaining)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done[running.pop(future)] = future.result()
+    return done
+
+def drop_pg_indexes(conn, names):
+    cursor = conn.cursor()
+    for name in names:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+    cursor.close()
+
+def _build_pg_index(sql, maintenance_workers):
+    conn = get_pg_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    cursor.execute(f"SET max_parallel_maintenance_workers = {int(maintenance_workers)}")
+    cursor.execute(sql)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    conn.close()
+    return round(elapsed, 3)
+
+def build_pg_indexes(indexes, threads=INDEX_BUILD_THREADS, maintenance_workers=PG_MAINTENANCE_WORKERS):
+    """Run CREATE INDEX statements concurrently, one connection each
+
+    Every session also gets max_parallel_maintenance_workers, so a single
+    B-tree build can use several worker processes. Returns seconds per index.
+    """
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = {name: pool.submit(_build_pg_index, sql, maintenance_workers)
+                   for name, sql in indexes.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def pg_constraints(conn, tables):
+    """[(table, name, definition, contype, partitioned)] of the UNIQUE / FK constraints, UNIQUE first"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.conrelid::regclass::text, c.conname, pg_get_constraintdef(c.oid), c.contype, r.relkind = 'p'
+        FROM pg_constraint c
+        JOIN pg_class r ON r.oid = c.conrelid
+        WHERE c.contype IN ('u', 'f') AND c.connamespace = 'public'::regnamespace AND c.conparentid = 0
+        ORDER BY c.contype DESC, c.conname
+    """)
+    constraints = [tuple(row) for row in cursor.fetchall() if row[0] in tables]
+    cursor.close()
+    return constraints
+
+def drop_pg_constraints(conn, constraints):
+    """Drop the FKs first: a UNIQUE constraint can be the target of one"""
+    cursor = conn.cursor()
+    for table, name, _, _, _ in reversed(constraints):
+        cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    conn.commit()
+    cursor.close()
+
+def build_pg_constraints(constraints, threads=INDEX_BUILD_THREADS, maintenance_workers=PG_MAINTENANCE_WORKERS):
+    """Re-add constraints dropped by drop_pg_constraints; returns seconds per constraint
+
+    UNIQUE constraints build their indexes concurrently, like build_pg_indexes.
+    FKs are added NOT VALID (catalog only), then validated concurrently -
+    except on partitioned tables, which do not support NOT VALID FKs.
+    """
+    unique = {name: f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+              for table, name, definition, contype, _ in constraints if contype == 'u'}
+    times = build_pg_indexes(unique, threads, maintenance_workers)
+
+    conn = get_pg_connection()
+    cursor = conn.cursor()
+    validate = {}
+    for table, name, definition, contype, partitioned in constraints:
+        if contype != 'f':
+            continue
+        start = time.perf_counter()
+        cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+                       + ("" if partitioned else " NOT VALID"))
+        conn.commit()
+        times[name] = round(time.perf_counter() - start, 3)
+        if not partitioned:
+            validate[name] = f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}"
+    cursor.close()
+    conn.close()
+    for name, seconds in build_pg_indexes(validate, threads, maintenance_workers).items():
+        times[name] = round(times[name] + seconds, 3)
+    return times
+
+def drop_mongo_indexes(db, indexes):
+    for coll, models in indexes.items():
+        existing = db[coll].index_information()
+        for model in models:
+            if model.document['name'] in existing:
+                db[coll].drop_index(model.document['name'])
+
+def _build_mongo_indexes(collection, models):
+    start = time.perf_counter()
+    collection.create_indexes(models)
+    return round(time.perf_counter() - start, 3)
+
+def build_mongo_indexes(db, indexes, threads=INDEX_BUILD_THREADS):
+    """One create_indexes call per collection, collections in parallel"""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = {coll: pool.submit(_build_mongo_indexes, db[coll], models)
+                   for coll, models in indexes.items()}
+        return {coll: future.result() for coll, future in futures.items()}
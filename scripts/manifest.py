@@ -0,0 +1,111 @@
+import json
+import hashlib
+from datetime import datetime
+
+from utils import (
+    TABLES, CHUNK_SIZE, GENERATOR_VERSION, MONGO_INDEXES, get_row_counts
+)
+
+# Manifestul datasetului incarcat
+#
+# Dupa o populare verificata se scrie in ambele baze ce date contin: seed,
+# scale factor, engine, versiunea generatorului, distributiile si un hash al
+# schemei. Setup-ul si popularea compara manifestul cu ce s-ar genera acum si
+# sar peste stergere / reincarcare cand coincid. Manifestul se sterge inainte
+# de orice incarcare, deci o rulare intrerupta nu lasa un manifest valid.
+
+MANIFEST_NAME = 'dataset_manifest'
+
+PG_MANIFEST_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {MANIFEST_NAME} (
+        name VARCHAR(50) PRIMARY KEY,
+        manifest TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def _hash(value):
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode(), digest_size=8).hexdigest()
+
+def dataset_manifest(scale_factor, seed, engine, distributions=None):
+    """What a populate run with these arguments would load"""
+    counts = get_row_counts(scale_factor, distributions)
+    return {
+        'scale_factor': scale_factor,
+        'seed': seed,
+        'engine': engine,
+        'generator_version': GENERATOR_VERSION,
+        'chunk_size': CHUNK_SIZE,
+        'distributions': counts['distributions'],
+    }
+
+def pg_schema_hash(conn):
+    """Hash of the column definitions of TABLES and of which ones are partitioned"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT table_name, column_name, data_type, ordinal_position
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = ANY(%s)
+        ORDER BY table_name, ordinal_position
+    """, (TABLES,))
+    columns = [list(row) for row in cursor.fetchall()]
+    cursor.execute("SELECT relname, relkind FROM pg_class WHERE relname = ANY(%s) ORDER BY relname", (TABLES,))
+    kinds = [list(row) for row in cursor.fetchall()]
+    cursor.close()
+    return _hash([columns, kinds])
+
+def mongo_schema_hash():
+    """Hash of the collections and their MONGO_INDEXES definitions"""
+    return _hash({coll: [model.document for model in MONGO_INDEXES.get(coll, [])] for coll in TABLES})
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def ensure_pg_manifest_table(conn):
+    cursor = conn.cursor()
+    cursor.execute(PG_MANIFEST_DDL)
+    conn.commit()
+    cursor.close()
+
+def read_pg_manifest(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (MANIFEST_NAME,))
+    manifest = None
+    if cursor.fetchone()[0]:
+        cursor.execute(f"SELECT manifest FROM {MANIFEST_NAME} WHERE name = 'dataset'")
+        row = cursor.fetchone()
+        manifest = json.loads(row[0]) if row else None
+    cursor.close()
+    return manifest
+
+def write_pg_manifest(conn, manifest):
+    ensure_pg_manifest_table(conn)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        INSERT INTO {MANIFEST_NAME} (name, manifest, updated_at) VALUES ('dataset', %s, %s)
+        ON CONFLICT (name) DO UPDATE SET manifest = EXCLUDED.manifest, updated_at = EXCLUDED.updated_at
+    """, (json.dumps(manifest, sort_keys=True), datetime.now()))
+    conn.commit()
+    cursor.close()
+
+def clear_pg_manifest(conn):
+    ensure_pg_manifest_table(conn)
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {MANIFEST_NAME}")
+    conn.commit()
+    cursor.close()
+
+# --- MongoDB ----------------------------------------------------------------
+
+def read_mongo_manifest(db):
+    doc = db[MANIFEST_NAME].find_one({'_id': 'dataset'})
+    return doc['manifest'] if doc else None
+
+def write_mongo_manifest(db, manifest):
+    db[MANIFEST_NAME].replace_one(
+        {'_id': 'dataset'},
+        {'_id': 'dataset', 'manifest': manifest, 'updated_at': datetime.now()},
+        upsert=True)
+
+def clear_mongo_manifest(db):
+    db[MANIFEST_NAME].delete_many({})
@@ -0,0 +1,281 @@
+import time
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from schema import PG_MATERIALIZED_FILE, sql_statements
+
+# Versiuni precalculate ale view-urilor order_summary, product_stats, user_stats
+#
+# PostgreSQL (schemas/postgresql_materialized.sql):
+#   <view>_mat - tabel actualizat incremental: triggerele scriu cheile
+#                afectate in mat_changes, refresh-ul recalculeaza doar acele
+#                randuri din view. Cand sunt murdare peste FULL_REFRESH_FRACTION
+#                din randuri (ex. dupa o populare) se reconstruieste tot.
+#   <view>_mv  - MATERIALIZED VIEW cu REFRESH ... CONCURRENTLY, varianta de
+#                rezerva cand nu exista jurnal de modificari.
+# MongoDB: colectii <view>_mat construite cu $merge. Nu exista triggere,
+# deci scriitorul inregistreaza cheile in mat_changes (mongo_mark_orders).
+
+SUMMARY_VIEWS = ['order_summary', 'product_stats', 'user_stats']
+# Tabelele cu triggere si functia apelata
+TRIGGER_TABLES = {
+    'orders': 'mat_orders_changed',
+    'order_items': 'mat_order_items_changed',
+    'users': 'mat_users_changed',
+    'products': 'mat_products_changed',
+}
+TRIGGER_EVENTS = {
+    'ins': ('INSERT', 'NEW TABLE AS new_rows'),
+    'upd': ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    'del': ('DELETE', 'OLD TABLE AS old_rows'),
+}
+FULL_REFRESH_FRACTION = 0.2
+CHANGES = 'mat_changes'
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 4)
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def create_triggers(cursor):
+    """Statement-level triggers with transition tables (one per event)"""
+    for table, function in TRIGGER_TABLES.items():
+        for suffix, (event, referencing) in TRIGGER_EVENTS.items():
+            name = f"mat_{table}_{suffix}"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+            cursor.execute(f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+                           f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()")
+
+def _rebuild(cursor, view):
+    cursor.execute(f"DELETE FROM {view}_mat")
+    cursor.execute(f"INSERT INTO {view}_mat SELECT * FROM {view}")
+    cursor.execute(f"DELETE FROM {CHANGES} WHERE view_name = %s", (view,))
+
+def setup_materialized(conn):
+    """Create the tables, views and triggers, then fill everything; returns seconds per object"""
+    cursor = conn.cursor()
+    for sql in sql_statements(PG_MATERIALIZED_FILE):
+        cursor.execute(sql)
+    create_triggers(cursor)
+    conn.commit()
+    timings = {}
+    for view in SUMMARY_VIEWS:
+        _, timings[f"{view}_mat"] = _timed(lambda: _rebuild(cursor, view))
+        # Primul refresh nu poate fi CONCURRENTLY (view-ul nu are inca date)
+        _, timings[f"{view}_mv"] = _timed(lambda: cursor.execute(f"REFRESH MATERIALIZED VIEW {view}_mv"))
+        conn.commit()
+    cursor.close()
+    return timings
+
+def drop_materialized(conn):
+    cursor = conn.cursor()
+    for table in TRIGGER_TABLES:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+        if cursor.fetchone()[0]:
+            for suffix in TRIGGER_EVENTS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS mat_{table}_{suffix} ON {table}")
+    for view in SUMMARY_VIEWS:
+        cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}_mv")
+        cursor.execute(f"DROP TABLE IF EXISTS {view}_mat")
+    cursor.execute(f"DROP TABLE IF EXISTS {CHANGES}")
+    for function in list(TRIGGER_TABLES.values()) + ['mat_mark']:
+        cursor.execute(f"DROP FUNCTION IF EXISTS {function} CASCADE")
+    conn.commit()
+    cursor.close()
+
+def pending_changes(conn):
+    """{view: {'keys', 'oldest_s'}} - unapplied keys and age of the oldest change"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT view_name, COUNT(*), EXTRACT(EPOCH FROM clock_timestamp() - MIN(changed_at))
+        FROM {CHANGES} GROUP BY view_name
+    """)
+    pending = {view: {'keys': 0, 'oldest_s': 0.0} for view in SUMMARY_VIEWS}
+    for view, keys, oldest in cursor.fetchall():
+        pending[view] = {'keys': keys, 'oldest_s': round(float(oldest), 4)}
+    cursor.close()
+    return pending
+
+def refresh_incremental(conn, view):
+    """Apply the pending keys of one view to <view>_mat
+
+    Keys are claimed with DELETE ... RETURNING in the same transaction, so a
+    change committed meanwhile stays in the log for the next refresh.
+    Returns {'method': 'incremental' | 'full', 'keys', 'seconds'}.
+    """
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    cursor.execute(f"DELETE FROM {CHANGES} WHERE view_name = %s RETURNING key_id", (view,))
+    keys = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f"SELECT COUNT(*) FROM {view}_mat")
+    rows = cursor.fetchone()[0]
+    if keys and len(keys) > FULL_REFRESH_FRACTION * rows:
+        method = 'full'
+        _rebuild(cursor, view)
+    else:
+        method = 'incremental'
+        if keys:
+            cursor.execute(f"DELETE FROM {view}_mat WHERE id = ANY(%s)", (keys,))
+            cursor.execute(f"INSERT INTO {view}_mat SELECT * FROM {view} WHERE id = ANY(%s)", (keys,))
+    conn.commit()
+    cursor.close()
+    return {'method': method, 'keys': len(keys), 'seconds': round(time.perf_counter() - start, 4)}
+
+def refresh_concurrently(conn, view):
+    """REFRESH MATERIALIZED VIEW CONCURRENTLY <view>_mv; readers are not blocked"""
+    cursor = conn.cursor()
+    _, seconds = _timed(lambda: cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}_mv"))
+    conn.commit()
+    cursor.close()
+    return {'method': 'concurrent', 'seconds': seconds}
+
+def pg_differences(conn, view, target):
+    """Rows that differ between the live view and a materialized copy (both directions)"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT (SELECT COUNT(*) FROM (SELECT * FROM {view} EXCEPT SELECT * FROM {target}) a)
+             + (SELECT COUNT(*) FROM (SELECT * FROM {target} EXCEPT SELECT * FROM {view}) b)
+    """)
+    differences = cursor.fetchone()[0]
+    cursor.close()
+    return differences
+
+# --- MongoDB ----------------------------------------------------------------
+
+# Aceleasi coloane ca view-urile SQL; sumele din user_stats sunt pe comenzi,
+# nu pe randurile JOIN-ului cu order_items
+MONGO_SOURCES = {'order_summary': 'orders', 'product_stats': 'products', 'user_stats': 'users'}
+MONGO_PIPELINES = {
+    'order_summary': [
+        {'$lookup': {'from': 'users', 'localField': 'user_id', 'foreignField': 'id', 'as': 'user'}},
+        {'$unwind': '$user'},
+        {'$lookup': {'from': 'order_items', 'localField': 'id', 'foreignField': 'order_id', 'as': 'items'}},
+        {'$project': {
+            '_id': '$id', 'id': 1, 'order_number': 1, 'user_id': 1,
+            'email': '$user.email', 'first_name': '$user.first_name', 'last_name': '$user.last_name',
+            'item_count': {'$size': '$items'}, 'total_quantity': {'$sum': '$items.quantity'},
+            'total_amount': 1, 'status': 1, 'created_at': 1,
+        }},
+    ],
+    'product_stats': [
+        {'$lookup': {'from': 'order_items', 'localField': 'id', 'foreignField': 'product_id', 'as': 'items'}},
+        {'$project': {
+            '_id': '$id', 'id': 1, 'name': 1, 'sku': 1,
+            'times_sold': {'$size': {'$setUnion': ['$items.order_id', []]}},
+            'total_sold': {'$sum': '$items.quantity'},
+            'avg_price': {'$avg': '$items.unit_price'},
+            'max_price': {'$max': '$items.unit_price'},
+            'min_price': {'$min': '$items.unit_price'},
+            'product_rating': '$rating', 'review_count': 1, 'stock_quantity': 1,
+        }},
+    ],
+    'user_stats': [
+        {'$lookup': {'from': 'orders', 'localField': 'id', 'foreignField': 'user_id', 'as': 'orders'}},
+        {'$lookup': {'from': 'order_items', 'localField': 'orders.id', 'foreignField': 'order_id', 'as': 'items'}},
+        {'$project': {
+            '_id': '$id', 'id': 1, 'username': 1, 'email': 1,
+            'total_orders': {'$size': '$orders'},
+            'lifetime_value': {'$sum': '$orders.total_amount'},
+            'avg_order_value': {'$avg': '$orders.total_amount'},
+            'last_order_date': {'$max': '$orders.created_at'},
+            'unique_products_bought': {'$size': {'$setUnion': ['$items.product_id', []]}},
+            'created_at': 1,
+        }},
+    ],
+}
+MONGO_MAT_INDEXES = {
+    'order_summary': [('user_id', 1)],
+    'product_stats': [('total_sold', -1)],
+}
+
+def mongo_summary_pipeline(view, keys=None):
+    """Pipeline computing the view on the fly, optionally for some keys only"""
+    match = [{'$match': {'id': {'$in': list(keys)}}}] if keys is not None else []
+    return match + MONGO_PIPELINES[view]
+
+def mongo_refresh(db, view, keys=None):
+    """$merge the view (or only `keys`) into <view>_mat; deleted sources are removed"""
+    pipeline = mongo_summary_pipeline(view, keys) + [
+        {'$merge': {'into': f"{view}_mat", 'on': '_id', 'whenMatched': 'replace', 'whenNotMatched': 'insert'}}
+    ]
+    source = db[MONGO_SOURCES[view]]
+    source.aggregate(pipeline)
+    scope = {'_id': {'$in': list(keys)}} if keys is not None else {}
+    present = set(source.distinct('id', {'id': {'$in': list(keys)}} if keys is not None else {}))
+    stale = [doc['_id'] for doc in db[f"{view}_mat"].find(scope, {'_id': 1}) if doc['_id'] not in present]
+    if stale:
+        db[f"{view}_mat"].delete_many({'_id': {'$in': stale}})
+
+def mongo_setup_materialized(db):
+    """Indexes plus a full $merge per view; returns seconds per collection"""
+    timings = {}
+    for view in SUMMARY_VIEWS:
+        for key in MONGO_MAT_INDEXES.get(view, []):
+            db[f"{view}_mat"].create_index([key])
+        _, timings[f"{view}_mat"] = _timed(lambda: mongo_refresh(db, view))
+        db[CHANGES].delete_many({'view_name': view})
+    return timings
+
+def mongo_drop_materialized(db):
+    for view in SUMMARY_VIEWS:
+        db[f"{view}_mat"].drop()
+    db[CHANGES].drop()
+
+def mongo_mark(db, view, keys):
+    """Record changed keys; the first change of a key keeps its timestamp"""
+    now = datetime.now()
+    ops = [UpdateOne({'_id': f"{view}:{key}"},
+                     {'$setOnInsert': {'view_name': view, 'key_id': key, 'changed_at': now}},
+                     upsert=True)
+           for key in set(keys)]
+    if ops:
+        db[CHANGES].bulk_write(ops, ordered=False)
+
+def mongo_mark_orders(db, orders=(), items=()):
+    """Mark the summaries touched by written orders / order_items documents"""
+    order_ids = {o['id'] for o in orders} | {i['order_id'] for i in items}
+    user_ids = {o['user_id'] for o in orders}
+    missing = {i['order_id'] for i in items} - {o['id'] for o in orders}
+    if missing:
+        user_ids |= set(db.orders.distinct('user_id', {'id': {'$in': list(missing)}}))
+    mongo_mark(db, 'order_summary', order_ids)
+    mongo_mark(db, 'user_stats', user_ids)
+    mongo_mark(db, 'product_stats', {i['product_id'] for i in items})
+
+def mongo_pending_changes(db):
+    """Same shape as pending_changes()"""
+    now = datetime.now()
+    pending = {view: {'keys': 0, 'oldest_s': 0.0} for view in SUMMARY_VIEWS}
+    for row in db[CHANGES].aggregate([
+        {'$group': {'_id': '$view_name', 'keys': {'$sum': 1}, 'oldest': {'$min': '$changed_at'}}}
+    ]):
+        pending[row['_id']] = {'keys': row['keys'], 'oldest_s': round((now - row['oldest']).total_seconds(), 4)}
+    return pending
+
+def mongo_refresh_incremental(db, view):
+    """Apply pending keys of one view; same return value as refresh_incremental()"""
+    start = time.perf_counter()
+    claimed = list(db[CHANGES].find({'view_name': view}, {'key_id': 1}))
+    keys = [doc['key_id'] for doc in claimed]
+    # Sterse inainte de recalculare: scriitorul marcheaza dupa ce scrie, deci o
+    # cheie marcata din nou de acum inainte ajunge in refresh-ul urmator
+    db[CHANGES].delete_many({'_id': {'$in': [doc['_id'] for doc in claimed]}})
+    rows = db[f"{view}_mat"].estimated_document_count()
+    if keys and len(keys) > FULL_REFRESH_FRACTION * rows:
+        method = 'full'
+        mongo_refresh(db, view)
+    else:
+        method = 'incremental'
+        if keys:
+            mongo_refresh(db, view, keys)
+    return {'method': method, 'keys': len(keys), 'seconds': round(time.perf_counter() - start, 4)}
+
+def mongo_differences(db, view):
+    """Documents that differ between the live pipeline and <view>_mat"""
+    live = {doc['_id']: doc for doc in db[MONGO_SOURCES[view]].aggregate(MONGO_PIPELINES[view])}
+    stored = {doc['_id']: doc for doc in db[f"{view}_mat"].find()}
+    return sum(1 for key in live.keys() | stored.keys() if live.get(key) != stored.get(key))
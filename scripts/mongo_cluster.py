@@ -0,0 +1,224 @@
+import os
+import time
+import signal
+import shutil
+import tempfile
+import subprocess
+from datetime import timedelta
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError, OperationFailure
+
+from utils import DATASET_EPOCH, ORDER_HISTORY_DAYS
+
+# Cluster MongoDB shardat local, pentru benchmark-uri
+#
+# Un config server (replica set cu un membru), N shard-uri (fiecare un
+# replica set cu un membru) si un mongos, toate pe 127.0.0.1 cu dbpath-uri
+# intr-un director temporar. Binarele se iau din PATH sau din MONGOD_BIN /
+# MONGOS_BIN; necesita MongoDB >= 7.0 (aceeasi linie ca Atlas 8.0).
+#
+# 9_sharding_benchmark.py porneste si opreste cate un cluster per rulare;
+# 2_setup_mongodb.py --sharded il lasa pornit (detached) pentru scripturile
+# urmatoare si il opreste cu --stop-sharded, dupa PID-urile din CLUSTER_DIR.
+#
+# Strategii de shard key:
+#   hashed - orders si reviews dupa user_id (hashed); order_items nu are
+#            user_id, deci dupa order_id (hashed)
+#   ranged - toate trei dupa created_at, pre-impartite in N intervale egale
+#            din istoricul comenzilor, cate unul pe shard
+
+MONGOD_BIN = os.getenv('MONGOD_BIN') or shutil.which('mongod')
+MONGOS_BIN = os.getenv('MONGOS_BIN') or shutil.which('mongos')
+BASE_PORT = int(os.getenv('MONGO_CLUSTER_PORT', 27100))
+CLUSTER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mongo-cluster')
+
+SHARD_KEYS = {
+    'hashed': {
+        'orders': {'user_id': 'hashed'},
+        'order_items': {'order_id': 'hashed'},
+        'reviews': {'user_id': 'hashed'},
+    },
+    'ranged': {
+        'orders': {'created_at': 1},
+        'order_items': {'created_at': 1},
+        'reviews': {'created_at': 1},
+    },
+}
+
+
+def _wait(func, timeout=60, interval=0.2):
+    """Poll func() until it returns something truthy (errors count as not yet)"""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            if func():
+                return
+        except PyMongoError:
+            pass
+        if time.time() > deadline:
+            raise TimeoutError("Clusterul nu a pornit la timp")
+        time.sleep(interval)
+
+class LocalShardedCluster:
+    """Start/stop a throwaway sharded cluster; use as a context manager"""
+
+    def __init__(self, shards=2, base_port=BASE_PORT, dbpath=None, detached=False):
+        if not MONGOD_BIN or not MONGOS_BIN:
+            raise RuntimeError("mongod / mongos lipsesc - setati MONGOD_BIN si MONGOS_BIN")
+        self.shards = shards
+        self.base_port = base_port
+        self.root = dbpath or tempfile.mkdtemp(prefix='mongo-cluster-')
+        # Procese detached: sesiune proprie, supravietuiesc scriptului si Ctrl-C
+        self.detached = detached
+        self.processes = []
+
+    @property
+    def uri(self):
+        return f"mongodb://127.0.0.1:{self.base_port}"
+
+    def _spawn(self, args, name):
+        with open(os.path.join(self.root, f"{name}.log"), 'w') as log:
+            self.processes.append(subprocess.Popen(args, stdout=log, stderr=subprocess.STDOUT,
+                                                   start_new_session=self.detached))
+        with open(os.path.join(self.root, 'pids'), 'a') as pids:
+            pids.write(f"{self.processes[-1].pid}\n")
+
+    def _mongod(self, name, port, role, replset):
+        path = os.path.join(self.root, name)
+        os.makedirs(path, exist_ok=True)
+        self._spawn([MONGOD_BIN, role, '--replSet', replset, '--port', str(port),
+                     '--dbpath', path, '--bind_ip', '127.0.0.1'], name)
+
+    def _initiate(self, port, replset, configsvr=False):
+        client = MongoClient('127.0.0.1', port, directConnection=True)
+        _wait(lambda: client.admin.command('ping'))
+        config = {'_id': replset, 'members': [{'_id': 0, 'host': f"127.0.0.1:{port}"}]}
+        if configsvr:
+            config['configsvr'] = True
+        client.admin.command('replSetInitiate', config)
+        _wait(lambda: client.admin.command('hello').get('isWritablePrimary'))
+        client.close()
+
+    def start(self):
+        """Config server, shards and mongos; mongos listens on base_port"""
+        config_port = self.base_port + 1
+        self._mongod('config', config_port, '--configsvr', 'cfg')
+        shard_ports = [self.base_port + 2 + i for i in range(self.shards)]
+        for i, port in enumerate(shard_ports):
+            self._mongod(f"shard{i}", port, '--shardsvr', f"shard{i}")
+
+        self._initiate(config_port, 'cfg', configsvr=True)
+        for i, port in enumerate(shard_ports):
+            self._initiate(port, f"shard{i}")
+
+        self._spawn([MONGOS_BIN, '--configdb', f"cfg/127.0.0.1:{config_port}",
+                     '--port', str(self.base_port), '--bind_ip', '127.0.0.1'], 'mongos')
+        client = MongoClient(self.uri)
+        _wait(lambda: client.admin.command('ping'))
+        for i, port in enumerate(shard_ports):
+            client.admin.command('addShard', f"shard{i}/127.0.0.1:{port}", name=f"shard{i}")
+        client.close()
+        return self
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = []
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def stop_detached(dbpath, timeout=30):
+        """Stop a cluster left running by another process; False if none found"""
+        path = os.path.join(dbpath, 'pids')
+        if not os.path.exists(path):
+            return False
+        with open(path) as f:
+            pids = [int(line) for line in f if line.strip()]
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.time() + timeout
+        for pid in pids:
+            while time.time() < deadline:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    break
+                time.sleep(0.2)
+            else:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        shutil.rmtree(dbpath, ignore_errors=True)
+        return True
+
+    def __enter__(self):
+        try:
+            return self.start()
+        except BaseException:
+            self.stop()
+            raise
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def _range_bounds(parts):
+    """N - 1 created_at split points dividing the order history evenly"""
+    first = DATASET_EPOCH - timedelta(days=ORDER_HISTORY_DAYS + 1)
+    step = (DATASET_EPOCH - first) / parts
+    return [first + step * i for i in range(1, parts)]
+
+def shard_collections(client, db_name, strategy, shards):
+    """Shard orders / order_items / reviews of db_name with the given strategy
+
+    Collections must be empty. Ranged collections are pre-split into one
+    created_at interval per shard, so loading does not depend on the balancer.
+    """
+    admin = client.admin
+    admin.command('enableSharding', db_name)
+    for coll, key in SHARD_KEYS[strategy].items():
+        ns = f"{db_name}.{coll}"
+        client[db_name][coll].create_index(list(key.items()))
+        admin.command('shardCollection', ns, key=key)
+        if strategy == 'ranged':
+            bounds = _range_bounds(shards)
+            for bound in bounds:
+                admin.command('split', ns, middle={'created_at': bound})
+            # Chunk-ul i (care contine starts[i]) ajunge pe shard-ul i
+            starts = [DATASET_EPOCH - timedelta(days=ORDER_HISTORY_DAYS + 1)] + bounds
+            for i, start in enumerate(starts):
+                try:
+                    admin.command('moveChunk', ns, find={'created_at': start}, to=f"shard{i}")
+                except OperationFailure as e:
+                    if 'already' not in str(e):
+                        raise
+
+def shardable_indexes(db, indexes):
+    """indexes minus the unique ones on sharded collections (unchanged without mongos)"""
+    # Un index unic pe o colectie shardata trebuie sa inceapa cu shard key-ul;
+    # cele din MONGO_INDEXES nu incep
+    if not db.client.is_mongos:
+        return indexes
+    sharded = {doc['_id'].split('.', 1)[1]
+               for doc in db.client.config.collections.find({'_id': {'$regex': f"^{db.name}\\."}})}
+    return {coll: [m for m in models if not (coll in sharded and m.document.get('unique'))]
+            for coll, models in indexes.items()}
+
+def shards_targeted(explain):
+    """Shard names that executed a query, from a mongos explain() result"""
+    planner = explain.get('queryPlanner', {})
+    winning = planner.get('winningPlan', {})
+    if 'shards' in winning:
+        return sorted(shard['shardName'] for shard in winning['shards'])
+    if isinstance(explain.get('shards'), dict):  # aggregate explain
+        return sorted(explain['shards'])
+    return []
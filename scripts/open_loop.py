@@ -0,0 +1,264 @@
+import time
+import math
+import random
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_pg_connection, get_mongo_connection, get_pg_connection_async, get_mongo_connection_async
+from distributions import sample_id
+from workloads import time_windows
+from latency import LatencyHistogram
+
+# Generator de incarcare in bucla deschisa (asyncio)
+#
+# Cererile pleaca dupa un program fix (1/qps) sau Poisson (intervale
+# exponentiale de medie 1/qps), indiferent cat dureaza raspunsurile - o cerere
+# lenta nu amana urmatoarele, ca in buclele inchise din 5_cap_simulation.py.
+# Latenta se masoara de la momentul planificat al cererii (corectia de
+# coordinated omission): asteptarea dupa o conexiune libera sau un scheduler
+# in intarziere intra in percentile. Separat se pastreaza si service time
+# (de cand driverul executa efectiv query-ul), ca diferenta sa fie vizibila.
+#
+# Un backend executa un workload: open(), execute(args) si close() sunt
+# corutine; execute intoarce momentul (perf_counter) in care a inceput
+# executia. Backend-ul 'sync' ruleaza driverele blocante (pg8000, pymongo)
+# intr-un pool de thread-uri, cu cate o conexiune PostgreSQL per thread.
+# Backend-ul 'async' foloseste drivere native asyncio (asyncpg,
+# AsyncMongoClient): fara thread-uri, un singur proces poate tine mii de
+# cereri in zbor, limitate doar de cele `connections` conexiuni (PostgreSQL,
+# respectiv maxPoolSize al clientului MongoDB - la fel ca backend-ul sync).
+#
+# closed_loop() e varianta in bucla inchisa: `concurrency` task-uri care
+# trimit urmatoarea cerere imediat ce o primesc pe precedenta (throughput
+# maxim la un numar fix de cereri in zbor).
+
+SCHEDULES = ['fixed', 'poisson']
+
+
+def arrival_offsets(qps, duration, schedule='fixed', seed=0):
+    """Intended send times (seconds from start) of every request in [0, duration)"""
+    if schedule == 'fixed':
+        return [i / qps for i in range(int(math.ceil(qps * duration)))]
+    rng = random.Random(seed)
+    offsets, t = [], rng.expovariate(qps)
+    while t < duration:
+        offsets.append(t)
+        t += rng.expovariate(qps)
+    return offsets
+
+
+class ConnectionPool:
+    """Idle connections behind a FIFO semaphore - with asyncio.Queue the releasing task takes them back"""
+
+    def __init__(self, conns):
+        self.idle = deque(conns)
+        self.slots = asyncio.Semaphore(len(self.idle))
+
+    async def acquire(self):
+        await self.slots.acquire()
+        return self.idle.popleft()
+
+    def release(self, conn):
+        self.idle.append(conn)
+        self.slots.release()
+
+
+class SyncBackend:
+    """Blocking drivers behind asyncio: `connections` threads, one PG connection each"""
+
+    name = 'sync'
+
+    def __init__(self, engine, workload, connections):
+        self.engine = engine
+        self.workload = workload
+        self.connections = connections
+        self.pool = ThreadPoolExecutor(max_workers=connections)
+        self.conns = None
+        self.client = None
+
+    async def open(self):
+        if self.engine == 'postgresql':
+            self.conns = ConnectionPool(get_pg_connection() for _ in range(self.connections))
+        else:
+            # MongoClient e thread-safe; pool-ul are exact `connections` socket-uri,
+            # ca in backend-ul async
+            self.client, self.db = get_mongo_connection(self.connections)
+
+    def _run_pg(self, conn, args):
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        try:
+            self.workload.run_pg(cursor, args)
+            return started
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _run_mongo(self, args):
+        started = time.perf_counter()
+        self.workload.run_mongo(self.db, args)
+        return started
+
+    async def execute(self, args):
+        loop = asyncio.get_running_loop()
+        if self.engine == 'mongodb':
+            return await loop.run_in_executor(self.pool, self._run_mongo, args)
+        conn = await self.conns.acquire()
+        try:
+            return await loop.run_in_executor(self.pool, self._run_pg, conn, args)
+        finally:
+            self.conns.release(conn)
+
+    async def close(self):
+        self.pool.shutdown()
+        for conn in self.conns.idle if self.conns else ():
+            conn.close()
+        if self.client is not None:
+            self.client.close()
+
+
+class AsyncBackend:
+    """Native asyncio drivers: `connections` asyncpg connections / AsyncMongoClient sockets"""
+
+    name = 'async'
+
+    def __init__(self, engine, workload, connections):
+        self.engine = engine
+        self.workload = workload
+        self.connections = connections
+        self.conns = None
+        self.client = None
+
+    async def open(self):
+        if self.engine == 'postgresql':
+            self.conns = ConnectionPool(
+                await asyncio.gather(*[get_pg_connection_async() for _ in range(self.connections)]))
+        else:
+            self.client, self.db = get_mongo_connection_async(self.connections)
+
+    async def execute(self, args):
+        if self.engine == 'mongodb':
+            started = time.perf_counter()
+            await self.workload.run_mongo_async(self.db, args)
+            return started
+        conn = await self.conns.acquire()
+        try:
+            started = time.perf_counter()
+            await self.workload.run_pg_async(conn, args)
+            return started
+        finally:
+            self.conns.release(conn)
+
+    async def close(self):
+        for conn in self.conns.idle if self.conns else ():
+            await conn.close()
+        if self.client is not None:
+            await self.client.close()
+
+BACKENDS = {'sync': SyncBackend, 'async': AsyncBackend}
+
+
+def _keys(rng, counts, seed, distribution):
+    return dict(time_windows(),
+                user=lambda: sample_id(distribution, rng, counts['users'], seed),
+                product=lambda: sample_id(distribution, rng, counts['products'], seed))
+
+
+async def open_loop(backend, workload, qps, duration, schedule, counts, seed=0, distribution='uniform'):
+    """Drive backend at qps for duration seconds; latency from the intended start time"""
+    keys = _keys(random.Random(seed), counts, seed, distribution)
+    latency, service, dispatch_lag = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    outcome = {'completed': 0, 'errors': 0}
+    loop = asyncio.get_running_loop()
+
+    async def request(intended, args):
+        try:
+            started = await backend.execute(args)
+        except Exception:
+            outcome['errors'] += 1
+            return
+        done = time.perf_counter()
+        latency.record_seconds(done - intended)
+        service.record_seconds(done - started)
+        outcome['completed'] += 1
+
+    offsets = arrival_offsets(qps, duration, schedule, seed)
+    start = time.perf_counter() + 0.1
+    tasks = []
+    for offset in offsets:
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        dispatch_lag.record_seconds(max(0.0, time.perf_counter() - intended))
+        tasks.append(loop.create_task(request(intended, workload.args(keys))))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'target_qps': qps,
+        'schedule': schedule,
+        'requests': len(offsets),
+        'completed': outcome['completed'],
+        'errors': outcome['errors'],
+        'achieved_qps': round(outcome['completed'] / elapsed, 2) if elapsed > 0 else None,
+        'latency': latency.summary_ms(),
+        'service_time': service.summary_ms(),
+        'dispatch_lag_p99_ms': dispatch_lag.summary_ms()['p99'],
+        'histograms': {'latency': latency.to_dict(), 'service_time': service.to_dict()},
+    }
+
+async def run_open_loop(backend_name, engine, workload, qps, duration, schedule, connections, counts,
+                        seed=0, distribution='uniform'):
+    backend = BACKENDS[backend_name](engine, workload, connections)
+    await backend.open()
+    try:
+        return await open_loop(backend, workload, qps, duration, schedule, counts, seed, distribution)
+    finally:
+        await backend.close()
+
+async def closed_loop(backend, workload, concurrency, duration, counts, seed=0, distribution='uniform'):
+    """`concurrency` requests always in flight for duration seconds; throughput + latency"""
+    latency, service = LatencyHistogram(), LatencyHistogram()
+    outcome = {'completed': 0, 'errors': 0}
+    deadline = time.perf_counter() + duration
+
+    async def worker(index):
+        keys = _keys(random.Random(f"{seed}-{index}"), counts, seed, distribution)
+        while time.perf_counter() < deadline:
+            sent = time.perf_counter()
+            try:
+                started = await backend.execute(workload.args(keys))
+            except Exception:
+                outcome['errors'] += 1
+                continue
+            done = time.perf_counter()
+            latency.record_seconds(done - sent)
+            service.record_seconds(done - started)
+            outcome['completed'] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(index) for index in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        'concurrency': concurrency,
+        'completed': outcome['completed'],
+        'errors': outcome['errors'],
+        'throughput': round(outcome['completed'] / elapsed, 2) if elapsed > 0 else None,
+        'latency': latency.summary_ms(),
+        'service_time': service.summary_ms(),
+        'histograms': {'latency': latency.to_dict(), 'service_time': service.to_dict()},
+    }
+
+async def run_closed_loop(backend_name, engine, workload, concurrency, duration, connections, counts,
+                          seed=0, distribution='uniform'):
+    backend = BACKENDS[backend_name](engine, workload, connections)
+    await backend.open()
+    try:
+        return await closed_loop(backend, workload, concurrency, duration, counts, seed, distribution)
+    finally:
+        await backend.close()
@@ -0,0 +1,180 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_pg_connection, hash_unit, PG_HOST, PG_PORT, PG_DATABASE
+from schema import schema_statements
+from loaders import load_pg_table
+from dataset_cache import generate_table_rows, load_table_columns
+from columnar import hash_unit_array
+
+# Sharding PostgreSQL in client, peste N instante locale
+#
+# users, orders, order_items si reviews sunt distribuite dupa hash(user_id):
+# un user ajunge pe un singur shard impreuna cu comenzile, item-urile si
+# recenziile lui, deci JOIN-urile si FK-urile raman locale. order_items nu are
+# user_id - urmeaza shard-ul comenzii. categories si products sunt tabele de
+# referinta, copiate pe fiecare shard.
+#
+# Interogarile cu user_id merg direct pe shard-ul lui; restul ruleaza in
+# paralel pe toate shard-urile (scatter-gather) si se combina in client.
+#
+# Instantele vin din PG_SHARDS="host:port,host:port,..." (baza
+# <PG_DATABASE>_shard pe fiecare); fara PG_SHARDS shard-urile sunt baze
+# separate <PG_DATABASE>_shard<i> pe serverul din PG_HOST / PG_PORT.
+
+SHARDED_TABLES = ['users', 'orders', 'order_items', 'reviews']
+REPLICATED_TABLES = ['categories', 'products']
+# Coloana cu user_id; order_items se rezolva prin order_id
+SHARD_COLUMNS = {'users': 'id', 'orders': 'user_id', 'reviews': 'user_id'}
+
+
+def shard_of(user_id, shards):
+    """Shard index of a user (stable across runs and processes)"""
+    return int(hash_unit(0, 'user_shard', user_id) * shards)
+
+def shard_of_array(user_ids, shards):
+    """Vectorized shard_of (int8, so at most 127 shards)"""
+    return (hash_unit_array(0, 'user_shard', user_ids) * shards).astype(np.int8)
+
+def shard_instances(shards):
+    """[{'host', 'port', 'database'}] for `shards` shards"""
+    spec = os.getenv('PG_SHARDS')
+    if not spec:
+        return [{'host': PG_HOST, 'port': PG_PORT, 'database': f"{PG_DATABASE}_shard{i}"}
+                for i in range(shards)]
+    hosts = [entry.strip() for entry in spec.split(',') if entry.strip()]
+    if len(hosts) < shards:
+        raise ValueError(f"PG_SHARDS are {len(hosts)} instante, cerute {shards}")
+    instances = []
+    for entry in hosts[:shards]:
+        host, _, port = entry.partition(':')
+        instances.append({'host': host, 'port': int(port or PG_PORT), 'database': f"{PG_DATABASE}_shard"})
+    return instances
+
+def _connect(instance, database=None):
+    return get_pg_connection(database or instance['database'], instance['host'], instance['port'])
+
+def create_shards(shards):
+    """(Re)create every shard database and its schema; returns the instances"""
+    instances = shard_instances(shards)
+    for instance in instances:
+        admin = _connect(instance, 'postgres')
+        admin.autocommit = True  # CREATE / DROP DATABASE nu merg in tranzactie
+        cursor = admin.cursor()
+        cursor.execute(f'DROP DATABASE IF EXISTS "{instance["database"]}"')
+        cursor.execute(f'CREATE DATABASE "{instance["database"]}"')
+        cursor.close()
+        admin.close()
+
+        conn = _connect(instance)
+        cursor = conn.cursor()
+        for sql in schema_statements():
+            cursor.execute(sql)
+        # Schema insereaza categoriile implicite; vin din dataset, ca la populare
+        cursor.execute("DELETE FROM categories")
+        conn.commit()
+        cursor.close()
+        conn.close()
+    return instances
+
+def _order_shards(path, shards):
+    """Shard of every order: int8 array indexed by order_id, built from the cached columns"""
+    size = max(int(chunk['id'].max()) for chunk in load_table_columns(path, 'orders')) + 1
+    owners = np.full(size, -1, dtype=np.int8)
+    for chunk in load_table_columns(path, 'orders'):
+        owners[chunk['id']] = shard_of_array(chunk['user_id'], shards)
+    return owners
+
+def _shard_rows(chunks, table, shard, shards, order_shards):
+    for chunk in chunks:
+        if table == 'order_items':
+            yield [row for row in chunk if order_shards[row['order_id']] == shard]
+        else:
+            column = SHARD_COLUMNS[table]
+            yield [row for row in chunk if shard_of(row[column], shards) == shard]
+
+def _load_shard(instance, shard, shards, path, counts, seed, order_shards):
+    conn = _connect(instance)
+    stats = {}
+    # Ordinea din REPLICATED_TABLES + SHARDED_TABLES respecta FK-urile
+    for table in REPLICATED_TABLES + SHARDED_TABLES:
+        chunks = generate_table_rows(path, table, counts, seed)
+        if table in SHARDED_TABLES:
+            chunks = _shard_rows(chunks, table, shard, shards, order_shards)
+        stats[table] = load_pg_table(conn, table, chunks)['rows']
+    cursor = conn.cursor()
+    cursor.execute("ANALYZE")
+    cursor.close()
+    conn.commit()
+    conn.close()
+    return stats
+
+def load_shards(instances, path, counts, seed):
+    """Load the cached dataset into the shards in parallel; rows per shard and table"""
+    order_shards = _order_shards(path, len(instances))
+    with ThreadPoolExecutor(max_workers=len(instances)) as pool:
+        futures = [pool.submit(_load_shard, instance, i, len(instances), path, counts, seed, order_shards)
+                   for i, instance in enumerate(instances)]
+        return [future.result() for future in futures]
+
+# --- router -------------------------------------------------------------------
+
+def merge_groups(results, keys=1, ops=('sum',)):
+    """Combine per-shard GROUP BY rows: the first `keys` columns are the group
+
+    ops gives one of 'sum', 'min', 'max' per remaining column; an average
+    has to be sent as SUM and COUNT and divided after the merge.
+    """
+    combine = {'sum': lambda a, b: a + b, 'min': min, 'max': max}
+    merged = {}
+    for rows in results:
+        for row in rows:
+            key, values = tuple(row[:keys]), list(row[keys:])
+            if key in merged:
+                merged[key] = [combine[op](a, b) for op, a, b in zip(ops, merged[key], values)]
+            else:
+                merged[key] = values
+    return [list(key) + values for key, values in merged.items()]
+
+class ShardRouter:
+    """One connection per shard; routes by user_id or scatters to all shards"""
+
+    def __init__(self, instances):
+        self.instances = instances
+        self.connections = [_connect(instance) for instance in instances]
+        self.pool = ThreadPoolExecutor(max_workers=len(instances))
+
+    @property
+    def shards(self):
+        return len(self.connections)
+
+    def shard_of(self, user_id):
+        return shard_of(user_id, self.shards)
+
+    def _run(self, shard, sql, params):
+        cursor = self.connections[shard].cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def query(self, user_id, sql, params=()):
+        """Single-shard query on the shard that owns user_id"""
+        return self._run(self.shard_of(user_id), sql, params)
+
+    def scatter(self, sql, params=()):
+        """Run sql on every shard in parallel; list of per-shard results"""
+        futures = [self.pool.submit(self._run, shard, sql, params) for shard in range(self.shards)]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self.pool.shutdown()
+        for conn in self.connections:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
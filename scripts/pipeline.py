@@ -0,0 +1,121 @@
+import time
+import queue
+import threading
+
+from loaders import load_pg_table, load_mongo_collection, MONGO_BATCH_SIZE
+
+# Pipeline producator/consumator pentru incarcare
+#
+# Un thread producator consuma generatorul de chunk-uri (care poate folosi
+# procese) si pune fiecare chunk in cate o coada limitata pentru PostgreSQL
+# si MongoDB. Cand o coada e plina producatorul asteapta (backpressure), deci
+# in memorie stau cel mult 2 * QUEUE_DEPTH chunk-uri per tabel.
+
+QUEUE_DEPTH = 4
+_DONE = object()
+
+
+class _Stage:
+    """Counters for one queue: depth samples and time the producer waited"""
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.queue = queue.Queue(maxsize=depth)
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+        self.blocked_s = 0.0
+
+    def put(self, item, failed):
+        depth = self.queue.qsize()
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+        start = time.perf_counter()
+        while True:
+            try:
+                self.queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                if failed.is_set():
+                    raise RuntimeError(f"Consumatorul {self.name} a esuat")
+        self.blocked_s += time.perf_counter() - start
+
+    def chunks(self):
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def metrics(self):
+        return {
+            'queue_depth_max': self.depth_max,
+            'queue_depth_avg': round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0,
+            'producer_blocked_s': round(self.blocked_s, 3)
+        }
+
+
+def run_table_pipeline(table, chunks, pg_conn_factory, db, pg_method='copy',
+                       batch_size=MONGO_BATCH_SIZE, depth=QUEUE_DEPTH):
+    """Load one table into both databases from a single pass over `chunks`
+
+    Returns per-stage metrics: generation throughput, PostgreSQL and MongoDB
+    loader throughput, and queue depth / backpressure for each queue.
+    """
+    stages = {'postgresql': _Stage('postgresql', depth), 'mongodb': _Stage('mongodb', depth)}
+    failed = threading.Event()
+    results = {}
+
+    def consume(name, load):
+        try:
+            results[name] = load(stages[name].chunks())
+        except BaseException as e:
+            failed.set()
+            results[name] = e
+            for _ in stages[name].chunks():  # goleste coada ca producatorul sa nu ramana blocat
+                pass
+
+    def load_pg(chunks):
+        conn = pg_conn_factory()
+        try:
+            return load_pg_table(conn, table, chunks, pg_method)
+        finally:
+            conn.close()
+
+    consumers = [
+        threading.Thread(target=consume, args=('postgresql', load_pg)),
+        threading.Thread(target=consume, args=(
+            'mongodb', lambda chunks: load_mongo_collection(db, table, chunks, batch_size))),
+    ]
+    for consumer in consumers:
+        consumer.start()
+
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in chunks:
+            rows += len(chunk)
+            for stage in stages.values():
+                stage.put(chunk, failed)
+    finally:
+        for stage in stages.values():
+            stage.queue.put(_DONE)
+        for consumer in consumers:
+            consumer.join()
+    elapsed = time.perf_counter() - start
+
+    for result in results.values():
+        if isinstance(result, BaseException):
+            raise result
+
+    blocked = max(stage.blocked_s for stage in stages.values())
+    generation_s = max(elapsed - blocked, 1e-9)
+    metrics = {
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'generation_rows_per_s': round(rows / generation_s)
+    }
+    for name, stage in stages.items():
+        metrics[name] = dict(results[name], **stage.metrics())
+    return metrics
@@ -0,0 +1,154 @@
+import os
+import re
+import time
+from datetime import datetime
+
+# Schema PostgreSQL din schemas/
+#
+# postgresql_schema.sql e sursa DDL-ului: tabele, indexi, view-uri.
+# postgresql_partitioned.sql contine variantele partitionate ale unor tabele;
+# cu partitioned=True fiecare CREATE TABLE de acolo inlocuieste pe loc
+# definitia cu acelasi nume, restul fisierului ramane neschimbat.
+# Modul nu importa utils (utils citeste indexii de aici).
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'schemas')
+PG_SCHEMA_FILE = os.path.join(SCHEMA_DIR, 'postgresql_schema.sql')
+PG_PARTITIONED_FILE = os.path.join(SCHEMA_DIR, 'postgresql_partitioned.sql')
+PG_MATERIALIZED_FILE = os.path.join(SCHEMA_DIR, 'postgresql_materialized.sql')
+
+# Tabele partitionate lunar dupa created_at; o comanda si item-urile ei
+# ajung in aceeasi luna
+PARTITIONED_TABLES = ['orders', 'order_items']
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE (?:IF NOT EXISTS )?(\w+)", re.I)
+_CREATE_INDEX = re.compile(r"CREATE (?:UNIQUE )?INDEX (?:IF NOT EXISTS )?(\w+) ON (\w+)", re.I)
+_CREATE_VIEW = re.compile(r"CREATE (?:OR REPLACE )?VIEW (\w+)", re.I)
+
+
+def sql_statements(path):
+    """Statements of a .sql file (comment lines dropped, split on ';')
+
+    A ';' inside a $$ ... $$ function body does not end the statement.
+    """
+    with open(path) as f:
+        text = ''.join(line for line in f if not line.strip().startswith('--'))
+    statements, current = [], ''
+    for piece in text.split(';'):
+        current = current + ';' + piece if current else piece
+        if current.count('$$') % 2 == 0:
+            statements.append(current.strip())
+            current = ''
+    if current.strip():
+        statements.append(current.strip())
+    return [stmt for stmt in statements if stmt]
+
+def pg_indexes(tables, path=PG_SCHEMA_FILE):
+    """{index name: CREATE INDEX statement} for indexes on `tables`"""
+    indexes = {}
+    for stmt in sql_statements(path):
+        m = _CREATE_INDEX.match(stmt)
+        if m and m.group(2) in tables:
+            indexes[m.group(1)] = stmt
+    return indexes
+
+def schema_statements(partitioned=False, indexes=True):
+    """DDL statements to run in order, optionally with the partitioned overlay"""
+    statements = sql_statements(PG_SCHEMA_FILE)
+    if partitioned:
+        # Fiecare CREATE TABLE din overlay aduce dupa el partitiile lui
+        defined = {_CREATE_TABLE.match(s).group(1) for s in statements if _CREATE_TABLE.match(s)}
+        overlay, current = {}, None
+        for stmt in sql_statements(PG_PARTITIONED_FILE):
+            m = _CREATE_TABLE.match(stmt)
+            if m and m.group(1) in defined:
+                current = m.group(1)
+            overlay.setdefault(current, []).append(stmt)
+        merged = []
+        for stmt in statements:
+            m = _CREATE_TABLE.match(stmt)
+            merged.extend(overlay.get(m.group(1), [stmt]) if m else [stmt])
+        statements = merged
+    if not indexes:
+        statements = [s for s in statements if not _CREATE_INDEX.match(s)]
+    return statements
+
+def schema_objects():
+    """(tables, views) created by the schema file, in creation order"""
+    statements = sql_statements(PG_SCHEMA_FILE)
+    tables = [m.group(1) for m in map(_CREATE_TABLE.match, statements) if m]
+    views = [m.group(1) for m in map(_CREATE_VIEW.match, statements) if m]
+    return tables, views
+
+# --- partitii -----------------------------------------------------------------
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1)
+
+def _next_month(value):
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+def month_partitions(start, end):
+    """[(suffix, lower, upper)] - one month per entry, covering [start, end]"""
+    months = []
+    lower = _month_start(start)
+    while lower <= end:
+        upper = _next_month(lower)
+        months.append((f"y{lower.year}m{lower.month:02d}", lower, upper))
+        lower = upper
+    return months
+
+def create_month_partitions(cursor, table, start, end):
+    """CREATE TABLE ... PARTITION OF for every month in [start, end]"""
+    names = []
+    for suffix, lower, upper in month_partitions(start, end):
+        name = f"{table}_{suffix}"
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')")
+        names.append(name)
+    return names
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+                   (table,))
+    return cursor.fetchone()[0]
+
+def list_partitions(cursor, table):
+    """[(partition name, bound expression)] of a partitioned table"""
+    cursor.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+    """, (table,))
+    return cursor.fetchall()
+
+def archive_month(conn, month):
+    """Move one month ('YYYY-MM') of orders/order_items out of the live tables
+
+    Partitioned tables: DETACH PARTITION, renamed to <table>_archive_<suffix>.
+    Regular tables: copy into <table>_archive_<suffix>, then DELETE.
+    Returns {'method', 'seconds', 'rows'}.
+    """
+    lower = datetime.strptime(month, '%Y-%m')
+    suffix, lower, upper = month_partitions(lower, lower)[0]
+    cursor = conn.cursor()
+    partitioned = is_partitioned(cursor, 'orders')
+    rows = 0
+    for table in PARTITIONED_TABLES:
+        cursor.execute(f"SELECT count(*) FROM {table} WHERE created_at >= %s AND created_at < %s", (lower, upper))
+        rows += cursor.fetchone()[0]
+    start = time.perf_counter()
+    # order_items inaintea orders - FK-ul din varianta nepartitionata
+    for table in reversed(PARTITIONED_TABLES):
+        archive = f"{table}_archive_{suffix}"
+        if partitioned:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_{suffix}")
+            cursor.execute(f"ALTER TABLE {table}_{suffix} RENAME TO {archive}")
+        else:
+            cursor.execute(f"CREATE TABLE {archive} AS SELECT * FROM {table} "
+                           f"WHERE created_at >= %s AND created_at < %s", (lower, upper))
+            cursor.execute(f"DELETE FROM {table} WHERE created_at >= %s AND created_at < %s", (lower, upper))
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    return {'method': 'detach' if partitioned else 'delete', 'seconds': round(elapsed, 3), 'rows': rows}
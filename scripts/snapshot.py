@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils import get_pg_connection, get_mongo_connection, PG_DATABASE, MONGO_DB, MONGO_INDEXES
+
+# Snapshot / restore pentru reset rapid intre rulari
+#
+# PostgreSQL: snapshot-ul e o baza separata creata cu CREATE DATABASE ...
+# TEMPLATE; restore = DROP + CREATE din snapshot (copie de fisiere, fara
+# reincarcare si fara reconstruirea indexilor).
+# MongoDB: fiecare colectie se copiaza pe server cu $out intr-o baza
+# separata. La restore $out inlocuieste atomic colectia si pastreaza indexii
+# existenti; o colectie disparuta se recreeaza cu MONGO_INDEXES.
+
+SNAPSHOT_SUFFIX = '_snapshot'
+
+
+def snapshot_names():
+    return PG_DATABASE + SNAPSHOT_SUFFIX, MONGO_DB + SNAPSHOT_SUFFIX
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def _pg_admin():
+    conn = get_pg_connection('postgres')
+    conn.autocommit = True  # CREATE / DROP DATABASE nu merg in tranzactie
+    return conn
+
+def _pg_clone(source, target):
+    """Replace database `target` with a copy of `source`; returns seconds"""
+    conn = _pg_admin()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    # Sursa si tinta nu pot avea alte conexiuni in timpul copierii
+    cursor.execute("""
+        SELECT pg_terminate_backend(pid) FROM pg_stat_activity
+        WHERE datname IN (%s, %s) AND pid <> pg_backend_pid()
+    """, (source, target))
+    cursor.execute(f'DROP DATABASE IF EXISTS "{target}"')
+    cursor.execute("SHOW server_version_num")
+    # FILE_COPY (PostgreSQL 15+) copiaza directorul direct, fara WAL per bloc
+    strategy = ' STRATEGY FILE_COPY' if int(cursor.fetchone()[0]) >= 150000 else ''
+    cursor.execute(f'CREATE DATABASE "{target}" TEMPLATE "{source}"{strategy}')
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    conn.close()
+    return round(elapsed, 3)
+
+def pg_snapshot_exists(name):
+    conn = _pg_admin()
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,))
+    exists = cursor.fetchone() is not None
+    cursor.close()
+    conn.close()
+    return exists
+
+def pg_drop(name):
+    conn = _pg_admin()
+    cursor = conn.cursor()
+    cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+    cursor.close()
+    conn.close()
+
+# --- MongoDB ----------------------------------------------------------------
+
+def _mongo_copy(client, source, target, name):
+    client[source][name].aggregate([{'$out': {'db': target, 'coll': name}}])
+
+def _mongo_clone(client, source, target, threads=4, indexes=None):
+    """Server-side copy of every collection in `source` into `target`
+
+    Collections missing from `source` are dropped from `target`. When
+    `indexes` is given, collections that did not exist in `target` get
+    them recreated ($out keeps indexes only on an existing collection).
+    """
+    start = time.perf_counter()
+    names = client[source].list_collection_names()
+    existing = set(client[target].list_collection_names())
+    for extra in existing - set(names):
+        client[target].drop_collection(extra)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(_mongo_copy, client, source, target, name) for name in names]:
+            future.result()
+    for name in set(names) - existing:
+        if indexes and indexes.get(name):
+            client[target][name].create_indexes(indexes[name])
+    return round(time.perf_counter() - start, 3)
+
+# --- API --------------------------------------------------------------------
+
+def save_snapshot(threads=4):
+    """Snapshot both databases; returns seconds per database"""
+    pg_snapshot, mongo_snapshot = snapshot_names()
+    client, _ = get_mongo_connection()
+    timings = {
+        'postgresql': _pg_clone(PG_DATABASE, pg_snapshot),
+        'mongodb': _mongo_clone(client, MONGO_DB, mongo_snapshot, threads)
+    }
+    client.close()
+    return timings
+
+def restore_snapshot(threads=4):
+    """Reset both databases to the last snapshot; returns seconds per database
+
+    All other connections to the PostgreSQL database are terminated.
+    """
+    pg_snapshot, mongo_snapshot = snapshot_names()
+    client, _ = get_mongo_connection()
+    if not pg_snapshot_exists(pg_snapshot) or mongo_snapshot not in client.list_database_names():
+        client.close()
+        raise RuntimeError("Nu exista snapshot - rulati 'snapshot.py save' (sau 3_populate_data.py --snapshot)")
+    timings = {
+        'postgresql': _pg_clone(pg_snapshot, PG_DATABASE),
+        'mongodb': _mongo_clone(client, mongo_snapshot, MONGO_DB, threads, MONGO_INDEXES)
+    }
+    client.close()
+    return timings
+
+def drop_snapshot():
+    pg_snapshot, mongo_snapshot = snapshot_names()
+    pg_drop(pg_snapshot)
+    client, _ = get_mongo_connection()
+    client.drop_database(mongo_snapshot)
+    client.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Snapshot / restore PostgreSQL + MongoDB")
+    parser.add_argument('action', choices=['save', 'restore', 'drop'])
+    parser.add_argument('--threads', type=int, default=4,
+                        help="colectii MongoDB copiate simultan")
+    args = parser.parse_args()
+
+    if args.action == 'drop':
+        drop_snapshot()
+        print("Snapshot sters")
+    else:
+        func = save_snapshot if args.action == 'save' else restore_snapshot
+        timings = func(args.threads)
+        print(f"{args.action}: PostgreSQL {timings['postgresql']}s, MongoDB {timings['mongodb']}s")
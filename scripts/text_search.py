@@ -0,0 +1,169 @@
+import re
+import json
+import time
+
+# Cautare text indexata (varianta indexata a lui Q6)
+#
+# Q6 cauta un subsir in products.name: LIKE '%Pro%' in PostgreSQL si $regex
+# cu 'i' in MongoDB - niciunul nu poate folosi un index B-tree, deci ambele
+# citesc tot tabelul. Variantele indexate:
+#   PostgreSQL - pg_trgm: index GIN pe name (gin_trgm_ops), folosit de
+#                LIKE / ILIKE cu subsir de minim 3 caractere; extensia e in
+#                contrib, deci e optionala
+#              - full-text: index GIN pe tsvector(name + description),
+#                potriveste cuvinte cu prefixul termenului ('pro:*'), nu
+#                subsiruri din mijlocul cuvantului
+#   MongoDB    - index text pe name + description ($text: doar cuvinte
+#                intregi, dupa stemming - fara prefix)
+#              - inlocuitor local pentru cautarea pe subsir (Atlas Search nu
+#                exista in MongoDB Community): campul name_trigrams cu
+#                trigramele numelui, index multikey, $all pe trigramele
+#                termenului si $regex pe candidatii ramasi
+
+TS_CONFIG = 'english'
+PG_TSVECTOR = (f"(setweight(to_tsvector('{TS_CONFIG}', coalesce(name, '')), 'A') || "
+               f"setweight(to_tsvector('{TS_CONFIG}', coalesce(description, '')), 'B'))")
+TRIGRAM_FIELD = 'name_trigrams'
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return round(time.perf_counter() - start, 3)
+
+def trigrams(text):
+    """Lower-case 3-grams of text (same as the MongoDB update pipeline)"""
+    text = text.lower()
+    return sorted({text[i:i + 3] for i in range(len(text) - 2)})
+
+def plan_indexes(plan):
+    """Index names used anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= plan_indexes(child)
+    return names
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def pg_trigram_available(conn):
+    """CREATE EXTENSION pg_trgm; False if the contrib package is missing"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+def pg_search_indexes(table='products', trigram=True):
+    """{index name: CREATE INDEX statement} for the search indexes of `table`"""
+    indexes = {}
+    if trigram:
+        indexes[f"idx_{table}_name_trgm"] = (
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_name_trgm ON {table} USING gin (name gin_trgm_ops)")
+    indexes[f"idx_{table}_fts"] = f"CREATE INDEX IF NOT EXISTS idx_{table}_fts ON {table} USING gin ({PG_TSVECTOR})"
+    return indexes
+
+def create_pg_search_indexes(conn, table='products'):
+    """Build the search indexes; returns {index: {'seconds', 'bytes'}}"""
+    trigram = pg_trigram_available(conn)
+    cursor = conn.cursor()
+    built = {}
+    for name, sql in pg_search_indexes(table, trigram).items():
+        seconds = _timed(lambda: cursor.execute(sql))
+        conn.commit()
+        cursor.execute("SELECT pg_relation_size(%s::regclass)", (name,))
+        built[name] = {'seconds': seconds, 'bytes': cursor.fetchone()[0]}
+    cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+    cursor.close()
+    return built
+
+def drop_pg_search_indexes(conn, table='products'):
+    cursor = conn.cursor()
+    for name in pg_search_indexes(table):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+    cursor.close()
+
+def prefix_tsquery(term):
+    """'Pro' -> 'pro:*' - every word of the term as a prefix, AND-ed"""
+    words = re.findall(r"\w+", term.lower())
+    return ' & '.join(f"{word}:*" for word in words)
+
+# (SQL, parametru din termen); {table} se completeaza la rulare
+PG_SEARCHES = {
+    'like': ("SELECT * FROM {table} WHERE name LIKE %s", lambda term: f"%{term}%"),
+    'ilike': ("SELECT * FROM {table} WHERE name ILIKE %s", lambda term: f"%{term}%"),
+    'fulltext': (f"SELECT * FROM {{table}} WHERE {PG_TSVECTOR} @@ to_tsquery('{TS_CONFIG}', %s)",
+                 lambda term: prefix_tsquery(term)),
+}
+
+def pg_search(cursor, strategy, term, table='products'):
+    sql, param = PG_SEARCHES[strategy]
+    cursor.execute(sql.format(table=table), (param(term),))
+    return cursor.fetchall()
+
+def pg_search_plan(cursor, strategy, term, table='products'):
+    """Index names the planner picks for a search (empty set = sequential scan)"""
+    sql, param = PG_SEARCHES[strategy]
+    cursor.execute("EXPLAIN (FORMAT JSON) " + sql.format(table=table), (param(term),))
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return sorted(plan_indexes(plan[0]['Plan']))
+
+# --- MongoDB ----------------------------------------------------------------
+
+def create_mongo_text_index(collection):
+    """Text index on name (weight 10) + description; returns seconds"""
+    return _timed(lambda: collection.create_index(
+        [('name', 'text'), ('description', 'text')],
+        weights={'name': 10, 'description': 1}, default_language=TS_CONFIG, name='products_text'))
+
+def create_mongo_trigrams(collection):
+    """Compute name_trigrams on the server (update pipeline) and index it; returns seconds"""
+    lower = {'$toLower': '$name'}
+    seconds = _timed(lambda: collection.update_many({}, [{'$set': {TRIGRAM_FIELD: {'$setUnion': [{'$map': {
+        'input': {'$range': [0, {'$max': [0, {'$subtract': [{'$strLenCP': lower}, 2]}]}]},
+        'as': 'i',
+        'in': {'$substrCP': [lower, '$$i', 3]},
+    }}, []]}}}]))
+    return seconds + _timed(lambda: collection.create_index(TRIGRAM_FIELD))
+
+def drop_mongo_search(collection):
+    for name in ('products_text', f"{TRIGRAM_FIELD}_1"):
+        if name in collection.index_information():
+            collection.drop_index(name)
+    collection.update_many({TRIGRAM_FIELD: {'$exists': True}}, {'$unset': {TRIGRAM_FIELD: ''}})
+
+def mongo_search_filter(strategy, term):
+    regex = {'name': {'$regex': re.escape(term), '$options': 'i'}}
+    if strategy == 'regex':
+        return regex
+    if strategy == 'text':
+        return {'$text': {'$search': term}}
+    if strategy == 'trigram':
+        # Termen sub 3 caractere -> fara trigrame, doar regex
+        grams = trigrams(term)
+        return dict(regex, **{TRIGRAM_FIELD: {'$all': grams}}) if grams else regex
+    raise ValueError(strategy)
+
+def mongo_search(collection, strategy, term):
+    return list(collection.find(mongo_search_filter(strategy, term)))
+
+def mongo_search_plan(collection, strategy, term):
+    """Stage names of the winning plan (COLLSCAN / IXSCAN / TEXT_MATCH ...)"""
+    explain = collection.database.command(
+        'explain', {'find': collection.name, 'filter': mongo_search_filter(strategy, term)},
+        verbosity='queryPlanner')
+    stages, plan = [], explain['queryPlanner']['winningPlan']
+    while plan:
+        stages.append(plan.get('stage'))
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+    return stages
@@ -0,0 +1,153 @@
+import json
+import time
+
+from pymongo import IndexModel
+
+from utils import CHUNK_SIZE
+from dataset_cache import generate_table_rows
+from loaders import load_pg_table, load_mongo_collection
+from text_search import plan_indexes
+
+# Workload-uri pe interval de timp (created_at) si variantele de index comparate
+#
+# Tabelele de test (schema / baza separata) primesc orders / reviews din
+# cache in ordinea lui created_at, ca un jurnal in care randurile se adauga
+# cronologic - conditia in care BRIN (un min/max per grup de pagini) ramane
+# selectiv.
+#   none       - doar cheia primara
+#   btree      - B-tree pe created_at (ce are schema acum)
+#   composite  - B-tree (user_id, created_at DESC) / (product_id, created_at DESC):
+#                egalitate pe prima coloana, interval + ORDER BY din index
+#   brin       - BRIN pe created_at; de ordinul KB, dar citeste blocuri intregi
+# MongoDB nu are BRIN; variantele lui sunt none, created_at si compound.
+# Query-urile sunt workload-urile cu tag-ul 'time' din workloads.py; ruleaza
+# pe tabelele din schema de benchmark prin search_path.
+
+TIME_TABLES = ['orders', 'reviews']
+BRIN_PAGES_PER_RANGE = 32
+
+# varianta -> {tabel: [(nume, CREATE INDEX)]}; {schema} se completeaza la rulare
+PG_TIME_INDEXES = {
+    'none': {},
+    'btree': {
+        'orders': [('orders_created_btree', "CREATE INDEX orders_created_btree ON {schema}.orders (created_at DESC)")],
+        'reviews': [('reviews_created_btree',
+                     "CREATE INDEX reviews_created_btree ON {schema}.reviews (created_at DESC)")],
+    },
+    'composite': {
+        'orders': [('orders_user_created', "CREATE INDEX orders_user_created ON {schema}.orders "
+                                           "(user_id, created_at DESC)")],
+        'reviews': [('reviews_product_created', "CREATE INDEX reviews_product_created ON {schema}.reviews "
+                                                "(product_id, created_at DESC)")],
+    },
+    'brin': {
+        'orders': [('orders_created_brin', "CREATE INDEX orders_created_brin ON {schema}.orders "
+                                           f"USING brin (created_at) WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})")],
+        'reviews': [('reviews_created_brin', "CREATE INDEX reviews_created_brin ON {schema}.reviews "
+                                             f"USING brin (created_at) WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})")],
+    },
+}
+
+MONGO_TIME_INDEXES = {
+    'none': {},
+    'created_at': {
+        'orders': [IndexModel([('created_at', -1)], name='orders_created')],
+        'reviews': [IndexModel([('created_at', -1)], name='reviews_created')],
+    },
+    'compound': {
+        'orders': [IndexModel([('user_id', 1), ('created_at', -1)], name='orders_user_created')],
+        'reviews': [IndexModel([('product_id', 1), ('created_at', -1)], name='reviews_product_created')],
+    },
+}
+
+
+def time_ordered_chunks(path, table, counts, seed, chunk_size=CHUNK_SIZE):
+    """Cached rows of table sorted by created_at, re-chunked"""
+    rows = sorted((row for chunk in generate_table_rows(path, table, counts, seed) for row in chunk),
+                  key=lambda row: row['created_at'])
+    return [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+# --- PostgreSQL -------------------------------------------------------------
+
+def pg_load_time_tables(conn, schema, chunks):
+    """<schema>.orders / reviews loaded in created_at order, primary key only
+
+    Leaves search_path at <schema>, public: the workloads' table names
+    resolve to the copies.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    for table in TIME_TABLES:
+        cursor.execute(f"CREATE TABLE {schema}.{table} (LIKE public.{table} INCLUDING DEFAULTS)")
+    # COPY <tabel> ajunge in schema de benchmark
+    cursor.execute(f"SET search_path TO {schema}, public")
+    conn.commit()
+    for table in TIME_TABLES:
+        load_pg_table(conn, table, chunks[table])
+        cursor.execute(f"ALTER TABLE {schema}.{table} ADD PRIMARY KEY (id)")
+        cursor.execute(f"ANALYZE {schema}.{table}")
+    conn.commit()
+    cursor.close()
+
+def pg_correlation(conn, schema, table):
+    """pg_stats.correlation of created_at (1.0 = physical order == time order)"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT correlation FROM pg_stats WHERE schemaname = %s AND tablename = %s "
+                   "AND attname = 'created_at'", (schema, table))
+    row = cursor.fetchone()
+    cursor.close()
+    return round(row[0], 4) if row and row[0] is not None else None
+
+def pg_apply_variant(conn, schema, variant):
+    """Drop the previous variant's indexes, build this one's; {index: {'seconds', 'bytes'}}"""
+    cursor = conn.cursor()
+    for indexes in PG_TIME_INDEXES.values():
+        for table_indexes in indexes.values():
+            for name, _ in table_indexes:
+                cursor.execute(f"DROP INDEX IF EXISTS {schema}.{name}")
+    conn.commit()
+    built = {}
+    for table, table_indexes in PG_TIME_INDEXES[variant].items():
+        for name, sql in table_indexes:
+            start = time.perf_counter()
+            cursor.execute(sql.format(schema=schema))
+            conn.commit()
+            seconds = round(time.perf_counter() - start, 4)
+            cursor.execute("SELECT pg_relation_size(%s::regclass)", (f"{schema}.{name}",))
+            built[name] = {'seconds': seconds, 'bytes': cursor.fetchone()[0]}
+        cursor.execute(f"ANALYZE {schema}.{table}")
+    conn.commit()
+    cursor.close()
+    return built
+
+def pg_time_plan(cursor, workload, keys):
+    """(index names used, shared blocks touched) of one workload"""
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + workload.sql, workload.args(keys))
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]['Plan']
+    return sorted(plan_indexes(plan)), plan.get('Shared Hit Blocks', 0) + plan.get('Shared Read Blocks', 0)
+
+# --- MongoDB ----------------------------------------------------------------
+
+def mongo_load_time_collections(db, chunks):
+    for table in TIME_TABLES:
+        db[table].drop()
+        load_mongo_collection(db, table, chunks[table])
+
+def mongo_apply_variant(db, variant):
+    """Drop the previous variant's indexes, build this one's; {index: {'seconds', 'bytes'}}"""
+    for table in TIME_TABLES:
+        db[table].drop_indexes()
+    built = {}
+    for table, models in MONGO_TIME_INDEXES[variant].items():
+        start = time.perf_counter()
+        db[table].create_indexes(models)
+        seconds = round(time.perf_counter() - start, 4)
+        sizes = db.command('collStats', table).get('indexSizes', {})
+        for model in models:
+            name = model.document['name']
+            built[name] = {'seconds': seconds, 'bytes': sizes.get(name)}
+    return built
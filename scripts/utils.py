@@ -2,11 +2,19 @@ import os
 import time
 import json
 import random
+import hashlib
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import pg8000
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel
 from faker import Faker
+from distributions import DEFAULT_DISTRIBUTIONS, parse_distribution, sample_id
+from schema import pg_indexes
 
 load_dotenv()
 
@@ -20,16 +28,27 @@ PG_DATABASE = os.getenv('PG_DATABASE', 'comparison_db')
 MONGO_URI = os.getenv('MONGO_URI')
 MONGO_DB = os.getenv('MONGO_DB', 'comparison_db')
 
-fake = Faker()
-Faker.seed(42)  
-random.seed(42)
+TABLES = ['categories', 'users', 'products', 'orders', 'order_items', 'reviews']
+
 # PostgreSQL Functions
 
-def get_pg_connection(database=None):
+def get_pg_connection(database=None, host=None, port=None):
     """Get PostgreSQL connection"""
     return pg8000.connect(
-        host=PG_HOST,
-        port=PG_PORT,
+        host=host or PG_HOST,
+        port=port or PG_PORT,
+        user=PG_USER,
+        password=PG_PASSWORD,
+        database=database or PG_DATABASE
+    )
+
+async def get_pg_connection_async(database=None, host=None, port=None):
+    """Get PostgreSQL connection (asyncpg, for the asyncio benchmarks)"""
+    # asyncpg e necesar doar benchmark-urilor async
+    import asyncpg
+    return await asyncpg.connect(
+        host=host or PG_HOST,
+        port=port or PG_PORT,
         user=PG_USER,
         password=PG_PASSWORD,
         database=database or PG_DATABASE
@@ -49,10 +68,32 @@ def test_pg_connection():
         return False, str(e)
 
 
+# Indexi secundari - din schemas/postgresql_schema.sql, creati de scripturile de
+# setup sau, in modul deferred, abia dupa incarcarea datelor
+# (3_populate_data.py --index-mode deferred)
+PG_INDEXES = pg_indexes(TABLES)
+
+MONGO_INDEXES = {
+    'categories': [IndexModel('name', unique=True)],
+    'users': [IndexModel('username', unique=True), IndexModel('email', unique=True)],
+    'products': [IndexModel('sku', unique=True), IndexModel('category_id'), IndexModel('price')],
+    'orders': [IndexModel('order_number', unique=True), IndexModel('user_id'), IndexModel('status')],
+    'order_items': [IndexModel('order_id'), IndexModel('product_id')],
+    'reviews': [IndexModel('product_id'), IndexModel('user_id')],
+}
+
 # MongoDB Functions
-def get_mongo_connection():
-    """Get MongoDB connection"""
-    client = MongoClient(MONGO_URI)
+def get_mongo_connection(max_pool_size=None):
+    """Get MongoDB connection (max_pool_size caps concurrent operations; default 100)"""
+    client = MongoClient(MONGO_URI, **({'maxPoolSize': max_pool_size} if max_pool_size else {}))
+    db = client[MONGO_DB]
+    return client, db
+
+def get_mongo_connection_async(max_pool_size=None):
+    """Get MongoDB connection (pymongo AsyncMongoClient)"""
+    # AsyncMongoClient exista doar in pymongo >= 4.9; necesar doar benchmark-urilor async
+    from pymongo import AsyncMongoClient
+    client = AsyncMongoClient(MONGO_URI, **({'maxPoolSize': max_pool_size} if max_pool_size else {}))
     db = client[MONGO_DB]
     return client, db
 
@@ -68,6 +109,102 @@ def test_mongo_connection():
         return False, str(e)
 
 # Data Generation - IDENTICE pentru ambele baze
+#
+# Generatorii sunt lazy: produc randuri in chunk-uri de CHUNK_SIZE, fiecare
+# chunk cu seed propriu derivat din (seed, tabel, index chunk). Astfel
+# memoria ramane constanta indiferent de scale factor, iar PostgreSQL si
+# MongoDB primesc exact acelasi dataset.
+
+SEED = int(os.getenv('DATA_SEED', 42))
+# Se incrementeaza la orice schimbare care modifica datele generate
+GENERATOR_VERSION = 2
+CHUNK_SIZE = 10000
+DATASET_EPOCH = datetime(2026, 1, 15)
+
+# Numar de randuri la scale factor 1 (datasetul original din raport)
+BASE_ROW_COUNTS = {'users': 100, 'products': 200, 'orders': 150, 'reviews': 80}
+MAX_ITEMS_PER_ORDER = 4
+# Comenzile sunt din ultimele ORDER_HISTORY_DAYS zile inainte de DATASET_EPOCH
+ORDER_HISTORY_DAYS = 90
+
+TABLE_COLUMNS = {
+    'categories': ['id', 'name', 'description'],
+    'users': ['id', 'username', 'email', 'first_name', 'last_name', 'phone',
+              'address', 'city', 'country', 'created_at'],
+    'products': ['id', 'sku', 'name', 'description', 'category_id', 'price',
+                 'stock_quantity', 'rating', 'review_count', 'created_at'],
+    'orders': ['id', 'order_number', 'user_id', 'status', 'total_amount',
+               'shipping_address', 'shipping_city', 'shipping_country',
+               'payment_method', 'payment_status', 'created_at'],
+    'order_items': ['id', 'order_id', 'product_id', 'quantity', 'unit_price', 'total_price',
+                    'created_at'],
+    'reviews': ['id', 'product_id', 'user_id', 'rating', 'title', 'comment',
+                'is_verified', 'created_at'],
+}
+
+ORDER_STATUSES = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
+PAYMENT_METHODS = ['credit_card', 'debit_card', 'paypal', 'bank_transfer']
+PAYMENT_STATUSES = ['pending', 'paid', 'refunded']
+
+_MASK64 = (1 << 64) - 1
+_thread_state = threading.local()
+
+
+def get_row_counts(scale_factor=1, distributions=None):
+    """Row counts for a TPC-style scale factor (categories stay fixed)
+
+    counts['distributions'] carries the key distributions (see
+    distributions.py) so every chunk function draws foreign keys the same way.
+    """
+    counts = {'categories': len(generate_categories())}
+    for table, base in BASE_ROW_COUNTS.items():
+        counts[table] = max(1, int(round(base * scale_factor)))
+    counts['distributions'] = dict(DEFAULT_DISTRIBUTIONS, **(distributions or {}))
+    for spec in counts['distributions'].values():
+        parse_distribution(spec)
+    return counts
+
+def _distribution(counts, name):
+    return counts.get('distributions', DEFAULT_DISTRIBUTIONS)[name]
+
+def derive_seed(seed, *labels):
+    """Stable 64-bit seed for (seed, labels) - same value in every process"""
+    key = ':'.join(str(part) for part in (seed,) + labels).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+@lru_cache(maxsize=None)
+def _label_seed(seed, label):
+    return derive_seed(seed, label)
+
+def hash_unit(seed, label, i):
+    """Deterministic float in [0, 1) for row i (splitmix64)"""
+    x = (_label_seed(seed, label) + i * 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    x ^= x >> 31
+    return (x >> 11) * 2.0 ** -53
+
+def product_price(product_id, seed=SEED):
+    """Product price derived from its id, so order_items need no product list"""
+    return round(9.99 + hash_unit(seed, 'product_price', product_id) * 490.0, 2)
+
+def order_created_at(order_id, seed=SEED):
+    """Order timestamp derived from its id; order_items repeat it (partition key)"""
+    offset = int(hash_unit(seed, 'order_created_at', order_id) * ORDER_HISTORY_DAYS * 86400)
+    return DATASET_EPOCH - timedelta(seconds=86400 + offset)
+
+def _chunk_random(seed, table, chunk_index):
+    """Fresh (random, Faker) pair seeded for one chunk"""
+    chunk_seed = derive_seed(seed, table, chunk_index)
+    fake = getattr(_thread_state, 'fake', None)
+    if fake is None:
+        fake = _thread_state.fake = Faker()
+    fake.seed_instance(chunk_seed)
+    return random.Random(chunk_seed), fake
+
+def _chunk_bounds(chunk_index, count):
+    start = chunk_index * CHUNK_SIZE + 1
+    return start, min(start + CHUNK_SIZE, count + 1)
 
 def generate_categories():
     """Generate categories - IDENTICE"""
@@ -82,12 +219,15 @@ def generate_categories():
         {'id': 8, 'name': 'Food', 'description': 'Food and beverages'},
     ]
 
-def generate_users(count=100):
-    """Generate users - IDENTICE"""
-    Faker.seed(42)
-    random.seed(42)
+def categories_chunk(chunk_index, counts, seed=SEED):
+    return generate_categories()
+
+def users_chunk(chunk_index, counts, seed=SEED):
+    """One chunk of users - IDENTICE"""
+    rng, fake = _chunk_random(seed, 'users', chunk_index)
+    start, end = _chunk_bounds(chunk_index, counts['users'])
     users = []
-    for i in range(1, count + 1):
+    for i in range(start, end):
         users.append({
             'id': i,
             'username': f"user_{i:04d}",
@@ -98,96 +238,215 @@ def generate_users(count=100):
             'address': fake.street_address()[:100],
             'city': fake.city()[:50],
             'country': fake.country()[:50],
-            'created_at': datetime.now() - timedelta(days=random.randint(1, 365))
+            'created_at': DATASET_EPOCH - timedelta(days=rng.randint(1, 365))
         })
     return users
 
-def generate_products(count=200):
-    """Generate products - IDENTICE"""
-    Faker.seed(42)
-    random.seed(42)
+def products_chunk(chunk_index, counts, seed=SEED):
+    """One chunk of products - IDENTICE"""
+    rng, fake = _chunk_random(seed, 'products', chunk_index)
+    start, end = _chunk_bounds(chunk_index, counts['products'])
     products = []
-    for i in range(1, count + 1):
+    for i in range(start, end):
         products.append({
             'id': i,
             'sku': f"SKU-{i:06d}",
             'name': fake.catch_phrase()[:100],
             'description': fake.text(max_nb_chars=200),
-            'category_id': random.randint(1, 8),
-            'price': round(random.uniform(9.99, 499.99), 2),
-            'stock_quantity': random.randint(0, 500),
-            'rating': round(random.uniform(1.0, 5.0), 2),
-            'review_count': random.randint(0, 200),
-            'created_at': datetime.now() - timedelta(days=random.randint(1, 365))
+            'category_id': rng.randint(1, 8),
+            'price': product_price(i, seed),
+            'stock_quantity': rng.randint(0, 500),
+            'rating': round(rng.uniform(1.0, 5.0), 2),
+            'review_count': rng.randint(0, 200),
+            'created_at': DATASET_EPOCH - timedelta(days=rng.randint(1, 365))
         })
     return products
 
-def generate_orders(users, count=150):
-    """Generate orders - IDENTICE"""
-    Faker.seed(42)
-    random.seed(42)
+def orders_chunk(chunk_index, counts, seed=SEED):
+    """One chunk of orders - IDENTICE"""
+    rng, fake = _chunk_random(seed, 'orders', chunk_index)
+    start, end = _chunk_bounds(chunk_index, counts['orders'])
     orders = []
-    statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
-    payment_methods = ['credit_card', 'debit_card', 'paypal', 'bank_transfer']
-    
-    for i in range(1, count + 1):
-        user = random.choice(users)
+    for i in range(start, end):
         orders.append({
             'id': i,
             'order_number': f"ORD-{i:08d}",
-            'user_id': user['id'],
-            'status': random.choice(statuses),
-            'total_amount': round(random.uniform(25.00, 500.00), 2),
+            'user_id': sample_id(_distribution(counts, 'user_activity'), rng, counts['users'], seed),
+            'status': rng.choice(ORDER_STATUSES),
+            'total_amount': round(rng.uniform(25.00, 500.00), 2),
             'shipping_address': fake.street_address()[:100],
             'shipping_city': fake.city()[:50],
             'shipping_country': fake.country()[:50],
-            'payment_method': random.choice(payment_methods),
-            'payment_status': random.choice(['pending', 'paid', 'refunded']),
-            'created_at': datetime.now() - timedelta(days=random.randint(1, 90))
+            'payment_method': rng.choice(PAYMENT_METHODS),
+            'payment_status': rng.choice(PAYMENT_STATUSES),
+            'created_at': order_created_at(i, seed)
         })
     return orders
 
-def generate_order_items(orders, products):
-    """Generate order items - IDENTICE"""
-    random.seed(42)
+def order_items_chunk(chunk_index, counts, seed=SEED):
+    """Items for one chunk of orders - IDENTICE
+
+    Item ids are (order_id - 1) * MAX_ITEMS_PER_ORDER + k, so every chunk
+    knows its ids without looking at the previous ones (ids have gaps).
+    """
+    rng, _ = _chunk_random(seed, 'order_items', chunk_index)
+    start, end = _chunk_bounds(chunk_index, counts['orders'])
     items = []
-    item_id = 1
-    
-    for order in orders:
-        num_items = random.randint(1, 4)
-        for _ in range(num_items):
-            product = random.choice(products)
-            qty = random.randint(1, 3)
+    for order_id in range(start, end):
+        num_items = rng.randint(1, MAX_ITEMS_PER_ORDER)
+        for k in range(num_items):
+            product_id = sample_id(_distribution(counts, 'product_popularity'),
+                                   rng, counts['products'], seed)
+            price = product_price(product_id, seed)
+            qty = rng.randint(1, 3)
             items.append({
-                'id': item_id,
-                'order_id': order['id'],
-                'product_id': product['id'],
+                'id': (order_id - 1) * MAX_ITEMS_PER_ORDER + k + 1,
+                'order_id': order_id,
+                'product_id': product_id,
                 'quantity': qty,
-                'unit_price': product['price'],
-                'total_price': round(qty * product['price'], 2)
+                'unit_price': price,
+                'total_price': round(qty * price, 2),
+                'created_at': order_created_at(order_id, seed)
             })
-            item_id += 1
     return items
 
-def generate_reviews(users, products, count=80):
-    """Generate reviews - IDENTICE"""
-    Faker.seed(42)
-    random.seed(42)
+def reviews_chunk(chunk_index, counts, seed=SEED):
+    """One chunk of reviews - IDENTICE"""
+    rng, fake = _chunk_random(seed, 'reviews', chunk_index)
+    start, end = _chunk_bounds(chunk_index, counts['reviews'])
     reviews = []
-    
-    for i in range(1, count + 1):
+    for i in range(start, end):
         reviews.append({
             'id': i,
-            'product_id': random.choice(products)['id'],
-            'user_id': random.choice(users)['id'],
-            'rating': random.randint(1, 5),
+            'product_id': sample_id(_distribution(counts, 'review_target'),
+                                    rng, counts['products'], seed),
+            'user_id': sample_id(_distribution(counts, 'user_activity'), rng, counts['users'], seed),
+            'rating': rng.randint(1, 5),
             'title': fake.sentence(nb_words=5)[:100],
             'comment': fake.text(max_nb_chars=200),
-            'is_verified': random.choice([True, False]),
-            'created_at': datetime.now() - timedelta(days=random.randint(1, 60))
+            'is_verified': rng.choice([True, False]),
+            'created_at': DATASET_EPOCH - timedelta(days=rng.randint(1, 60))
         })
     return reviews
 
+CHUNK_FUNCTIONS = {
+    'categories': categories_chunk,
+    'users': users_chunk,
+    'products': products_chunk,
+    'orders': orders_chunk,
+    'order_items': order_items_chunk,
+    'reviews': reviews_chunk,
+}
+
+def num_chunks(table, counts):
+    """Number of chunks a table is split into (order_items follow orders)"""
+    if table == 'categories':
+        return 1
+    rows = counts['orders'] if table == 'order_items' else counts[table]
+    return (rows + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+def fork_context():
+    """multiprocessing 'fork' context; None where fork does not exist (Windows)"""
+    # Scripturile nu au `if __name__ == '__main__'`: spawn / forkserver le-ar
+    # rula din nou in fiecare copil, deci fara fork nu se folosesc procese
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+_NO_FORK_WARNED = []
+
+def _warn_no_fork(workers):
+    if not _NO_FORK_WARNED:
+        _NO_FORK_WARNED.append(True)
+        print(f"  ATENTIE: fork indisponibil pe aceasta platforma - generare in procesul curent "
+              f"(workers={workers} ignorat)")
+
+def chunk_pool(workers):
+    """Process pool for map_chunks, forked right away (None for workers <= 1)
+
+    Create it in the main thread before opening any database client or
+    thread: forking a process that already runs MongoClient monitors or
+    loader threads can deadlock the children.
+    """
+    if workers <= 1:
+        return None
+    context = fork_context()
+    if context is None:
+        _warn_no_fork(workers)
+        return None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    pool.submit(int).result()  # cu fork toate procesele pornesc la primul submit
+    return pool
+
+def map_chunks(func, table, counts, seed=SEED, workers=1, pool=None):
+    """Yield func(chunk_index, counts, seed) for every chunk, in chunk order
+
+    Chunks are id-range shards with their own derived seed, so with
+    workers > 1 they are built in a process pool and the output stays
+    byte-identical whatever the worker count. At most 2 * workers chunks
+    are in flight, which keeps memory bounded. `pool` (see chunk_pool)
+    is used instead of forking a new pool for this table. Without fork
+    the chunks are built in-process.
+    """
+    indices = range(num_chunks(table, counts))
+    if pool is None and workers > 1 and fork_context() is None:
+        _warn_no_fork(workers)
+        workers = 1
+    if len(indices) <= 1 or (pool is None and workers <= 1):
+        for chunk_index in indices:
+            yield func(chunk_index, counts, seed)
+        return
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context()) as own_pool:
+            yield from _ordered_results(own_pool, func, indices, counts, seed, workers)
+    else:
+        yield from _ordered_results(pool, func, indices, counts, seed, workers)
+
+def _ordered_results(pool, func, indices, counts, seed, workers):
+    pending = deque()
+    for chunk_index in indices:
+        pending.append(pool.submit(func, chunk_index, counts, seed))
+        if len(pending) >= 2 * max(workers, 1):
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def generate_table(table, counts, seed=SEED, workers=1, pool=None):
+    """Lazy generator yielding one table chunk by chunk"""
+    return map_chunks(CHUNK_FUNCTIONS[table], table, counts, seed, workers, pool)
+
+def generate_users(count=100, seed=SEED):
+    """Generate users in chunks - IDENTICE"""
+    return generate_table('users', {'users': count}, seed)
+
+def generate_products(count=200, seed=SEED):
+    """Generate products in chunks - IDENTICE"""
+    return generate_table('products', {'products': count}, seed)
+
+def generate_orders(count=150, user_count=100, seed=SEED):
+    """Generate orders in chunks - IDENTICE"""
+    return generate_table('orders', {'orders': count, 'users': user_count}, seed)
+
+def generate_order_items(order_count=150, product_count=200, seed=SEED):
+    """Generate order items in chunks - IDENTICE"""
+    return generate_table('order_items', {'orders': order_count, 'products': product_count}, seed)
+
+def generate_reviews(count=80, user_count=100, product_count=200, seed=SEED):
+    """Generate reviews in chunks - IDENTICE"""
+    counts = {'reviews': count, 'users': user_count, 'products': product_count}
+    return generate_table('reviews', counts, seed)
+
+def generate_dataset(scale_factor=1, seed=SEED, workers=1, distributions=None):
+    """Whole dataset as (table, chunk) pairs, parents before children"""
+    counts = get_row_counts(scale_factor, distributions)
+    for table in TABLES:
+        for chunk in generate_table(table, counts, seed, workers):
+            yield table, chunk
+
+def row_values(table, row):
+    """Row dict -> tuple in TABLE_COLUMNS order"""
+    return tuple(row[col] for col in TABLE_COLUMNS[table])
+
 # Utility Functions
 
 def measure_time(func):
@@ -0,0 +1,292 @@
+import re
+from datetime import timedelta
+
+from utils import TABLE_COLUMNS, DATASET_EPOCH
+from text_search import PG_SEARCHES, mongo_search_filter
+
+# Registrul workload-urilor de benchmark
+#
+# Un Workload declara o singura data query-ul pentru ambele baze: SQL-ul
+# PostgreSQL (parametri %s), filter / pipeline-ul MongoDB si generatorul de
+# parametri. params(keys) intoarce tuple-ul folosit de ambele parti: SQL-ul
+# il primeste ca parametri, iar filter / pipeline, daca sunt functii, il
+# primesc ca argumente. keys contine generatoare ('user', 'product' - apelate
+# la fiecare executie) si limitele din time_windows().
+# columns = forma asteptata a rezultatului (campuri prezente in fiecare rand);
+# mongo_columns doar cand MongoDB le numeste altfel (ex. _id dupa $group).
+# Workload-urile cu lookups=True sunt interogari punctuale repetate de
+# `lookups` ori per executie, fiecare cu parametri noi.
+# run_pg_async / run_mongo_async sunt aceleasi query-uri pe driverele async
+# (asyncpg cu parametri $1..$n, pymongo AsyncMongoClient).
+
+_PARAM = re.compile(r"%s")
+
+def asyncpg_sql(sql):
+    """%s placeholders -> $1, $2, ... (asyncpg)"""
+    counter = iter(range(1, sql.count('%s') + 1))
+    return _PARAM.sub(lambda m: f"${next(counter)}", sql).replace('%%', '%')
+
+
+class Workload:
+    """One benchmark query declared once for both engines"""
+
+    def __init__(self, name, title, sql, collection, find=None, pipeline=None, params=None,
+                 sort=None, limit=None, columns=None, mongo_columns=None, tags=(), lookups=False):
+        self.name = name
+        self.title = title
+        self.sql = sql
+        self.collection = collection
+        self.find = find
+        self.pipeline = pipeline
+        self.params = params or (lambda keys: ())
+        self.sort = sort
+        self.limit = limit
+        self.columns = list(columns or [])
+        self.mongo_columns = list(mongo_columns or self.columns)
+        self.tags = set(tags)
+        self.lookups = lookups
+        self.async_sql = asyncpg_sql(sql)
+
+    def args(self, keys):
+        return tuple(self.params(keys))
+
+    def _spec(self, spec, args):
+        return spec(*args) if callable(spec) else spec
+
+    def mongo_command(self, args):
+        """find / aggregate command document (the form explain takes)"""
+        if self.pipeline is not None:
+            return {'aggregate': self.collection, 'pipeline': self._spec(self.pipeline, args), 'cursor': {}}
+        command = {'find': self.collection, 'filter': self._spec(self.find, args) or {}}
+        if self.sort:
+            command['sort'] = dict(self.sort)
+        if self.limit:
+            command['limit'] = self.limit
+        return command
+
+    def run_pg(self, cursor, args):
+        cursor.execute(self.sql, args)
+        return cursor.fetchall()
+
+    def run_mongo(self, db, args):
+        collection = db[self.collection]
+        if self.pipeline is not None:
+            return list(collection.aggregate(self._spec(self.pipeline, args)))
+        cursor = collection.find(self._spec(self.find, args) or {})
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        if self.limit:
+            cursor = cursor.limit(self.limit)
+        return list(cursor)
+
+    async def run_pg_async(self, conn, args):
+        return await conn.fetch(self.async_sql, *args)
+
+    async def run_mongo_async(self, db, args):
+        collection = db[self.collection]
+        if self.pipeline is not None:
+            cursor = await collection.aggregate(self._spec(self.pipeline, args))
+            return await cursor.to_list()
+        cursor = collection.find(self._spec(self.find, args) or {})
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+        if self.limit:
+            cursor = cursor.limit(self.limit)
+        return await cursor.to_list()
+
+    def shape_ok(self, engine, fields):
+        """Expected columns present in a result row (None = empty result / no shape declared)"""
+        expected = self.columns if engine == 'postgresql' else self.mongo_columns
+        if fields is None or not expected:
+            return None
+        return set(expected) <= set(fields)
+
+
+WORKLOADS = {}
+
+def register(workload):
+    if workload.name in WORKLOADS:
+        raise ValueError(f"workload duplicat: {workload.name}")
+    WORKLOADS[workload.name] = workload
+    return workload
+
+def select_workloads(names=None, tags=None):
+    """Workloads by name and / or tag, in registration order"""
+    if names:
+        unknown = set(names) - set(WORKLOADS)
+        if unknown:
+            raise ValueError(f"workload-uri necunoscute: {', '.join(sorted(unknown))}")
+    return [w for w in WORKLOADS.values()
+            if (not names or w.name in names) and (not tags or w.tags & set(tags))]
+
+def time_windows(now=DATASET_EPOCH):
+    """Bounds used by the time workloads; the dataset ends at DATASET_EPOCH"""
+    return {'week': now - timedelta(days=7), 'month': now - timedelta(days=30),
+            'day_start': now - timedelta(days=15), 'day_end': now - timedelta(days=14)}
+
+def fixed_keys(user, product):
+    """keys with constant ids (plans / index comparisons)"""
+    return dict(time_windows(), user=lambda: user, product=lambda: product)
+
+# --- rulare -------------------------------------------------------------------
+
+def pg_runner(workload, cursor, keys, lookups=1):
+    """(run, fields): run() executes the workload once; fields = last row's column names"""
+    fields = []
+
+    def run():
+        rows = []
+        for _ in range(lookups if workload.lookups else 1):
+            rows.extend(workload.run_pg(cursor, workload.args(keys)))
+        fields[:] = [column[0] for column in cursor.description] if rows else []
+        return rows
+    return run, fields
+
+def mongo_runner(workload, db, keys, lookups=1):
+    fields = []
+
+    def run():
+        docs = []
+        for _ in range(lookups if workload.lookups else 1):
+            docs.extend(workload.run_mongo(db, workload.args(keys)))
+        fields[:] = list(docs[0]) if docs else []
+        return docs
+    return run, fields
+
+# --- Q1-Q8 (4_performance_test.py) ----------------------------------------------
+
+register(Workload(
+    'q1_select_all', "Select All",
+    "SELECT * FROM products", 'products', find={},
+    columns=TABLE_COLUMNS['products'], tags=('core', 'scan')))
+
+register(Workload(
+    'q2_select_where', "Filter (WHERE)",
+    "SELECT * FROM products WHERE price > 500", 'products', find={'price': {'$gt': 500}},
+    columns=TABLE_COLUMNS['products'], tags=('core', 'filter')))
+
+register(Workload(
+    'q3_join', "JOIN/Lookup",
+    """SELECT o.order_number, u.username, u.email, o.total_amount, o.status
+       FROM orders o
+       JOIN users u ON o.user_id = u.id""",
+    'orders', pipeline=[
+        {'$lookup': {'from': 'users', 'localField': 'user_id', 'foreignField': 'id', 'as': 'user'}},
+        {'$unwind': '$user'},
+        {'$project': {'order_number': 1, 'username': '$user.username', 'email': '$user.email',
+                      'total_amount': 1, 'status': 1}},
+    ],
+    columns=['order_number', 'username', 'email', 'total_amount', 'status'], tags=('core', 'join')))
+
+register(Workload(
+    'q4_aggregate', "Aggregation",
+    """SELECT status, COUNT(*) as count, SUM(total_amount) as total
+       FROM orders
+       GROUP BY status""",
+    'orders', pipeline=[
+        {'$group': {'_id': '$status', 'count': {'$sum': 1}, 'total': {'$sum': '$total_amount'}}},
+    ],
+    columns=['status', 'count', 'total'], mongo_columns=['_id', 'count', 'total'], tags=('core', 'aggregate')))
+
+register(Workload(
+    'q5_complex_join', "Complex JOIN",
+    """SELECT o.order_number, p.name as product_name, oi.quantity, oi.total_price, c.name as category
+       FROM orders o
+       JOIN order_items oi ON o.id = oi.order_id
+       JOIN products p ON oi.product_id = p.id
+       JOIN categories c ON p.category_id = c.id
+       WHERE o.status = 'completed'""",
+    'orders', pipeline=[
+        {'$match': {'status': 'completed'}},
+        {'$lookup': {'from': 'order_items', 'localField': 'id', 'foreignField': 'order_id', 'as': 'items'}},
+        {'$unwind': '$items'},
+        {'$lookup': {'from': 'products', 'localField': 'items.product_id', 'foreignField': 'id', 'as': 'product'}},
+        {'$unwind': '$product'},
+        {'$lookup': {'from': 'categories', 'localField': 'product.category_id', 'foreignField': 'id',
+                     'as': 'category'}},
+        {'$unwind': '$category'},
+        {'$project': {'order_number': 1, 'product_name': '$product.name', 'quantity': '$items.quantity',
+                      'total_price': '$items.total_price', 'category': '$category.name'}},
+    ],
+    columns=['order_number', 'product_name', 'quantity', 'total_price', 'category'], tags=('core', 'join')))
+
+register(Workload(
+    'q6_like_search', "Text Search",
+    "SELECT * FROM products WHERE name LIKE '%Pro%'", 'products',
+    find={'name': {'$regex': 'Pro', '$options': 'i'}},
+    columns=TABLE_COLUMNS['products'], tags=('core', 'search')))
+
+register(Workload(
+    'q7_user_orders', "User Orders",
+    "SELECT * FROM orders WHERE user_id = %s", 'orders',
+    params=lambda keys: (keys['user'](),), find=lambda user: {'user_id': user},
+    columns=TABLE_COLUMNS['orders'], tags=('core', 'point'), lookups=True))
+
+register(Workload(
+    'q8_product_lookup', "Product Lookup",
+    "SELECT * FROM products WHERE id = %s", 'products',
+    params=lambda keys: (keys['product'](),), find=lambda product: {'id': product},
+    columns=TABLE_COLUMNS['products'], tags=('core', 'point'), lookups=True))
+
+# Q6 pe indexii din text_search.py (4_performance_test.py --search-mode indexed),
+# cu acelasi set de rezultate in ambele baze: subsir case-insensitive (ILIKE
+# pe pg_trgm / name_trigrams + $regex cu 'i') sau cuvinte intregi dupa
+# stemming (tsquery fara prefix / $text). 'Pro' apare doar in interiorul
+# cuvintelor generate (project, process), deci full-text cauta 'project'.
+register(Workload(
+    'q6_trigram_search', "Text Search (pg_trgm)",
+    PG_SEARCHES['ilike'][0].format(table='products'), 'products',
+    params=lambda keys: (PG_SEARCHES['ilike'][1]('Pro'),), find=mongo_search_filter('trigram', 'Pro'),
+    columns=TABLE_COLUMNS['products'], tags=('search-indexed',)))
+
+register(Workload(
+    'q6_fulltext_search', "Text Search (full-text)",
+    PG_SEARCHES['fulltext'][0].format(table='products'), 'products',
+    params=lambda keys: ('project',), find=mongo_search_filter('text', 'project'),
+    columns=TABLE_COLUMNS['products'], tags=('search-indexed',)))
+
+# --- interval de timp (time_indexes.py) -------------------------------------------
+
+register(Workload(
+    't1_user_orders_last_7_days', "User Orders (7 days)",
+    "SELECT * FROM orders WHERE user_id = %s AND created_at >= %s ORDER BY created_at DESC", 'orders',
+    params=lambda keys: (keys['user'](), keys['week']),
+    find=lambda user, since: {'user_id': user, 'created_at': {'$gte': since}}, sort=[('created_at', -1)],
+    columns=TABLE_COLUMNS['orders'], tags=('time', 'point')))
+
+register(Workload(
+    't2_user_latest_orders', "User Latest Orders",
+    "SELECT * FROM orders WHERE user_id = %s ORDER BY created_at DESC LIMIT 10", 'orders',
+    params=lambda keys: (keys['user'](),), find=lambda user: {'user_id': user},
+    sort=[('created_at', -1)], limit=10,
+    columns=TABLE_COLUMNS['orders'], tags=('time', 'point')))
+
+register(Workload(
+    't3_product_reviews_this_month', "Product Reviews (30 days)",
+    "SELECT * FROM reviews WHERE product_id = %s AND created_at >= %s ORDER BY created_at DESC", 'reviews',
+    params=lambda keys: (keys['product'](), keys['month']),
+    find=lambda product, since: {'product_id': product, 'created_at': {'$gte': since}},
+    sort=[('created_at', -1)],
+    columns=TABLE_COLUMNS['reviews'], tags=('time', 'point')))
+
+register(Workload(
+    't4_reviews_this_month_per_product', "Reviews per Product (30 days)",
+    """SELECT product_id, COUNT(*) as count, AVG(rating) as avg_rating FROM reviews
+       WHERE created_at >= %s GROUP BY product_id""", 'reviews',
+    params=lambda keys: (keys['month'],),
+    pipeline=lambda since: [
+        {'$match': {'created_at': {'$gte': since}}},
+        {'$group': {'_id': '$product_id', 'count': {'$sum': 1}, 'avg_rating': {'$avg': '$rating'}}},
+    ],
+    columns=['product_id', 'count', 'avg_rating'], mongo_columns=['_id', 'count', 'avg_rating'],
+    tags=('time', 'aggregate')))
+
+register(Workload(
+    't5_orders_one_day', "Orders in One Day",
+    "SELECT COUNT(*) as count, SUM(total_amount) as total FROM orders WHERE created_at >= %s AND created_at < %s",
+    'orders', params=lambda keys: (keys['day_start'], keys['day_end']),
+    pipeline=lambda start, end: [
+        {'$match': {'created_at': {'$gte': start, '$lt': end}}},
+        {'$group': {'_id': None, 'count': {'$sum': 1}, 'total': {'$sum': '$total_amount'}}},
+    ],
+    columns=['count', 'total'], tags=('time', 'aggregate')))